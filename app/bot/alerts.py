@@ -0,0 +1,175 @@
+"""
+/**
+ * @file: app/bot/alerts.py
+ * @description: Value alert fan-out: one value scan per league, batched hygiene decisions.
+ * @dependencies: asyncio, app.value_alerts, app.bot.storage, app.bot.formatting, tgbotapp.sender
+ * @created: 2026-10-16
+ */
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from typing import Any, Protocol
+
+from app.value_alerts import AlertCandidate, AlertHygiene
+from config import settings
+from logger import logger
+
+from .formatting import format_value_picks
+from .storage import list_value_alert_subscribers
+
+SendText = Callable[..., Awaitable[Any]]
+
+
+class ValueSource(Protocol):
+    async def value_picks(
+        self, *, target_date: date, league: str | None
+    ) -> list[dict[str, object]]:
+        """Return value cards for the date, optionally filtered by league."""
+
+
+@dataclass(slots=True)
+class AlertReport:
+    candidates: int = 0
+    sent: int = 0
+    failed: int = 0
+    suppressed: Counter[str] = field(default_factory=Counter)
+
+
+def build_alert_hygiene() -> AlertHygiene:
+    return AlertHygiene(
+        cooldown_minutes=int(settings.VALUE_ALERT_COOLDOWN_MIN),
+        min_edge_delta=float(settings.VALUE_ALERT_MIN_EDGE_DELTA),
+        staleness_fail_minutes=int(settings.VALUE_STALENESS_FAIL_MIN),
+        quiet_hours=settings.VALUE_ALERT_QUIET_HOURS,
+        update_delta=float(settings.VALUE_ALERT_UPDATE_DELTA),
+        max_updates=int(settings.VALUE_ALERT_MAX_UPDATES),
+    )
+
+
+def _league_key(league: Any) -> str | None:
+    text = str(league or "").strip()
+    return text or None
+
+
+class ValueAlertDispatcher:
+    """Send value alerts to every subscriber whose edge threshold a pick clears.
+
+    Value picks are computed once per league filter, every subscriber's
+    candidates are collected into one list and ``AlertHygiene.evaluate_many``
+    decides the whole fan-out with a single prefetch of delivery history.
+    Each subscriber gets at most one message per tick; deliveries are recorded
+    only after Telegram accepted it.
+    """
+
+    def __init__(
+        self,
+        bot: Any,
+        *,
+        source: ValueSource | None = None,
+        hygiene: AlertHygiene | None = None,
+        send_text: SendText | None = None,
+    ) -> None:
+        if source is None:
+            from .routers.commands import get_value_service
+
+            source = get_value_service()
+        if send_text is None:
+            from tgbotapp.sender import safe_send_text
+
+            send_text = safe_send_text
+        self._bot = bot
+        self._source = source
+        self._hygiene = hygiene or build_alert_hygiene()
+        self._send_text = send_text
+
+    async def dispatch(
+        self,
+        now: datetime | None = None,
+        *,
+        subscribers: Sequence[dict[str, Any]] | None = None,
+    ) -> AlertReport:
+        now = (now or datetime.now(UTC)).astimezone(UTC)
+        if subscribers is None:
+            subscribers = list_value_alert_subscribers()
+        report = AlertReport()
+        if not subscribers:
+            return report
+
+        leagues = sorted({_league_key(row.get("league")) for row in subscribers}, key=str)
+        scanned = await asyncio.gather(
+            *(
+                self._source.value_picks(target_date=now.date(), league=league)
+                for league in leagues
+            ),
+            return_exceptions=True,
+        )
+        cards_by_league: dict[str | None, list[dict[str, object]]] = {}
+        for league, cards in zip(leagues, scanned):
+            if isinstance(cards, BaseException):
+                logger.warning("Не удалось получить value-кейсы для %s: %s", league, cards)
+                continue
+            cards_by_league[league] = list(cards)
+
+        candidates: list[AlertCandidate] = []
+        candidate_cards: list[dict[str, object]] = []
+        for row in subscribers:
+            threshold = float(row.get("edge_threshold") or 0.0)
+            for card in cards_by_league.get(_league_key(row.get("league")), []):
+                pick: Any = card.get("pick")
+                if pick is None or pick.edge_pct < threshold or pick.kickoff_utc <= now:
+                    continue
+                candidates.append(
+                    AlertCandidate(
+                        user_id=int(row["user_id"]),
+                        match_key=pick.match_key,
+                        market=pick.market,
+                        selection=pick.selection,
+                        edge_pct=float(pick.edge_pct),
+                        pulled_at=pick.pulled_at,
+                        kickoff_utc=pick.kickoff_utc,
+                        user_timezone=str(row.get("tz") or "UTC"),
+                    )
+                )
+                candidate_cards.append(card)
+        report.candidates = len(candidates)
+        if not candidates:
+            return report
+
+        accepted: dict[int, list[tuple[AlertCandidate, dict[str, object]]]] = {}
+        decisions = self._hygiene.evaluate_many(candidates, now=now)
+        for candidate, card, decision in zip(candidates, candidate_cards, decisions):
+            if decision.should_send:
+                accepted.setdefault(candidate.user_id, []).append((candidate, card))
+            else:
+                report.suppressed[decision.reason] += 1
+
+        for user_id, items in accepted.items():
+            text = format_value_picks(
+                title="Value-оповещение", cards=[card for _, card in items]
+            )
+            try:
+                await self._send_text(self._bot, user_id, text, parse_mode="HTML")
+            except Exception as exc:
+                report.failed += 1
+                logger.warning("Не удалось отправить value-оповещение %s: %s", user_id, exc)
+                continue
+            report.sent += 1
+            for candidate, _ in items:
+                self._hygiene.record_delivery(candidate)
+        logger.info(
+            "Value-оповещения: кандидатов=%s, отправлено=%s, ошибок=%s, отсеяно=%s",
+            report.candidates,
+            report.sent,
+            report.failed,
+            dict(report.suppressed),
+        )
+        return report
+
+
+__all__ = ["AlertReport", "ValueAlertDispatcher", "ValueSource", "build_alert_hygiene"]
@@ -1,7 +1,7 @@
 """
 /**
  * @file: app/bot/caching.py
- * @description: Lightweight async-friendly TTL cache with LRU eviction for bot queries.
+ * @description: Async TTL cache with LRU eviction, single-flight misses and stale-while-revalidate.
  * @dependencies: asyncio, time, collections
  * @created: 2025-09-23
  */
@@ -21,26 +21,51 @@ V = TypeVar("V")
 
 @dataclass(slots=True)
 class CacheEntry(Generic[V]):
-    """Value wrapper storing expiration timestamp."""
+    """Value wrapper storing expiration and stale-serving deadlines."""
 
     value: V
     expire_at: float
+    stale_until: float = 0.0
+
+    def is_fresh(self, now: float) -> bool:
+        return now <= self.expire_at
+
+    def is_servable_stale(self, now: float) -> bool:
+        return self.expire_at < now <= self.stale_until
 
 
 class TTLCache(Generic[K, V]):
-    """Simple TTL cache with LRU eviction semantics."""
+    """TTL cache with LRU eviction semantics.
 
-    def __init__(self, maxsize: int = 256, ttl_seconds: float = 120.0) -> None:
+    Concurrent misses for the same key share one factory call, which runs in a
+    detached task so a cancelled caller never aborts the load for the others.
+    With a positive ``stale_ttl_seconds`` an expired entry keeps being served
+    for that long while a single background task refreshes it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl_seconds: float = 120.0,
+        stale_ttl_seconds: float = 0.0,
+    ) -> None:
         if maxsize <= 0:
             raise ValueError("maxsize must be positive")
         if ttl_seconds <= 0:
             raise ValueError("ttl_seconds must be positive")
+        if stale_ttl_seconds < 0:
+            raise ValueError("stale_ttl_seconds must be non-negative")
         self._maxsize = maxsize
         self._default_ttl = ttl_seconds
+        self._stale_ttl = stale_ttl_seconds
         self._lock = asyncio.Lock()
         self._entries: OrderedDict[K, CacheEntry[V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Future[V]] = {}
+        self._tasks: set[asyncio.Task[None]] = set()
         self.hits = 0
         self.misses = 0
+        self.stale_hits = 0
+        self.coalesced = 0
 
     async def get(self, key: K) -> V | None:
         async with self._lock:
@@ -48,8 +73,10 @@ class TTLCache(Generic[K, V]):
             if not entry:
                 self.misses += 1
                 return None
-            if entry.expire_at < monotonic():
-                self._entries.pop(key, None)
+            now = monotonic()
+            if not entry.is_fresh(now):
+                if not entry.is_servable_stale(now):
+                    self._entries.pop(key, None)
                 self.misses += 1
                 return None
             self._entries.move_to_end(key)
@@ -57,13 +84,8 @@ class TTLCache(Generic[K, V]):
             return entry.value
 
     async def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
-        ttl = ttl_seconds or self._default_ttl
-        expire_at = monotonic() + ttl
         async with self._lock:
-            if key in self._entries:
-                self._entries.move_to_end(key)
-            self._entries[key] = CacheEntry(value=value, expire_at=expire_at)
-            self._evict_if_needed()
+            self._store(key, value, ttl_seconds)
 
     async def get_or_set(
         self,
@@ -71,36 +93,126 @@ class TTLCache(Generic[K, V]):
         factory: Callable[[], Awaitable[V]] | Callable[[], V],
         ttl_seconds: float | None = None,
     ) -> tuple[V, bool]:
-        """Return cached value or compute and store it."""
-
-        cached = await self.get(key)
-        if cached is not None:
-            return cached, True
-        result = factory()
-        if isinstance(result, Awaitable):
-            value = await result  # type: ignore[arg-type]
-        else:
-            value = result
-        await self.set(key, value, ttl_seconds=ttl_seconds)
-        return value, False
+        """Return cached value or compute and store it.
+
+        The boolean is ``True`` when the value came from the cache, including
+        stale values served during a background refresh and results shared with
+        a concurrent caller that was already computing the same key.
+        """
+
+        async with self._lock:
+            entry = self._entries.get(key)
+            now = monotonic()
+            if entry is not None and entry.is_fresh(now):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry.value, True
+            if entry is not None and entry.is_servable_stale(now):
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                if key not in self._inflight:
+                    self._start_refresh(key, factory, ttl_seconds)
+                return entry.value, True
+            pending = self._inflight.get(key)
+            if pending is None:
+                self.misses += 1
+                pending = self._start_load(key, factory, ttl_seconds)
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+        # Shielded: cancelling one caller leaves the shared load running.
+        value = await asyncio.shield(pending)
+        return value, not leader
 
     async def invalidate(self, key: K) -> None:
         async with self._lock:
             self._entries.pop(key, None)
+            # A load started before invalidation must not write its result back.
+            self._inflight.pop(key, None)
 
     async def clear(self) -> None:
         async with self._lock:
             self._entries.clear()
+            self._inflight.clear()
             self.hits = 0
             self.misses = 0
+            self.stale_hits = 0
+            self.coalesced = 0
 
     def stats(self) -> dict[str, float]:
         return {
             "size": len(self._entries),
             "hits": float(self.hits),
             "misses": float(self.misses),
+            "stale_hits": float(self.stale_hits),
+            "coalesced": float(self.coalesced),
+            "inflight": float(len(self._inflight)),
         }
 
+    def _store(self, key: K, value: V, ttl_seconds: float | None) -> None:
+        ttl = ttl_seconds or self._default_ttl
+        expire_at = monotonic() + ttl
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = CacheEntry(
+            value=value, expire_at=expire_at, stale_until=expire_at + self._stale_ttl
+        )
+        self._evict_if_needed()
+
+    def _start_load(
+        self,
+        key: K,
+        factory: Callable[[], Awaitable[V]] | Callable[[], V],
+        ttl_seconds: float | None,
+    ) -> asyncio.Future[V]:
+        future: asyncio.Future[V] = asyncio.get_running_loop().create_future()
+        # Mark failures as retrieved so a miss nobody else awaited does not warn.
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._inflight[key] = future
+        task = asyncio.create_task(self._load(key, future, factory, ttl_seconds))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return future
+
+    async def _load(
+        self,
+        key: K,
+        future: asyncio.Future[V],
+        factory: Callable[[], Awaitable[V]] | Callable[[], V],
+        ttl_seconds: float | None,
+    ) -> None:
+        try:
+            result = factory()
+            if isinstance(result, Awaitable):
+                value = await result  # type: ignore[arg-type]
+            else:
+                value = result
+        except BaseException as exc:
+            async with self._lock:
+                if self._inflight.get(key) is future:
+                    self._inflight.pop(key, None)
+            if isinstance(exc, asyncio.CancelledError):
+                future.cancel()
+                raise
+            future.set_exception(exc)
+            return
+        async with self._lock:
+            # Skip the write when invalidate()/clear() superseded this load.
+            if self._inflight.get(key) is future:
+                self._store(key, value, ttl_seconds)
+                self._inflight.pop(key, None)
+        future.set_result(value)
+
+    def _start_refresh(
+        self,
+        key: K,
+        factory: Callable[[], Awaitable[V]] | Callable[[], V],
+        ttl_seconds: float | None,
+    ) -> None:
+        # The stale value stays in place until its window runs out if this fails.
+        self._start_load(key, factory, ttl_seconds)
+
     def _evict_if_needed(self) -> None:
         while len(self._entries) > self._maxsize:
             self._entries.popitem(last=False)
@@ -0,0 +1,300 @@
+"""
+/**
+ * @file: app/bot/digest.py
+ * @description: Daily digest delivery: one render per (league, date), fanned out to subscribers.
+ * @dependencies: asyncio, zoneinfo, app.bot.storage, app.bot.formatting, tgbotapp.sender
+ * @created: 2026-10-16
+ */
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from typing import Any, Protocol
+from zoneinfo import ZoneInfo
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+)
+
+from app.metrics import record_digest_sent
+from config import settings
+from logger import logger
+
+from .formatting import format_digest
+from .services import Prediction
+from .storage import list_subscriptions, mark_digest_sent, record_digest_outcome
+
+SendText = Callable[..., Awaitable[Any]]
+DigestKey = tuple[str | None, date]
+
+_MAX_RETRY_AFTER_ATTEMPTS = 3
+# Transient send failures are retried on later ticks with exponential backoff,
+# then the day's digest is given up as ``failed``.
+_MAX_SEND_ATTEMPTS = 5
+_RETRY_BACKOFF = timedelta(minutes=5)
+# Outcomes that close a subscriber's digest for the local date.
+_FINAL_STATUSES = frozenset({"sent", "empty", "blocked", "failed"})
+
+
+class DigestSource(Protocol):
+    async def today(self, target_date: date, *, league: str | None = None) -> list[Prediction]:
+        """Return predictions for the given local date, optionally filtered by league."""
+
+
+@dataclass(slots=True)
+class DigestReport:
+    due: int = 0
+    rendered: int = 0
+    sent: int = 0
+    failed: int = 0
+    skipped: int = 0
+    failed_chats: list[int] = field(default_factory=list)
+
+
+def _local_now(tz_name: str | None, now: datetime) -> datetime:
+    try:
+        zone = ZoneInfo(tz_name or "UTC")
+    except Exception:
+        zone = ZoneInfo("UTC")
+    return now.astimezone(zone)
+
+
+def _league_key(league: Any) -> str | None:
+    text = str(league or "").strip().lower()
+    return text or None
+
+
+def _parse_utc(value: Any) -> datetime | None:
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def _is_permanent(exc: Exception) -> bool:
+    """Whether a send error means the chat will never accept the digest."""
+
+    if isinstance(exc, (TelegramForbiddenError, TelegramNotFound)):
+        return True
+    return isinstance(exc, TelegramBadRequest) and "chat not found" in str(exc).lower()
+
+
+def _digest_items(predictions: Iterable[Prediction]) -> list[dict[str, object]]:
+    return [
+        {"home": item.home, "away": item.away, "confidence": item.confidence}
+        for item in predictions
+    ]
+
+
+class DigestDispatcher:
+    """Deliver due subscription digests with bounded send concurrency.
+
+    Subscribers sharing a league filter and a local calendar date receive the
+    same digest, so predictions are fetched and rendered once per such group
+    and the resulting text is queued for every recipient. Sends go through
+    ``safe_send_text`` (global and per-chat limits) from a fixed pool of
+    workers; Telegram ``RetryAfter`` replies are honoured before retrying.
+
+    Every outcome is recorded per (chat, local date): empty digests and chats
+    that blocked the bot are closed for the day, other failures are retried
+    on later ticks with backoff up to ``_MAX_SEND_ATTEMPTS`` times.
+    """
+
+    def __init__(
+        self,
+        bot: Any,
+        *,
+        source: DigestSource | None = None,
+        send_text: SendText | None = None,
+        concurrency: int | None = None,
+        db_path: str | None = None,
+    ) -> None:
+        if source is None:
+            from .state import FACADE
+
+            source = FACADE
+        if send_text is None:
+            from tgbotapp.sender import safe_send_text
+
+            send_text = safe_send_text
+        self._bot = bot
+        self._source = source
+        self._send_text = send_text
+        self._concurrency = max(int(concurrency or settings.DIGEST_SEND_CONCURRENCY), 1)
+        self._db_path = db_path
+
+    def due_subscriptions(
+        self,
+        now: datetime,
+        subscriptions: Sequence[dict[str, Any]] | None = None,
+    ) -> dict[DigestKey, list[int]]:
+        """Group subscribers due at ``now`` by digest key.
+
+        A subscription is due once its local ``send_at`` has passed and no final
+        outcome was recorded for the subscriber's local date yet, so a missed
+        tick sends late instead of never and repeated ticks do not send twice.
+        A pending retry is due again once its backoff has elapsed.
+        """
+
+        if subscriptions is None:
+            subscriptions = list_subscriptions(db_path=self._db_path)
+        groups: dict[DigestKey, list[int]] = {}
+        for subscription in subscriptions:
+            local = _local_now(subscription.get("tz"), now)
+            send_at = str(subscription.get("send_at") or "")
+            if not send_at or local.strftime("%H:%M") < send_at:
+                continue
+            if subscription.get("last_digest_date") == local.date().isoformat():
+                if subscription.get("last_digest_status", "sent") in _FINAL_STATUSES:
+                    continue
+                retry_at = _parse_utc(subscription.get("digest_next_attempt_at"))
+                if retry_at is not None and now < retry_at:
+                    continue
+            key = (_league_key(subscription.get("league")), local.date())
+            groups.setdefault(key, []).append(int(subscription["user_id"]))
+        return groups
+
+    async def dispatch(
+        self,
+        now: datetime | None = None,
+        *,
+        subscriptions: Sequence[dict[str, Any]] | None = None,
+    ) -> DigestReport:
+        now = now or datetime.now(UTC)
+        if subscriptions is None:
+            subscriptions = list_subscriptions(db_path=self._db_path)
+        groups = self.due_subscriptions(now, subscriptions)
+        attempts = {
+            int(subscription["user_id"]): int(subscription.get("digest_attempts") or 0)
+            for subscription in subscriptions
+            if subscription.get("last_digest_status") == "retry"
+        }
+        report = DigestReport(due=sum(len(chats) for chats in groups.values()))
+        if not groups:
+            return report
+
+        keys = list(groups)
+        rendered = await asyncio.gather(
+            *(self._render(league, day) for league, day in keys), return_exceptions=True
+        )
+        queue: asyncio.Queue[tuple[int, str, date]] = asyncio.Queue()
+        for key, text in zip(keys, rendered):
+            if isinstance(text, BaseException):
+                logger.warning("Не удалось подготовить дайджест %s: %s", key, text)
+                report.skipped += len(groups[key])
+                continue
+            if text is None:
+                report.skipped += len(groups[key])
+                self._record(groups[key], key[1], "empty")
+                continue
+            report.rendered += 1
+            for chat_id in groups[key]:
+                queue.put_nowait((chat_id, text, key[1]))
+
+        workers = [
+            asyncio.create_task(self._worker(queue, report, now=now, attempts=attempts))
+            for _ in range(min(self._concurrency, queue.qsize()))
+        ]
+        if workers:
+            await asyncio.gather(*workers)
+        logger.info(
+            "Дайджест: получателей=%s, отправлено=%s, ошибок=%s, пропущено=%s",
+            report.due,
+            report.sent,
+            report.failed,
+            report.skipped,
+        )
+        return report
+
+    async def _render(self, league: str | None, day: date) -> str | None:
+        predictions = await self._source.today(day, league=league)
+        if not predictions:
+            return None
+        when = datetime(day.year, day.month, day.day, tzinfo=UTC)
+        return format_digest(_digest_items(predictions), when)
+
+    def _record(
+        self,
+        chat_ids: Sequence[int],
+        day: date,
+        status: str,
+        *,
+        attempts: int = 0,
+        next_attempt_at: datetime | None = None,
+    ) -> None:
+        try:
+            record_digest_outcome(
+                chat_ids,
+                day.isoformat(),
+                status,
+                attempts=attempts,
+                next_attempt_at=next_attempt_at.isoformat() if next_attempt_at else None,
+                db_path=self._db_path,
+            )
+        except Exception as exc:
+            logger.warning("Не удалось отметить дайджест %s (%s): %s", chat_ids, status, exc)
+
+    async def _worker(
+        self,
+        queue: asyncio.Queue[tuple[int, str, date]],
+        report: DigestReport,
+        *,
+        now: datetime,
+        attempts: dict[int, int],
+    ) -> None:
+        while True:
+            try:
+                chat_id, text, day = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            outcome = await self._deliver(chat_id, text)
+            if outcome == "sent":
+                report.sent += 1
+                record_digest_sent()
+                try:
+                    mark_digest_sent(chat_id, day.isoformat(), db_path=self._db_path)
+                except Exception as exc:
+                    logger.warning("Не удалось отметить дайджест %s: %s", chat_id, exc)
+                continue
+            report.failed += 1
+            report.failed_chats.append(chat_id)
+            if outcome == "blocked":
+                self._record([chat_id], day, "blocked")
+                continue
+            tried = attempts.get(chat_id, 0) + 1
+            if tried >= _MAX_SEND_ATTEMPTS:
+                self._record([chat_id], day, "failed", attempts=tried)
+            else:
+                retry_at = now + _RETRY_BACKOFF * (2 ** (tried - 1))
+                self._record([chat_id], day, "retry", attempts=tried, next_attempt_at=retry_at)
+
+    async def _deliver(self, chat_id: int, text: str) -> str:
+        """Send one digest; return ``sent``, ``blocked`` or ``retry``."""
+
+        for _ in range(_MAX_RETRY_AFTER_ATTEMPTS):
+            try:
+                await self._send_text(self._bot, chat_id, text, parse_mode="HTML")
+                return "sent"
+            except TelegramRetryAfter as exc:
+                wait_time = max(float(exc.retry_after), 0.0)
+                logger.warning(
+                    "Дайджест для %s отложен Telegram на %.2f с", chat_id, wait_time
+                )
+                await asyncio.sleep(wait_time)
+            except Exception as exc:
+                logger.warning("Не удалось отправить дайджест %s: %s", chat_id, exc)
+                return "blocked" if _is_permanent(exc) else "retry"
+        return "retry"
+
+
+__all__ = ["DigestDispatcher", "DigestReport", "DigestSource"]
@@ -508,6 +508,7 @@ def _consensus_from_payload(payload: Mapping[str, object]) -> ConsensusMeta | No
         kickoff_utc=kickoff,
         closing_price=closing_value,
         closing_pulled_at=closing_time,
+        missing_providers=tuple(str(name) for name in payload.get("missing_providers") or ()),
     )
 
 
@@ -547,6 +548,30 @@ def _create_value_service() -> tuple[ValueService, LinesProvider]:
     return service, provider
 
 
+# Process-lifetime odds stack: HTTP keep-alive, ETag caches and reliability
+# state survive between /value and /compare instead of being rebuilt per command.
+_VALUE_STACK: tuple[ValueService, LinesProvider] | None = None
+
+
+def get_value_service() -> ValueService:
+    """Return the shared value service, building the odds stack on first use."""
+
+    global _VALUE_STACK
+    if _VALUE_STACK is None:
+        _VALUE_STACK = _create_value_service()
+        logger.info("Стек котировок для value-команд инициализирован")
+    return _VALUE_STACK[0]
+
+
+async def close_value_service() -> None:
+    """Close the shared odds stack; the next command builds a fresh one."""
+
+    global _VALUE_STACK
+    stack, _VALUE_STACK = _VALUE_STACK, None
+    if stack is not None:
+        await _close_lines_provider(stack[1])
+
+
 async def _close_lines_provider(provider: LinesProvider) -> None:
     close_fn = getattr(provider, "close", None)
     if close_fn is None:
@@ -849,7 +874,7 @@ if settings.ENABLE_VALUE_FEATURES:
         except ValueError as exc:
             await message.answer(str(exc))
             return
-        service, provider = _create_value_service()
+        service = get_value_service()
         try:
             cards = await service.value_picks(
                 target_date=parsed.target_date,
@@ -865,12 +890,11 @@ if settings.ENABLE_VALUE_FEATURES:
             )
             await message.answer("Не удалось загрузить value-кейсы, попробуйте позже.")
             return
-        finally:
-            await _close_lines_provider(provider)
         cards = cards[: parsed.limit]
         _attach_reliability_badges(cards, default_league=parsed.league)
         user_id = message.from_user.id if message.from_user else 0
         if user_id > 0:
+            ledger_entries = []
             for card in cards:
                 consensus_payload = card.get("consensus")
                 best_price = card.get("best_price")
@@ -880,10 +904,14 @@ if settings.ENABLE_VALUE_FEATURES:
                 consensus_meta = _consensus_from_payload(consensus_payload)
                 if not consensus_meta:
                     continue
+                ledger_entries.append((user_id, pick, consensus_meta, best_price))
+            if ledger_entries:
+                closing = [entry[2] for entry in ledger_entries]
                 try:
-                    ledger_store.record_pick(user_id, pick, consensus_meta, best_price=best_price)
-                    ledger_store.record_closing_line(consensus_meta)
-                    ledger_store.apply_closing_to_picks(consensus_meta)
+                    with ledger_store.batch():
+                        ledger_store.record_picks(ledger_entries)
+                        ledger_store.record_closing_lines(closing)
+                        ledger_store.apply_closing_lines(closing)
                 except Exception as exc:  # pragma: no cover - ledger errors shouldn't break UX
                     logger.debug("ledger_record_failed", extra={"error": str(exc)})
         title = f"Value-кейсы на {parsed.target_date.isoformat()}"
@@ -910,7 +938,7 @@ if settings.ENABLE_VALUE_FEATURES:
         if not query:
             await message.answer("Использование: /compare &lt;match_id или команды&gt;")
             return
-        service, provider = _create_value_service()
+        service = get_value_service()
         try:
             summary = await service.compare(query=query, target_date=date.today())
         except Exception:  # pragma: no cover - defensive logging
@@ -920,8 +948,6 @@ if settings.ENABLE_VALUE_FEATURES:
             )
             await message.answer("Не удалось получить сравнение рынков, попробуйте позже.")
             return
-        finally:
-            await _close_lines_provider(provider)
         if not summary:
             await message.answer("Матч не найден или котировки недоступны.")
             return
@@ -17,10 +17,14 @@ from .caching import TTLCache
 from .services import Prediction, PredictionFacade
 
 LIST_CACHE = TTLCache[str, list[Prediction]](
-    maxsize=128, ttl_seconds=float(settings.CACHE_TTL_SECONDS)
+    maxsize=128,
+    ttl_seconds=float(settings.CACHE_TTL_SECONDS),
+    stale_ttl_seconds=float(settings.CACHE_STALE_TTL_SECONDS),
 )
 MATCH_CACHE = TTLCache[str, Prediction](
-    maxsize=256, ttl_seconds=float(settings.CACHE_TTL_SECONDS)
+    maxsize=256,
+    ttl_seconds=float(settings.CACHE_TTL_SECONDS),
+    stale_ttl_seconds=float(settings.CACHE_STALE_TTL_SECONDS),
 )
 PAGINATION_CACHE = TTLCache[str, dict[str, Any]](
     maxsize=256, ttl_seconds=float(settings.CACHE_TTL_SECONDS)
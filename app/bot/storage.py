@@ -2,40 +2,139 @@
 /**
  * @file: app/bot/storage.py
  * @description: SQLite helpers for user preferences, subscriptions and reports.
- * @dependencies: sqlite3, pathlib, config
+ * @dependencies: sqlite3, threading, pathlib, config
  * @created: 2025-09-23
  */
 """
 
 from __future__ import annotations
 
+import os
+import re
 import sqlite3
+import threading
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Iterable, Sequence
 
 from config import settings
 
 _ROOT = Path(__file__).resolve().parents[2]
 _SCHEMA_PATH = _ROOT / "database" / "schema.sql"
-
-
-def ensure_schema(db_path: str | None = None) -> None:
-    path = Path(db_path or settings.DB_PATH)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    schema_sql = _SCHEMA_PATH.read_text(encoding="utf-8")
-    with sqlite3.connect(path) as conn:
-        conn.executescript(schema_sql)
-        conn.commit()
+_SCHEMA_VERSION_RE = re.compile(r"PRAGMA\s+user_version\s*=\s*(\d+)", re.IGNORECASE)
+_SCHEMA_OBJECT_RE = re.compile(
+    r"CREATE\s+(?:TABLE|INDEX)\s+IF\s+NOT\s+EXISTS\s+(\w+)", re.IGNORECASE
+)
+
+# Keys per VALUES batch in bulk alert lookups (4 bound parameters each).
+_ALERT_BATCH_KEYS = 200
+
+_LOCK = threading.Lock()
+_SCHEMA_READY: set[str] = set()
+_LOCAL = threading.local()
+_ALL_CONNECTIONS: set[sqlite3.Connection] = set()
+_schema_cache: tuple[str, int, frozenset[str]] | None = None
+
+
+def _schema() -> tuple[str, int, frozenset[str]]:
+    global _schema_cache
+    if _schema_cache is None:
+        schema_sql = _SCHEMA_PATH.read_text(encoding="utf-8")
+        match = _SCHEMA_VERSION_RE.search(schema_sql)
+        objects = frozenset(name.lower() for name in _SCHEMA_OBJECT_RE.findall(schema_sql))
+        _schema_cache = (schema_sql, int(match.group(1)) if match else 0, objects)
+    return _schema_cache
+
+
+def _schema_is_current(conn: sqlite3.Connection, version: int, objects: frozenset[str]) -> bool:
+    current = int(conn.execute("PRAGMA user_version").fetchone()[0])
+    if current < version:
+        return False
+    existing = {
+        str(row[0]).lower()
+        for row in conn.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'index')")
+    }
+    return objects <= existing
+
+
+def _resolve(db_path: str | None) -> Path:
+    return Path(db_path or settings.DB_PATH)
+
+
+def ensure_schema(db_path: str | None = None, *, force: bool = False) -> None:
+    """Apply ``database/schema.sql`` once per process and database file.
+
+    The DDL script only runs when the file's ``PRAGMA user_version`` is behind the
+    schema or one of its tables/indexes is missing; later calls are a set lookup.
+    """
+
+    path = _resolve(db_path)
+    key = os.path.abspath(path)
+    if not force and key in _SCHEMA_READY and path.exists():
+        return
+    with _LOCK:
+        if not force and key in _SCHEMA_READY and path.exists():
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        schema_sql, version, objects = _schema()
+        conn = sqlite3.connect(path)
+        try:
+            if force or not _schema_is_current(conn, version, objects):
+                conn.executescript(schema_sql)
+                conn.commit()
+        finally:
+            conn.close()
+        _SCHEMA_READY.add(key)
 
 
 def _connect(db_path: str | None = None) -> sqlite3.Connection:
-    path = Path(db_path or settings.DB_PATH)
+    """Return the calling thread's long-lived connection for ``db_path``."""
+
+    path = _resolve(db_path)
+    key = os.path.abspath(path)
+    pool: dict[str, sqlite3.Connection] = getattr(_LOCAL, "connections", None) or {}
+    _LOCAL.connections = pool
+    conn = pool.get(key)
+    if conn is not None and conn in _ALL_CONNECTIONS and key in _SCHEMA_READY and path.exists():
+        return conn
+    if conn is not None:
+        # The file was removed or the schema reset: drop the stale handle.
+        _close(conn)
+        pool.pop(key, None)
+        with _LOCK:
+            _SCHEMA_READY.discard(key)
     ensure_schema(str(path))
-    conn = sqlite3.connect(path)
+    conn = sqlite3.connect(path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
+    pool[key] = conn
+    with _LOCK:
+        _ALL_CONNECTIONS.add(conn)
     return conn
 
 
+def _close(conn: sqlite3.Connection) -> None:
+    try:
+        conn.close()
+    except sqlite3.Error:
+        pass
+    with _LOCK:
+        _ALL_CONNECTIONS.discard(conn)
+
+
+def close_connections() -> None:
+    """Close every pooled connection; the next call reconnects lazily."""
+
+    with _LOCK:
+        connections = list(_ALL_CONNECTIONS)
+        _ALL_CONNECTIONS.clear()
+        _SCHEMA_READY.clear()
+    for conn in connections:
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+    _LOCAL.connections = {}
+
+
 def get_user_preferences(user_id: int, *, db_path: str | None = None) -> dict[str, Any]:
     with _connect(db_path) as conn:
         cur = conn.execute("SELECT * FROM user_prefs WHERE user_id = ?", (user_id,))
@@ -103,10 +202,67 @@ def upsert_subscription(
 
 def list_subscriptions(*, db_path: str | None = None) -> list[dict[str, Any]]:
     with _connect(db_path) as conn:
-        cur = conn.execute("SELECT * FROM subscriptions ORDER BY user_id")
+        cur = conn.execute(
+            """
+            SELECT s.*,
+                   d.local_date AS last_digest_date,
+                   d.status AS last_digest_status,
+                   d.attempts AS digest_attempts,
+                   d.next_attempt_at AS digest_next_attempt_at
+              FROM subscriptions AS s
+              LEFT JOIN digest_deliveries AS d
+                ON d.user_id = s.user_id
+               AND d.local_date = (
+                       SELECT MAX(m.local_date) FROM digest_deliveries AS m
+                        WHERE m.user_id = s.user_id
+                   )
+             ORDER BY s.user_id
+            """
+        )
         return [dict(row) for row in cur.fetchall()]
 
 
+def record_digest_outcome(
+    user_ids: Iterable[int],
+    local_date: str,
+    status: str,
+    *,
+    attempts: int = 0,
+    next_attempt_at: str | None = None,
+    db_path: str | None = None,
+) -> None:
+    """Record the digest ``status`` for ``local_date`` (ISO) of every user in one write."""
+
+    params = [
+        (int(user_id), str(local_date), status, int(attempts), next_attempt_at)
+        for user_id in user_ids
+    ]
+    if not params:
+        return
+    with _connect(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO digest_deliveries(
+                user_id, local_date, status, attempts, next_attempt_at, sent_at
+            )
+            VALUES (?, ?, ?, ?, ?, DATETIME('now'))
+            ON CONFLICT(user_id, local_date) DO UPDATE SET
+                status = excluded.status,
+                attempts = excluded.attempts,
+                next_attempt_at = excluded.next_attempt_at,
+                sent_at = excluded.sent_at
+            """,
+            params,
+        )
+        conn.commit()
+
+
+def mark_digest_sent(user_id: int, local_date: str, *, db_path: str | None = None) -> None:
+    """Record that the digest for ``local_date`` (ISO) reached ``user_id``."""
+
+    record_digest_outcome([user_id], local_date, "sent", db_path=db_path)
+
+
 def delete_subscription(user_id: int, *, db_path: str | None = None) -> None:
     with _connect(db_path) as conn:
         conn.execute("DELETE FROM subscriptions WHERE user_id = ?", (user_id,))
@@ -198,6 +354,22 @@ def upsert_value_alert(
     return get_value_alert(user_id, db_path=db_path)
 
 
+def list_value_alert_subscribers(*, db_path: str | None = None) -> list[dict[str, Any]]:
+    """Return users with value alerts enabled, with their timezone from ``user_prefs``."""
+
+    with _connect(db_path) as conn:
+        cur = conn.execute(
+            """
+            SELECT a.user_id, a.edge_threshold, a.league, COALESCE(p.tz, 'UTC') AS tz
+              FROM value_alerts AS a
+              LEFT JOIN user_prefs AS p ON p.user_id = a.user_id
+             WHERE a.enabled = 1
+             ORDER BY a.user_id
+            """
+        )
+        return [dict(row) for row in cur.fetchall()]
+
+
 def record_value_alert_sent(
     user_id: int,
     *,
@@ -257,19 +429,111 @@ def list_recent_value_alerts(
         return [dict(row) for row in rows]
 
 
+def get_last_value_alerts_sent(
+    keys: Iterable[tuple[int, str, str, str]],
+    *,
+    db_path: str | None = None,
+) -> dict[tuple[int, str, str, str], dict[str, object]]:
+    """Latest delivery per ``(user_id, match_key, market, selection)`` in bulk."""
+
+    unique = list(dict.fromkeys((int(u), str(m), str(mk), str(s)) for u, m, mk, s in keys))
+    result: dict[tuple[int, str, str, str], dict[str, object]] = {}
+    if not unique:
+        return result
+    conn = _connect(db_path)
+    for start in range(0, len(unique), _ALERT_BATCH_KEYS):
+        chunk = unique[start : start + _ALERT_BATCH_KEYS]
+        values = ", ".join("(?, ?, ?, ?)" for _ in chunk)
+        rows = conn.execute(
+            f"""
+            WITH wanted(user_id, match_key, market, selection) AS (VALUES {values})
+            SELECT * FROM (
+                SELECT s.*,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY s.user_id, s.match_key, s.market, s.selection
+                           ORDER BY s.sent_at DESC, s.id DESC
+                       ) AS rn
+                  FROM value_alerts_sent AS s
+                  JOIN wanted AS w
+                    ON s.user_id = w.user_id
+                   AND s.match_key = w.match_key
+                   AND s.market = w.market
+                   AND s.selection = w.selection
+            )
+            WHERE rn = 1
+            """,
+            [item for key in chunk for item in key],
+        ).fetchall()
+        for row in rows:
+            payload = dict(row)
+            payload.pop("rn", None)
+            key = (
+                int(payload["user_id"]),
+                str(payload["match_key"]),
+                str(payload["market"]),
+                str(payload["selection"]),
+            )
+            result[key] = payload
+    return result
+
+
+def list_recent_value_alerts_many(
+    user_ids: Iterable[int],
+    *,
+    limit: int = 5,
+    db_path: str | None = None,
+) -> dict[int, list[dict[str, object]]]:
+    """Most recent deliveries for several users, newest first, ``limit`` per user."""
+
+    users: Sequence[int] = list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    result: dict[int, list[dict[str, object]]] = {user_id: [] for user_id in users}
+    if not users:
+        return result
+    conn = _connect(db_path)
+    for start in range(0, len(users), _ALERT_BATCH_KEYS):
+        chunk = users[start : start + _ALERT_BATCH_KEYS]
+        placeholders = ", ".join("?" for _ in chunk)
+        rows = conn.execute(
+            f"""
+            SELECT * FROM (
+                SELECT *,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY user_id ORDER BY sent_at DESC, id DESC
+                       ) AS rn
+                  FROM value_alerts_sent
+                 WHERE user_id IN ({placeholders})
+            )
+            WHERE rn <= ?
+            ORDER BY user_id, rn
+            """,
+            (*chunk, int(max(limit, 1))),
+        ).fetchall()
+        for row in rows:
+            payload = dict(row)
+            payload.pop("rn", None)
+            result[int(payload["user_id"])].append(payload)
+    return result
+
+
 __all__ = [
+    "close_connections",
     "ensure_schema",
     "get_user_preferences",
     "upsert_user_preferences",
     "upsert_subscription",
     "list_subscriptions",
+    "mark_digest_sent",
+    "record_digest_outcome",
     "delete_subscription",
     "record_report",
     "list_reports",
     "iter_reports_for_match",
     "get_value_alert",
     "upsert_value_alert",
+    "list_value_alert_subscribers",
     "record_value_alert_sent",
     "get_last_value_alert_sent",
+    "get_last_value_alerts_sent",
     "list_recent_value_alerts",
+    "list_recent_value_alerts_many",
 ]
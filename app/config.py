@@ -133,6 +133,7 @@ class Settings(BaseSettings):
     sim_rho: float = Field(default=0.1, alias="SIM_RHO")
     sim_n: int = Field(default=10000, alias="SIM_N")
     sim_chunk: int = Field(default=100000, alias="SIM_CHUNK")
+    sim_engine: Literal["mc", "analytic"] = Field(default="mc", alias="SIM_ENGINE")
     odds_provider: Literal["dummy", "csv", "http"] = Field(
         default="dummy", alias="ODDS_PROVIDER"
     )
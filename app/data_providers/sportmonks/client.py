@@ -10,9 +10,9 @@ import asyncio
 import os
 import random
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from datetime import datetime, timezone
-from typing import Any, Mapping
+from typing import Any, Callable, Mapping
 
 import httpx
 
@@ -40,20 +40,26 @@ class SportmonksClientConfig:
     default_timewindow_days: int = 7
     leagues_allowlist: tuple[str, ...] = ()
     cache_ttl_seconds: int = 900
+    page_concurrency: int = 4
 
     @classmethod
     def from_env(cls) -> "SportmonksClientConfig":
         """Build configuration from environment variables with sane defaults."""
 
+        # Slotted dataclass: class attributes are descriptors, so read defaults from fields.
+        defaults = {item.name: item.default for item in fields(cls)}
+
+        def _env(name: str, field_name: str, cast: Callable[[Any], Any]) -> Any:
+            return cast(os.getenv(name) or defaults[field_name])
+
         token = os.getenv("SPORTMONKS_API_TOKEN") or os.getenv("SPORTMONKS_API_KEY", "")
-        base_url = os.getenv("SPORTMONKS_BASE_URL", cls.base_url)
-        timeout = float(os.getenv("SPORTMONKS_TIMEOUT_SEC", cls.timeout) or cls.timeout)
-        retry_attempts = int(os.getenv("SPORTMONKS_RETRY_ATTEMPTS", cls.retry_attempts) or cls.retry_attempts)
-        backoff_base = float(os.getenv("SPORTMONKS_BACKOFF_BASE", cls.backoff_base) or cls.backoff_base)
-        rps_limit = float(os.getenv("SPORTMONKS_RPS_LIMIT", cls.rps_limit) or cls.rps_limit)
-        default_window = int(
-            os.getenv("SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS", cls.default_timewindow_days)
-            or cls.default_timewindow_days
+        base_url = _env("SPORTMONKS_BASE_URL", "base_url", str)
+        timeout = _env("SPORTMONKS_TIMEOUT_SEC", "timeout", float)
+        retry_attempts = _env("SPORTMONKS_RETRY_ATTEMPTS", "retry_attempts", int)
+        backoff_base = _env("SPORTMONKS_BACKOFF_BASE", "backoff_base", float)
+        rps_limit = _env("SPORTMONKS_RPS_LIMIT", "rps_limit", float)
+        default_window = _env(
+            "SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS", "default_timewindow_days", int
         )
         allowlist_raw = os.getenv("SPORTMONKS_LEAGUES_ALLOWLIST", "")
         allowlist: tuple[str, ...]
@@ -65,7 +71,8 @@ class SportmonksClientConfig:
             )
         else:
             allowlist = ()
-        cache_ttl = int(os.getenv("SPORTMONKS_CACHE_TTL_SEC", cls.cache_ttl_seconds) or cls.cache_ttl_seconds)
+        cache_ttl = _env("SPORTMONKS_CACHE_TTL_SEC", "cache_ttl_seconds", int)
+        page_concurrency = _env("SPORTMONKS_PAGE_CONCURRENCY", "page_concurrency", int)
         return cls(
             api_token=token,
             base_url=base_url.rstrip("/"),
@@ -76,6 +83,7 @@ class SportmonksClientConfig:
             default_timewindow_days=max(default_window, 0),
             leagues_allowlist=allowlist,
             cache_ttl_seconds=max(cache_ttl, 0),
+            page_concurrency=max(page_concurrency, 1),
         )
 
 
@@ -1,11 +1,14 @@
 """
 @file: provider.py
 @description: High level Sportmonks provider with normalization helpers for ETL workflows.
-@dependencies: asyncio, datetime, typing
+@dependencies: asyncio, datetime, math, typing
 """
 
 from __future__ import annotations
 
+import asyncio
+import math
+from contextlib import nullcontext
 from datetime import UTC, datetime
 from typing import Any, Iterable, Mapping, Sequence
 
@@ -15,6 +18,9 @@ from .client import SportmonksClient, SportmonksResponse
 from .cache import SportmonksETagCache
 from .schemas import FixtureDTO, InjuryDTO, StandingDTO, TeamDTO
 
+# Hard stop for endpoints that keep reporting more pages.
+MAX_PAGES = 500
+
 
 class SportmonksProvider:
     """Fetch and normalize Sportmonks entities into internal DTOs."""
@@ -24,9 +30,16 @@ class SportmonksProvider:
         client: SportmonksClient | None = None,
         *,
         etag_cache: SportmonksETagCache | None = None,
+        page_concurrency: int | None = None,
+        request_slots: asyncio.Semaphore | None = None,
     ) -> None:
         self._client = client or SportmonksClient()
         self._etag_cache = etag_cache
+        # Defaults to SPORTMONKS_PAGE_CONCURRENCY via the client configuration.
+        self._page_concurrency = max(1, page_concurrency or self._client.config.page_concurrency)
+        # Optional caller-wide cap on requests in flight, shared by every fetch
+        # and page, so concurrent fetches do not multiply ``page_concurrency``.
+        self._request_slots = request_slots
 
     @property
     def client(self) -> SportmonksClient:
@@ -48,8 +61,7 @@ class SportmonksProvider:
                 "to": _fmt_date(date_to),
             }
         )
-        response = await self._get("/fixtures", params=params)
-        records = _iter_records(response.data)
+        records = await self._get_all("/fixtures", params=params)
         fixtures: list[FixtureDTO] = []
         for record in records:
             dto = _parse_fixture(record)
@@ -58,24 +70,24 @@ class SportmonksProvider:
         return fixtures
 
     async def fetch_teams(self, league_id: str | int) -> list[TeamDTO]:
-        response = await self._get(
+        records = await self._get_all(
             f"/leagues/{league_id}/teams",
             params={"include": "country"},
         )
         teams: list[TeamDTO] = []
-        for record in _iter_records(response.data):
+        for record in records:
             dto = _parse_team(record)
             if dto:
                 teams.append(dto)
         return teams
 
     async def fetch_standings(self, league_id: str | int, season_id: str | int) -> list[StandingDTO]:
-        response = await self._get(
+        records = await self._get_all(
             f"/standings/season/{season_id}",
             params={"league_ids": str(league_id)},
         )
         standings: list[StandingDTO] = []
-        for record in _iter_records(response.data):
+        for record in records:
             dto = _parse_standing(record)
             if dto:
                 standings.append(dto)
@@ -91,9 +103,9 @@ class SportmonksProvider:
         params = self._league_params(league_ids)
         allowed = self._resolve_allowed_leagues(league_ids)
         params.update({"from": _fmt_date(date_from), "to": _fmt_date(date_to)})
-        response = await self._get("/injuries", params=params)
+        records = await self._get_all("/injuries", params=params)
         injuries: list[InjuryDTO] = []
-        for record in _iter_records(response.data):
+        for record in records:
             dto = _parse_injury(record)
             if dto and self._is_league_allowed(dto.league_id, allowed):
                 injuries.append(dto)
@@ -109,26 +121,145 @@ class SportmonksProvider:
             return {}
         return {"league_ids": ",".join(str(item) for item in resolved)}
 
+    async def _get_all(
+        self,
+        endpoint: str,
+        *,
+        params: Mapping[str, Any] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Return records from every page of ``endpoint``.
+
+        The first page goes through the ETag cache. When it changed, the
+        remaining pages are requested concurrently, at most
+        ``page_concurrency`` at a time, with every request still paced by the
+        client's token bucket; their ETags are stored as well. When the total
+        page count is unknown, pages are fetched in speculative windows until
+        one reports no more data. A 304 on the first page only vouches for that
+        page, so the later pages are revalidated with their own ETags.
+        """
+
+        first = await self._get(endpoint, params=params)
+        if first.status_code == 304:
+            return await self._revalidate_pages(endpoint, params)
+        records = list(_iter_records(first.data))
+        pagination = _pagination(first.data)
+        if not records or not pagination:
+            return records
+        current = _safe_int(pagination.get("current_page")) or 1
+        total_pages = _total_pages(pagination, len(records))
+        if total_pages is not None:
+            last_page = min(total_pages, MAX_PAGES)
+            remaining = range(current + 1, last_page + 1)
+            for response in await self._fetch_pages(endpoint, params, remaining):
+                records.extend(_iter_records(response.data))
+            return records
+        if not _has_more(pagination):
+            return records
+        records.extend(await self._crawl(endpoint, params, current + 1))
+        return records
+
+    async def _revalidate_pages(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+    ) -> list[dict[str, Any]]:
+        """Return records of the later pages that changed since the last crawl.
+
+        Pages with a cached ETag are the ones seen last time; they are
+        requested conditionally, and crawling resumes past them when the last
+        one now reports more data (e.g. fixtures appended to the range).
+        """
+
+        if self._etag_cache is None:
+            return []
+        next_page = 2
+        while next_page <= MAX_PAGES and self._etag_cache.load(
+            endpoint, {**(params or {}), "page": next_page}
+        ):
+            next_page += 1
+        known = range(2, next_page)
+        if not known:
+            return []
+        responses = await self._fetch_pages(endpoint, params, known, conditional=True)
+        records: list[dict[str, Any]] = []
+        for response in responses:
+            records.extend(_iter_records(response.data))
+        last = responses[-1]
+        if last.status_code != 200:
+            return records
+        pagination = _pagination(last.data)
+        total_pages = _total_pages(pagination, len(list(_iter_records(last.data))))
+        if total_pages is not None:
+            remaining = range(next_page, min(total_pages, MAX_PAGES) + 1)
+            for response in await self._fetch_pages(endpoint, params, remaining):
+                records.extend(_iter_records(response.data))
+        elif _has_more(pagination):
+            records.extend(await self._crawl(endpoint, params, next_page))
+        return records
+
+    async def _crawl(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        next_page: int,
+    ) -> list[dict[str, Any]]:
+        """Fetch pages from ``next_page`` in windows until one reports no more data."""
+
+        records: list[dict[str, Any]] = []
+        while next_page <= MAX_PAGES:
+            window = range(next_page, min(next_page + self._page_concurrency, MAX_PAGES + 1))
+            for response in await self._fetch_pages(endpoint, params, window):
+                page_records = list(_iter_records(response.data))
+                records.extend(page_records)
+                if not page_records or not _has_more(_pagination(response.data)):
+                    return records
+            next_page = window.stop
+        return records
+
+    async def _fetch_pages(
+        self,
+        endpoint: str,
+        params: Mapping[str, Any] | None,
+        pages: range,
+        *,
+        conditional: bool = False,
+    ) -> list[SportmonksResponse]:
+        """Fetch ``pages`` concurrently and return their responses in page order."""
+
+        slots = asyncio.Semaphore(self._page_concurrency)
+
+        async def _fetch(page: int) -> SportmonksResponse:
+            async with slots:
+                return await self._get(
+                    endpoint,
+                    params={**(params or {}), "page": page},
+                    conditional=conditional,
+                )
+
+        return list(await asyncio.gather(*(_fetch(page) for page in pages)))
+
     async def _get(
         self,
         endpoint: str,
         *,
         params: Mapping[str, Any] | None = None,
+        conditional: bool = True,
     ) -> SportmonksResponse:
         cached_entry = None
         etag: str | None = None
         last_modified: str | None = None
-        if self._etag_cache is not None:
+        if self._etag_cache is not None and conditional:
             cached_entry = self._etag_cache.load(endpoint, params)
             if cached_entry:
                 etag = cached_entry.etag
                 last_modified = cached_entry.last_modified
-        response = await self._client.get(
-            endpoint,
-            params=params,
-            etag=etag,
-            last_modified=last_modified,
-        )
+        async with self._request_slots or nullcontext():
+            response = await self._client.get(
+                endpoint,
+                params=params,
+                etag=etag,
+                last_modified=last_modified,
+            )
         if self._etag_cache is not None:
             if response.status_code == 200:
                 self._etag_cache.store(
@@ -180,6 +311,34 @@ def _iter_records(payload: Any) -> Iterable[dict[str, Any]]:
     return []
 
 
+def _pagination(payload: Any) -> Mapping[str, Any]:
+    if not isinstance(payload, dict):
+        return {}
+    pagination = payload.get("pagination")
+    if not isinstance(pagination, dict):
+        meta = payload.get("meta")
+        pagination = meta.get("pagination") if isinstance(meta, dict) else None
+    return pagination if isinstance(pagination, dict) else {}
+
+
+def _total_pages(pagination: Mapping[str, Any], page_size: int) -> int | None:
+    for key in ("total_pages", "last_page"):
+        value = _safe_int(pagination.get(key))
+        if value is not None and value > 0:
+            return value
+    total = _safe_int(pagination.get("total"))
+    per_page = _safe_int(pagination.get("per_page")) or page_size
+    if total is not None and per_page:
+        return max(1, math.ceil(total / per_page))
+    return None
+
+
+def _has_more(pagination: Mapping[str, Any]) -> bool:
+    if "has_more" in pagination:
+        return bool(pagination.get("has_more"))
+    return bool(pagination.get("next_page") or pagination.get("next"))
+
+
 def _parse_fixture(record: dict[str, Any]) -> FixtureDTO | None:
     fixture_id = _safe_int(record.get("id"))
     if fixture_id is None:
@@ -1,17 +1,18 @@
 """
 @file: repository.py
 @description: SQLite persistence helpers for Sportmonks normalized entities.
-@dependencies: contextlib, datetime, json, sqlite3
+@dependencies: contextlib, datetime, json, sqlite3, threading
 """
 
 from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 from contextlib import contextmanager
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Iterable, Iterator, Mapping, Sequence
 
 from config import Settings
 
@@ -19,23 +20,80 @@ from .schemas import FixtureDTO, InjuryDTO, StandingDTO, TeamDTO
 
 
 class SportmonksRepository:
-    """Persist Sportmonks payloads into SQLite tables with idempotent upserts."""
+    """Persist Sportmonks payloads into SQLite tables with idempotent upserts.
+
+    Each thread keeps one long-lived connection, configured (WAL, foreign
+    keys) when it is opened. Writes commit per call unless they run inside
+    :meth:`unit_of_work`, which groups them into a single transaction.
+    """
 
     def __init__(self, db_path: str | None = None) -> None:
         settings = Settings()
         self._db_path = Path(db_path or settings.DB_PATH)
         self._db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._connections: set[sqlite3.Connection] = set()
+        self._lock = threading.Lock()
 
-    @contextmanager
-    def _connect(self) -> Iterable[sqlite3.Connection]:
-        conn = sqlite3.connect(self._db_path)
+    def _connection(self) -> sqlite3.Connection:
+        conn: sqlite3.Connection | None = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        conn = sqlite3.connect(self._db_path, check_same_thread=False)
         conn.execute("PRAGMA journal_mode=WAL")
         conn.execute("PRAGMA foreign_keys=ON")
+        self._local.conn = conn
+        self._local.depth = 0
+        with self._lock:
+            self._connections.add(conn)
+        return conn
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connection()
+        if self._local.depth:
+            yield conn
+            return
         try:
             yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[SportmonksRepository]:
+        """Group every upsert issued inside the block into one transaction.
+
+        Nested blocks join the outer transaction; an exception rolls back
+        all writes made since the outermost block started.
+        """
+
+        conn = self._connection()
+        self._local.depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._local.depth -= 1
+            if not self._local.depth:
+                conn.rollback()
+            raise
+        self._local.depth -= 1
+        if not self._local.depth:
             conn.commit()
-        finally:
-            conn.close()
+
+    def close(self) -> None:
+        """Close every connection opened by this repository."""
+
+        with self._lock:
+            connections = list(self._connections)
+            self._connections.clear()
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+        self._local = threading.local()
 
     def upsert_fixtures(self, fixtures: Sequence[FixtureDTO], *, pulled_at: datetime) -> int:
         return self._upsert_many(
@@ -147,13 +205,20 @@ class SportmonksRepository:
         )
 
     def upsert_meta(self, key: str, value: str) -> None:
+        self.upsert_meta_many({key: value})
+
+    def upsert_meta_many(self, items: Mapping[str, str]) -> None:
+        """Write several ``sm_meta`` markers in one transaction."""
+
+        if not items:
+            return
         with self._connect() as conn:
-            conn.execute(
+            conn.executemany(
                 """
                 INSERT INTO sm_meta(key, value_text) VALUES(?, ?)
                 ON CONFLICT(key) DO UPDATE SET value_text=excluded.value_text
                 """,
-                (key, value),
+                list(items.items()),
             )
 
     def get_meta(self, key: str) -> str | None:
@@ -2,15 +2,17 @@
 /**
  * @file: app/lines/aggregator.py
  * @description: Multi-provider odds aggregation with consensus strategies and movement analysis.
- * @dependencies: dataclasses, statistics, app.lines.providers.base, app.lines.storage, app.lines.movement
+ * @dependencies: asyncio, dataclasses, statistics, app.lines.providers.base, app.lines.storage, app.lines.movement
  * @created: 2025-10-05
  */
 """
 
 from __future__ import annotations
 
+import asyncio
 from collections import defaultdict
 from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from contextlib import nullcontext
 from dataclasses import dataclass, replace
 from datetime import UTC, datetime, timedelta
 from statistics import median
@@ -22,6 +24,7 @@ from app.lines.reliability import ProviderReliabilityTracker
 from app.lines.reliability_v2 import ProviderReliabilityV2
 from app.lines.storage import LineHistoryPoint, OddsSQLiteStore
 from config import settings
+from logger import logger
 
 
 @dataclass(slots=True, frozen=True)
@@ -47,6 +50,7 @@ class ConsensusMeta:
     kickoff_utc: datetime
     closing_price: float | None = None
     closing_pulled_at: datetime | None = None
+    missing_providers: tuple[str, ...] = ()
 
 
 class LinesAggregator:
@@ -92,8 +96,14 @@ class LinesAggregator:
     def last_metadata(self) -> dict[tuple[str, str, str], ConsensusMeta]:
         return dict(self._last_meta)
 
-    def aggregate(self, snapshots: Iterable[OddsSnapshot]) -> list[OddsSnapshot]:
+    def aggregate(
+        self,
+        snapshots: Iterable[OddsSnapshot],
+        *,
+        missing_providers: Iterable[str] | None = None,
+    ) -> list[OddsSnapshot]:
         rows = list(snapshots)
+        missing = tuple(missing_providers or ())
         if not rows:
             self._last_meta.clear()
             return []
@@ -105,8 +115,19 @@ class LinesAggregator:
         for item in rows:
             key = (item.match_key, item.market.upper(), item.selection.upper())
             grouped[key].append(item)
-        consensus_rows: list[OddsSnapshot] = []
         self._last_meta.clear()
+        histories = self._store.history_many(grouped.keys()) if self._store else {}
+        batch = self._reliability.batch_updates() if self._reliability else nullcontext()
+        with batch:
+            return self._aggregate_groups(grouped, histories, missing)
+
+    def _aggregate_groups(
+        self,
+        grouped: Mapping[tuple[str, str, str], Sequence[OddsSnapshot]],
+        histories: Mapping[tuple[str, str, str], Sequence[LineHistoryPoint]],
+        missing: tuple[str, ...],
+    ) -> list[OddsSnapshot]:
+        consensus_rows: list[OddsSnapshot] = []
         for key, items in grouped.items():
             quotes = self._latest_per_provider(items)
             if not quotes:
@@ -121,6 +142,7 @@ class LinesAggregator:
             movement = self._movement(
                 quotes,
                 kickoff,
+                history=histories.get(key),
                 match_key=latest.match_key,
                 market=latest.market,
                 selection=latest.selection,
@@ -168,6 +190,7 @@ class LinesAggregator:
                         .isoformat()
                         .replace("+00:00", "Z"),
                         "price_decimal": price,
+                        "missing_providers": list(missing),
                     }
                 },
             )
@@ -186,6 +209,7 @@ class LinesAggregator:
                 kickoff_utc=kickoff,
                 closing_price=movement.closing_price,
                 closing_pulled_at=movement.closing_pulled_at,
+                missing_providers=missing,
             )
             if self._reliability:
                 expected = self._known_providers or self._normalize_providers(
@@ -332,6 +356,7 @@ class LinesAggregator:
         quotes: Sequence[OddsSnapshot],
         kickoff: datetime,
         *,
+        history: Sequence[LineHistoryPoint] | None = None,
         match_key: str,
         market: str,
         selection: str,
@@ -339,12 +364,13 @@ class LinesAggregator:
     ) -> MovementResult:
         if not self._store:
             return MovementResult(trend="→")
-        key = (quotes[0].match_key, quotes[0].market.upper(), quotes[0].selection.upper())
-        history = self._store.history(
-            match_key=key[0],
-            market=key[1],
-            selection=key[2],
-        )
+        if history is None:
+            key = (quotes[0].match_key, quotes[0].market.upper(), quotes[0].selection.upper())
+            history = self._store.history(
+                match_key=key[0],
+                market=key[1],
+                selection=key[2],
+            )
         if not history:
             history = [
                 LineHistoryPoint(
@@ -373,17 +399,30 @@ class LinesAggregator:
 
 
 class AggregatingLinesProvider:
-    """Compose multiple providers into a consensus feed."""
+    """Compose multiple providers into a consensus feed.
+
+    Providers are queried concurrently; each one gets ``deadline_sec`` to answer.
+    Late or failing providers are skipped and reported via ``missing_providers``
+    on the consensus metadata instead of stalling the whole fetch.
+    """
 
     def __init__(
         self,
         providers: Mapping[str, LinesProvider],
         *,
         aggregator: LinesAggregator,
+        deadline_sec: float | None = None,
     ) -> None:
         self._providers = dict(providers)
         self._aggregator = aggregator
         self._aggregator.register_providers(self._providers.keys())
+        default_deadline = getattr(settings, "ODDS_PROVIDER_DEADLINE_SEC", 10.0)
+        self._deadline = float(deadline_sec if deadline_sec is not None else default_deadline)
+        self._last_missing: tuple[str, ...] = ()
+
+    @property
+    def last_missing_providers(self) -> tuple[str, ...]:
+        return self._last_missing
 
     async def fetch_odds(
         self,
@@ -392,17 +431,56 @@ class AggregatingLinesProvider:
         date_to: datetime,
         leagues: Sequence[str] | None = None,
     ) -> list[OddsSnapshot]:
+        names = list(self._providers)
+        results = await asyncio.gather(
+            *(
+                self._fetch_one(name, date_from=date_from, date_to=date_to, leagues=leagues)
+                for name in names
+            ),
+            return_exceptions=True,
+        )
         rows: list[OddsSnapshot] = []
-        for name, provider in self._providers.items():
-            snapshots = await provider.fetch_odds(date_from=date_from, date_to=date_to, leagues=leagues)
-            normalized = [
-                replace(snapshot, provider=name)
-                if snapshot.provider.lower() != name.lower()
-                else snapshot
-                for snapshot in snapshots
-            ]
-            rows.extend(normalized)
-        return self._aggregator.aggregate(rows)
+        missing: list[str] = []
+        errors: list[BaseException] = []
+        for name, result in zip(names, results, strict=True):
+            if isinstance(result, BaseException):
+                missing.append(name)
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.warning(
+                        "Провайдер котировок %s не уложился в %.1f c", name, self._deadline
+                    )
+                else:
+                    errors.append(result)
+                    logger.warning(
+                        "Провайдер котировок %s завершился ошибкой: %s", name, result
+                    )
+                continue
+            rows.extend(result)
+        if errors and len(errors) == len(names):
+            raise errors[0]
+        self._last_missing = tuple(missing)
+        return self._aggregator.aggregate(rows, missing_providers=missing)
+
+    async def _fetch_one(
+        self,
+        name: str,
+        *,
+        date_from: datetime,
+        date_to: datetime,
+        leagues: Sequence[str] | None,
+    ) -> list[OddsSnapshot]:
+        provider = self._providers[name]
+        call = provider.fetch_odds(date_from=date_from, date_to=date_to, leagues=leagues)
+        if self._deadline > 0:
+            snapshots = await asyncio.wait_for(call, timeout=self._deadline)
+        else:
+            snapshots = await call
+        return [
+            replace(snapshot, provider=name)
+            if snapshot.provider.lower() != name.lower()
+            else snapshot
+            for snapshot in snapshots
+        ]
 
     async def close(self) -> None:
         for provider in self._providers.values():
@@ -2,7 +2,7 @@
 /**
  * @file: app/lines/reliability.py
  * @description: Provider reliability tracking with exponential moving averages and persistence.
- * @dependencies: dataclasses, math, sqlite3, app.lines.providers.base, app.metrics, config
+ * @dependencies: contextlib, dataclasses, math, sqlite3, app.lines.providers.base, app.metrics, config
  * @created: 2025-10-07
  */
 """
@@ -11,10 +11,11 @@ from __future__ import annotations
 
 import math
 import sqlite3
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
-from typing import Iterable, Sequence
+from typing import Any, Iterable, Iterator, Sequence
 
 from app.lines.providers.base import OddsSnapshot
 from app.metrics import provider_fresh_share, provider_latency_ms, provider_reliability_score
@@ -203,7 +204,40 @@ class ProviderReliabilityStore:
         return None
 
 
-class ProviderReliabilityTracker:
+class BatchedStatsPersistence:
+    """Mixin deferring a tracker's stats writes to one ``upsert_many`` per batch.
+
+    Hosts provide ``_store`` (with ``upsert_many``) and initialise ``_pending``
+    to ``None``; stats must expose ``key()``.
+    """
+
+    _store: Any
+    _pending: dict[tuple[str, str, str], Any] | None
+
+    @contextmanager
+    def batch_updates(self) -> Iterator[None]:
+        """Defer persistence of observed stats to one upsert when the block exits."""
+
+        if self._pending is not None:
+            yield
+            return
+        self._pending = {}
+        try:
+            yield
+        finally:
+            pending, self._pending = self._pending, None
+            if pending:
+                self._store.upsert_many(pending.values())
+
+    def _persist(self, touched: Sequence[Any]) -> None:
+        if self._pending is None:
+            self._store.upsert_many(touched)
+            return
+        for stats in touched:
+            self._pending[stats.key()] = stats
+
+
+class ProviderReliabilityTracker(BatchedStatsPersistence):
     """Track reliability metrics per provider with exponential decay."""
 
     def __init__(
@@ -217,6 +251,7 @@ class ProviderReliabilityTracker:
         self._decay = max(0.0, min(float(decay), 0.999))
         self._max_freshness = max(float(max_freshness_sec), 1.0)
         self._stats: dict[tuple[str, str, str], ProviderStats] = self._store.load_all()
+        self._pending: dict[tuple[str, str, str], ProviderStats] | None = None
 
     @property
     def decay(self) -> float:
@@ -303,7 +338,7 @@ class ProviderReliabilityTracker:
                 league=league_label,
             ).set(stats.lag_ms)
         if touched:
-            self._store.upsert_many(touched)
+            self._persist(touched)
 
     def _compose_score(self, stats: ProviderStats) -> float:
         lag_ratio = stats.lag_ms / (self._max_freshness * 1000.0)
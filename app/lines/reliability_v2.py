@@ -2,7 +2,7 @@
 /**
  * @file: app/lines/reliability_v2.py
  * @description: Bayesian provider reliability tracker with exponential decay and Prometheus instrumentation.
- * @dependencies: dataclasses, sqlite3, statistics, app.lines.providers.base, app.lines.storage, app.metrics, config
+ * @dependencies: contextlib, dataclasses, sqlite3, statistics, app.lines.providers.base, app.lines.storage, app.metrics, config
  * @created: 2025-10-12
  */
 """
@@ -16,6 +16,7 @@ from statistics import fmean, pstdev
 from typing import Iterable, Mapping, Sequence
 
 from app.lines.providers.base import OddsSnapshot
+from app.lines.reliability import BatchedStatsPersistence
 from app.lines.storage import LineHistoryPoint
 from app.metrics import (
     provider_reliability_v2_closing,
@@ -192,7 +193,7 @@ class ProviderReliabilityStoreV2:
             conn.commit()
 
 
-class ProviderReliabilityV2:
+class ProviderReliabilityV2(BatchedStatsPersistence):
     """Bayesian reliability tracker with exponential forgetting."""
 
     def __init__(
@@ -224,6 +225,7 @@ class ProviderReliabilityV2:
         self._fresh_window_sec = float(getattr(settings, "RELIABILITY_MAX_FRESHNESS_SEC", 600.0))
         self._stats: dict[tuple[str, str, str], ProviderStatsV2] = self._store.load_all()
         self._closing_seen: set[str] = set()
+        self._pending: dict[tuple[str, str, str], ProviderStatsV2] | None = None
 
     def observe_event(
         self,
@@ -276,7 +278,7 @@ class ProviderReliabilityV2:
             self._update_components(stats)
             touched.append(stats)
         if touched:
-            self._store.upsert_many(touched)
+            self._persist(touched)
 
     def observe_closing(
         self,
@@ -332,7 +334,7 @@ class ProviderReliabilityV2:
             self._update_components(stats)
             touched.append(stats)
         if touched:
-            self._store.upsert_many(touched)
+            self._persist(touched)
 
     def eligible(self, provider: str, market: str, league: str | None, *, min_score: float) -> bool:
         stats = self.get(provider, market, league)
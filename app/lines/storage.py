@@ -18,6 +18,9 @@ from config import settings
 
 from app.lines.providers.base import OddsSnapshot
 
+# Keys per history query: three bound parameters each keeps us below SQLite's 999 limit.
+_HISTORY_BATCH_KEYS = 300
+
 
 def _to_iso(value: datetime) -> str:
     return value.astimezone(UTC).isoformat().replace("+00:00", "Z")
@@ -196,6 +199,59 @@ class OddsSQLiteStore:
         ]
         return history
 
+    def history_many(
+        self,
+        keys: Iterable[tuple[str, str, str]],
+        *,
+        limit: int = 200,
+    ) -> dict[tuple[str, str, str], list[LineHistoryPoint]]:
+        """Return :meth:`history` for many ``(match_key, market, selection)`` keys at once."""
+
+        unique = list(dict.fromkeys(keys))
+        result: dict[tuple[str, str, str], list[LineHistoryPoint]] = {key: [] for key in unique}
+        if not unique:
+            return result
+        per_key = int(max(limit, 1))
+        with self._connect() as conn:
+            for start in range(0, len(unique), _HISTORY_BATCH_KEYS):
+                chunk = unique[start : start + _HISTORY_BATCH_KEYS]
+                values = ",".join("(?, ?, ?)" for _ in chunk)
+                params: list[object] = [part for key in chunk for part in key]
+                params.append(per_key)
+                rows = conn.execute(
+                    f"""
+                    WITH wanted(match_key, market, selection) AS (VALUES {values}),
+                    ranked AS (
+                        SELECT s.match_key, s.market, s.selection, s.provider,
+                               s.pulled_at_utc, s.price_decimal,
+                               ROW_NUMBER() OVER (
+                                   PARTITION BY s.match_key, s.market, s.selection
+                                   ORDER BY s.pulled_at_utc ASC
+                               ) AS rn
+                          FROM odds_snapshots AS s
+                          JOIN wanted AS w
+                            ON s.match_key = w.match_key
+                           AND s.market = w.market
+                           AND s.selection = w.selection
+                    )
+                    SELECT match_key, market, selection, provider, pulled_at_utc, price_decimal
+                      FROM ranked
+                     WHERE rn <= ?
+                     ORDER BY match_key, market, selection, pulled_at_utc ASC
+                    """,
+                    params,
+                ).fetchall()
+                for row in rows:
+                    key = (str(row["match_key"]), str(row["market"]), str(row["selection"]))
+                    result[key].append(
+                        LineHistoryPoint(
+                            provider=str(row["provider"]),
+                            pulled_at=_from_iso(str(row["pulled_at_utc"])),
+                            price_decimal=float(row["price_decimal"]),
+                        )
+                    )
+        return result
+
     def latest_quotes(
         self,
         *,
@@ -21,6 +21,8 @@ __all__ = [
     "db_size_bytes",
     "queue_depth",
     "handler_latency",
+    "bot_middleware_entries",
+    "bot_middleware_evictions_total",
     "render_latency_seconds",
     "value_candidates_total",
     "value_picks_total",
@@ -49,6 +51,8 @@ __all__ = [
     "record_command",
     "record_update",
     "record_digest_sent",
+    "set_middleware_entries",
+    "record_middleware_eviction",
     "record_retrain_success",
     "record_retrain_failure",
     "observe_render_latency",
@@ -74,6 +78,14 @@ retrain_failure_total = Counter(
 )
 db_size_bytes = Gauge("db_size_bytes", "SQLite file size in bytes")
 queue_depth = Gauge("queue_depth", "Internal task queue depth")
+bot_middleware_entries = Gauge(
+    "bot_middleware_entries", "Per-user entries tracked by bot middleware", ["middleware"]
+)
+bot_middleware_evictions_total = Counter(
+    "bot_middleware_evictions_total",
+    "Per-user middleware entries evicted",
+    ["middleware", "reason"],
+)
 handler_latency = Histogram(
     "handler_latency_seconds", "Bot handler latency seconds"
 )
@@ -205,6 +217,20 @@ def record_digest_sent() -> None:
     bot_digest_sent_total.inc()
 
 
+def set_middleware_entries(middleware: str, size: int) -> None:
+    """Publish the number of per-user entries held by a middleware."""
+
+    bot_middleware_entries.labels(middleware=middleware or "unknown").set(max(size, 0))
+
+
+def record_middleware_eviction(middleware: str, reason: str) -> None:
+    """Count a per-user middleware entry evicted for ``reason`` (idle or capacity)."""
+
+    bot_middleware_evictions_total.labels(
+        middleware=middleware or "unknown", reason=reason or "unknown"
+    ).inc()
+
+
 def record_update() -> None:
     """Increment update counter."""
 
@@ -1,18 +1,37 @@
 """
 @file: model_registry.py
-@description: Simple local filesystem model registry with season support
+@description: Local filesystem model registry with seasons, a version index and a process-wide cache
 @dependencies: joblib
 @created: 2025-09-16
 """
 
 from __future__ import annotations
 
+import json
 import os
+import threading
+from datetime import UTC, datetime
 from pathlib import Path
 from typing import Any
 
 import joblib
 
+INDEX_FILENAME = "index.json"
+
+# Loaded artifacts shared by every registry instance in the process, keyed by
+# (artifact path, version and file stamp). Cached models are treated as read-only.
+_MODEL_CACHE: dict[tuple[str, str], Any] = {}
+_INDEX_CACHE: dict[str, tuple[int, dict[str, dict[str, Any]]]] = {}
+_CACHE_LOCK = threading.Lock()
+
+
+def clear_model_cache() -> None:
+    """Drop every cached model and parsed version index."""
+
+    with _CACHE_LOCK:
+        _MODEL_CACHE.clear()
+        _INDEX_CACHE.clear()
+
 
 class LocalModelRegistry:
     """Persist and load models from the filesystem."""
@@ -32,11 +51,93 @@ class LocalModelRegistry:
         path.mkdir(parents=True, exist_ok=True)
         return path / f"{name}.pkl"
 
+    @staticmethod
+    def _index_key(name: str, season: int | str | None) -> str:
+        return f"{season if season is not None else 'default'}/{name}"
+
+    @property
+    def index_path(self) -> Path:
+        return self.base_dir / INDEX_FILENAME
+
+    def versions(self) -> dict[str, dict[str, Any]]:
+        """Return the version index as ``{"<season>/<name>": {"version": ..., ...}}``."""
+
+        path = self.index_path
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        cache_key = str(path)
+        with _CACHE_LOCK:
+            cached = _INDEX_CACHE.get(cache_key)
+            if cached is not None and cached[0] == mtime:
+                return dict(cached[1])
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        index = data if isinstance(data, dict) else {}
+        with _CACHE_LOCK:
+            _INDEX_CACHE[cache_key] = (mtime, index)
+        return dict(index)
+
+    def version(self, name: str, season: int | str | None = None) -> str:
+        """Current version tag of an artifact.
+
+        Artifacts saved before the index existed fall back to a tag derived
+        from the file's mtime and size, so replacing them still invalidates.
+        """
+
+        entry = self.versions().get(self._index_key(name, season))
+        if entry and "version" in entry:
+            return str(entry["version"])
+        stat = self._model_path(name, season).stat()
+        return f"mtime-{stat.st_mtime_ns}-{stat.st_size}"
+
+    def _write_index(self, index: dict[str, dict[str, Any]]) -> None:
+        tmp = self.index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(index, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, self.index_path)
+        with _CACHE_LOCK:
+            _INDEX_CACHE[str(self.index_path)] = (self.index_path.stat().st_mtime_ns, index)
+
     def save(self, model: Any, name: str, season: int | str | None = None) -> Path:
         path = self._model_path(name, season)
         joblib.dump(model, path)
+        index = self.versions()
+        key = self._index_key(name, season)
+        previous = index.get(key, {})
+        index[key] = {
+            "version": int(previous.get("version", 0)) + 1,
+            "path": str(path.relative_to(self.base_dir)),
+            "saved_at": datetime.now(UTC).isoformat(),
+        }
+        self._write_index(index)
+        self.invalidate(name, season)
         return path
 
     def load(self, name: str, season: int | str | None = None) -> Any:
         path = self._model_path(name, season)
-        return joblib.load(path)
+        # The file stamp catches artifacts rewritten without save() (e.g. by
+        # scripts/train_glm.py), which leave the index version unchanged.
+        stat = path.stat()
+        token = f"{self.version(name, season)}@{stat.st_mtime_ns}-{stat.st_size}"
+        cache_key = (str(path), token)
+        with _CACHE_LOCK:
+            if cache_key in _MODEL_CACHE:
+                return _MODEL_CACHE[cache_key]
+        model = joblib.load(path)
+        with _CACHE_LOCK:
+            # Superseded versions (saved by another process) are dropped here too.
+            for key in [key for key in _MODEL_CACHE if key[0] == cache_key[0]]:
+                _MODEL_CACHE.pop(key, None)
+            _MODEL_CACHE[cache_key] = model
+        return model
+
+    def invalidate(self, name: str, season: int | str | None = None) -> None:
+        """Evict every cached version of an artifact."""
+
+        target = str(self._model_path(name, season))
+        with _CACHE_LOCK:
+            for key in [key for key in _MODEL_CACHE if key[0] == target]:
+                _MODEL_CACHE.pop(key, None)
@@ -10,15 +10,22 @@
 from __future__ import annotations
 
 import sqlite3
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
-from typing import Mapping, Protocol, Sequence
+from typing import Any, Mapping, Protocol, Sequence
 
 from app.metrics import clv_mean_pct, picks_settled_total, portfolio_roi_rolling
 from app.value_clv import calculate_clv
 from config import settings
 
+# Offsets other than UTC would break a purely lexical kickoff comparison, so the
+# indexed SQL predicate is widened by the largest timezone offset and the exact
+# cutoff is applied to the (small) candidate set in Python.
+_KICKOFF_SLACK = timedelta(hours=14)
+_UPDATE_CHUNK = 200
+_PORTFOLIO_RESYNC_RUNS = 144
+
 
 def _from_iso(value: str) -> datetime:
     text = value.strip().replace("Z", "+00:00")
@@ -45,6 +52,39 @@ class ResultsProvider(Protocol):
         """Return final results for requested match keys."""
 
 
+@dataclass(slots=True)
+class _PortfolioTotals:
+    """Running ROI/CLV sums over settled picks inside the rolling window."""
+
+    roi_sum: float = 0.0
+    roi_count: int = 0
+    clv_sum: float = 0.0
+    clv_count: int = 0
+
+    def add(self, roi: float | None, clv: float | None, sign: int = 1) -> None:
+        if roi is not None:
+            self.roi_sum += sign * float(roi)
+            self.roi_count += sign
+        if clv is not None:
+            self.clv_sum += sign * float(clv)
+            self.clv_count += sign
+
+    def merge(self, row: sqlite3.Row | tuple[Any, ...], sign: int = 1) -> None:
+        roi_sum, roi_count, clv_sum, clv_count = row
+        self.roi_sum += sign * float(roi_sum or 0.0)
+        self.roi_count += sign * int(roi_count or 0)
+        self.clv_sum += sign * float(clv_sum or 0.0)
+        self.clv_count += sign * int(clv_count or 0)
+
+    @property
+    def avg_roi(self) -> float:
+        return self.roi_sum / self.roi_count if self.roi_count > 0 else 0.0
+
+    @property
+    def avg_clv(self) -> float:
+        return self.clv_sum / self.clv_count if self.clv_count > 0 else 0.0
+
+
 @dataclass(slots=True)
 class SettlementEngine:
     """Settle value picks and compute ROI metrics."""
@@ -54,6 +94,9 @@ class SettlementEngine:
     poll_min: int = int(getattr(settings, "SETTLEMENT_POLL_MIN", 10))
     max_lag_hours: int = int(getattr(settings, "SETTLEMENT_MAX_LAG_HOURS", 24))
     rolling_days: int = int(getattr(settings, "PORTFOLIO_ROLLING_DAYS", 60))
+    _portfolio: _PortfolioTotals | None = field(default=None, init=False, repr=False)
+    _portfolio_cutoff: str | None = field(default=None, init=False, repr=False)
+    _runs_since_resync: int = field(default=0, init=False, repr=False)
 
     def __post_init__(self) -> None:
         path = Path(self.db_path)
@@ -68,55 +111,68 @@ class SettlementEngine:
     def settle(self) -> int:
         picks = self._load_unsettled_picks()
         if not picks:
-            self._update_portfolio_metrics()
+            self._update_portfolio_metrics(())
             return 0
         match_keys = sorted({pick["match_key"] for pick in picks})
         results = self.results_provider.fetch(match_keys)
-        settled = 0
-        now = datetime.now(UTC)
+        updates: list[tuple[int, str, float, float | None]] = []
+        settled_rows: list[tuple[str, float, float | None]] = []
+        for row in picks:
+            result = results.get(row["match_key"])
+            if not result or result.status.lower() != "finished":
+                continue
+            outcome = self._determine_outcome(
+                market=row["market"],
+                selection=row["selection"],
+                home_score=result.home_score,
+                away_score=result.away_score,
+            )
+            if outcome is None:
+                continue
+            roi_value = self._compute_roi(row["price_taken"], outcome)
+            clv_value = row["clv_pct"]
+            if clv_value is None and row["closing_price"] is not None:
+                try:
+                    clv_value = calculate_clv(float(row["price_taken"]), float(row["closing_price"]))
+                except ZeroDivisionError:
+                    clv_value = 0.0
+            updates.append((int(row["id"]), outcome, roi_value, clv_value))
+            settled_rows.append((str(row["created_at"]), roi_value, clv_value))
+        if updates:
+            self._apply_updates(updates, datetime.now(UTC))
+            for _, outcome, _, _ in updates:
+                picks_settled_total.labels(outcome=outcome).inc()
+        self._update_portfolio_metrics(settled_rows)
+        return len(updates)
+
+    def _apply_updates(
+        self,
+        updates: Sequence[tuple[int, str, float, float | None]],
+        now: datetime,
+    ) -> None:
+        """Write all outcomes with one ``UPDATE ... FROM (VALUES ...)`` per chunk."""
+
+        stamp = _to_iso(now)
         with self._connect() as conn:
-            for row in picks:
-                match_key = row["match_key"]
-                result = results.get(match_key)
-                if not result or result.status.lower() != "finished":
-                    continue
-                outcome = self._determine_outcome(
-                    market=row["market"],
-                    selection=row["selection"],
-                    home_score=result.home_score,
-                    away_score=result.away_score,
-                )
-                if outcome is None:
-                    continue
-                roi_value = self._compute_roi(row["price_taken"], outcome)
-                clv_value = row["clv_pct"]
-                if clv_value is None and row["closing_price"] is not None:
-                    try:
-                        clv_value = calculate_clv(float(row["price_taken"]), float(row["closing_price"]))
-                    except ZeroDivisionError:
-                        clv_value = 0.0
+            for start in range(0, len(updates), _UPDATE_CHUNK):
+                chunk = updates[start : start + _UPDATE_CHUNK]
+                values = ", ".join("(?, ?, ?, ?)" for _ in chunk)
+                params: list[object] = [item for update in chunk for item in update]
                 conn.execute(
-                    """
+                    f"""
+                    WITH batch(id, outcome, roi, clv_pct) AS (VALUES {values})
                     UPDATE picks_ledger
-                       SET outcome = ?,
-                           roi = ?,
-                           clv_pct = COALESCE(?, clv_pct),
+                       SET outcome = batch.outcome,
+                           roi = batch.roi,
+                           clv_pct = COALESCE(batch.clv_pct, picks_ledger.clv_pct),
                            updated_at = ?
-                     WHERE id = ?
+                      FROM batch
+                     WHERE picks_ledger.id = batch.id
+                       AND picks_ledger.outcome IS NULL
                     """,
-                    (
-                        outcome,
-                        roi_value,
-                        clv_value,
-                        _to_iso(now),
-                        int(row["id"]),
-                    ),
+                    (*params, stamp),
                 )
-                picks_settled_total.labels(outcome=outcome).inc()
-                settled += 1
             conn.commit()
-        self._update_portfolio_metrics()
-        return settled
 
     def _load_unsettled_picks(self) -> list[sqlite3.Row]:
         cutoff = datetime.now(UTC) - timedelta(minutes=max(self.poll_min, 1))
@@ -125,10 +181,12 @@ class SettlementEngine:
                 """
                 SELECT id, match_key, market, selection, price_taken,
                        provider_price_decimal, consensus_price_decimal,
-                       kickoff_utc, clv_pct, closing_price, outcome
+                       kickoff_utc, clv_pct, closing_price, outcome, created_at
                   FROM picks_ledger
                  WHERE outcome IS NULL
+                   AND kickoff_utc <= ?
                 """,
+                (_to_iso(cutoff + _KICKOFF_SLACK),),
             ).fetchall()
         eligible: list[sqlite3.Row] = []
         for row in rows:
@@ -194,24 +252,50 @@ class SettlementEngine:
                 return "lose" if both_scored else "win"
         return None
 
-    def _update_portfolio_metrics(self) -> None:
-        cutoff = datetime.now(UTC) - timedelta(days=max(self.rolling_days, 1))
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT roi, clv_pct
-                  FROM picks_ledger
-                 WHERE outcome IS NOT NULL
-                   AND created_at >= ?
-                """,
-                (_to_iso(cutoff),),
-            ).fetchall()
-        roi_values = [float(row["roi"]) for row in rows if row["roi"] is not None]
-        clv_values = [float(row["clv_pct"]) for row in rows if row["clv_pct"] is not None]
-        avg_roi = sum(roi_values) / len(roi_values) if roi_values else 0.0
-        avg_clv = sum(clv_values) / len(clv_values) if clv_values else 0.0
-        portfolio_roi_rolling.labels(window_days=str(self.rolling_days)).set(avg_roi)
-        clv_mean_pct.set(avg_clv)
+    def _update_portfolio_metrics(
+        self, settled_rows: Sequence[tuple[str, float, float | None]]
+    ) -> None:
+        """Refresh rolling ROI/CLV gauges from running totals.
+
+        The window totals are rebuilt with one SQL aggregate on the first run
+        (and periodically to absorb external ledger edits); otherwise only the
+        picks settled in this run are added and the slice that slid out of the
+        window since the previous run is subtracted.
+        """
+
+        cutoff = _to_iso(datetime.now(UTC) - timedelta(days=max(self.rolling_days, 1)))
+        aggregate = """
+            SELECT SUM(roi), COUNT(roi), SUM(clv_pct), COUNT(clv_pct)
+              FROM picks_ledger
+             WHERE outcome IS NOT NULL
+               AND created_at >= ?
+        """
+        previous = self._portfolio_cutoff
+        totals = self._portfolio
+        if (
+            totals is None
+            or previous is None
+            or self._runs_since_resync >= _PORTFOLIO_RESYNC_RUNS
+        ):
+            totals = _PortfolioTotals()
+            with self._connect() as conn:
+                totals.merge(conn.execute(aggregate, (cutoff,)).fetchone())
+            self._runs_since_resync = 0
+        else:
+            for created_at, roi, clv in settled_rows:
+                if created_at >= previous:
+                    totals.add(roi, clv)
+            if cutoff > previous:
+                with self._connect() as conn:
+                    expired = conn.execute(
+                        aggregate + " AND created_at < ?", (previous, cutoff)
+                    ).fetchone()
+                totals.merge(expired, sign=-1)
+            self._runs_since_resync += 1
+        self._portfolio = totals
+        self._portfolio_cutoff = max(cutoff, previous or cutoff)
+        portfolio_roi_rolling.labels(window_days=str(self.rolling_days)).set(totals.avg_roi)
+        clv_mean_pct.set(totals.avg_clv)
 
 
 __all__ = ["FixtureResult", "ResultsProvider", "SettlementEngine"]
@@ -9,14 +9,17 @@
 
 from __future__ import annotations
 
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import UTC, datetime, time, timedelta
+from functools import lru_cache
 from typing import NamedTuple
 from zoneinfo import ZoneInfo
 
 from app.bot.storage import (
-    get_last_value_alert_sent,
+    get_last_value_alerts_sent,
     list_recent_value_alerts,
+    list_recent_value_alerts_many,
     record_value_alert_sent,
 )
 
@@ -59,23 +62,75 @@ class AlertHygiene:
         self._max_updates = max(int(max_updates), 0)
 
     def evaluate(self, candidate: AlertCandidate, *, now: datetime) -> AlertDecision:
+        return self.evaluate_many([candidate], now=now)[0]
+
+    def evaluate_many(
+        self, candidates: Sequence[AlertCandidate], *, now: datetime
+    ) -> list[AlertDecision]:
+        """Decide a whole fan-out with one prefetch of delivery history.
+
+        Candidates that survive the cheap staleness and quiet-hours checks have
+        their last delivery and the users' recent deliveries loaded in bulk, so
+        the cost no longer scales with one pair of queries per candidate.
+        Alerts accepted earlier in the batch count as delivered for the rest.
+        """
+
         now = now.astimezone(UTC)
-        if self._staleness and now - candidate.pulled_at > timedelta(minutes=self._staleness):
-            return AlertDecision(False, "stale_quote")
-        if self._is_quiet(candidate, now=now):
-            return AlertDecision(False, "quiet_hours")
-        last = get_last_value_alert_sent(
-            candidate.user_id,
-            match_key=candidate.match_key,
-            market=candidate.market,
-            selection=candidate.selection,
-        )
+        decisions: list[AlertDecision | None] = [None] * len(candidates)
+        pending: list[int] = []
+        for index, candidate in enumerate(candidates):
+            if self._staleness and now - candidate.pulled_at > timedelta(minutes=self._staleness):
+                decisions[index] = AlertDecision(False, "stale_quote")
+            elif self._is_quiet(candidate, now=now):
+                decisions[index] = AlertDecision(False, "quiet_hours")
+            else:
+                pending.append(index)
+        if pending:
+            last_sent = get_last_value_alerts_sent(
+                _alert_key(candidates[index]) for index in pending
+            )
+            recent = (
+                list_recent_value_alerts_many(
+                    (candidates[index].user_id for index in pending), limit=self._max_updates
+                )
+                if self._max_updates
+                else {}
+            )
+            for index in pending:
+                candidate = candidates[index]
+                key = _alert_key(candidate)
+                history = recent.get(candidate.user_id, [])
+                decision = self._decide(
+                    candidate, now=now, last=last_sent.get(key), recent=history
+                )
+                decisions[index] = decision
+                if decision.should_send:
+                    # Count the accepted alert as delivered so later candidates in
+                    # the batch see it, as sequential evaluate()/record would.
+                    delivered = {
+                        "match_key": candidate.match_key,
+                        "market": candidate.market,
+                        "selection": candidate.selection,
+                        "edge_pct": candidate.edge_pct,
+                        "sent_at": now,
+                    }
+                    last_sent[key] = delivered
+                    if self._max_updates:
+                        recent[candidate.user_id] = [delivered, *history][: self._max_updates]
+        return [decision for decision in decisions if decision is not None]
+
+    def _decide(
+        self,
+        candidate: AlertCandidate,
+        *,
+        now: datetime,
+        last: dict[str, object] | None,
+        recent: Sequence[dict[str, object]],
+    ) -> AlertDecision:
         if self._max_updates:
             history = [
                 row
-                for row in list_recent_value_alerts(
-                    candidate.user_id, limit=self._max_updates
-                )
+                for row in recent
                 if row.get("match_key") == candidate.match_key
                 and row.get("market") == candidate.market
                 and row.get("selection") == candidate.selection
@@ -110,7 +165,7 @@ class AlertHygiene:
         start, end = self._quiet_hours
         tz = _safe_timezone(candidate.user_timezone)
         local_now = now.astimezone(tz)
-        current_time = local_now.timetz()
+        current_time = local_now.time()
         return _within_quiet_hours(current_time, start, end)
 
 
@@ -132,6 +187,11 @@ def _within_quiet_hours(current: time, start: time, end: time) -> bool:
     return current >= start or current < end
 
 
+def _alert_key(candidate: AlertCandidate) -> tuple[int, str, str, str]:
+    return (candidate.user_id, candidate.match_key, candidate.market, candidate.selection)
+
+
+@lru_cache(maxsize=256)
 def _safe_timezone(name: str) -> ZoneInfo:
     try:
         return ZoneInfo(name)
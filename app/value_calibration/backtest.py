@@ -2,7 +2,7 @@
 /**
  * @file: app/value_calibration/backtest.py
  * @description: Backtesting utilities to calibrate value betting thresholds per league/market.
- * @dependencies: dataclasses, datetime, math, statistics, typing
+ * @dependencies: dataclasses, datetime, math, statistics, typing, numpy
  * @created: 2025-10-05
  */
 """
@@ -15,6 +15,8 @@ from math import log
 from statistics import mean, pstdev
 from typing import Iterable, Iterator, Sequence
 
+import numpy as np
+
 
 @dataclass(slots=True)
 class BacktestSample:
@@ -95,21 +97,23 @@ class BacktestRunner:
         windows = list(_build_windows(samples, config))
         if not windows:
             return None
-        best_metric = float("-inf")
-        best_payload: dict[str, object] | None = None
-        for tau in config.edge_grid:
-            for gamma in config.confidence_grid:
-                aggregated = _evaluate_thresholds(windows, tau, gamma)
-                metric_value = _score_metric(aggregated.metrics, config.optim_target)
-                if metric_value > best_metric:
-                    best_metric = metric_value
-                    best_payload = {
-                        "tau_edge": float(tau),
-                        "gamma_conf": float(gamma),
-                        "metric": metric_value,
-                        "metrics": aggregated.metrics,
-                    }
-        return best_payload
+        picked = [sample for window in windows for sample in window]
+        surface = _threshold_surface(picked, config.edge_grid, config.confidence_grid)
+        scores = _score_surface(surface, config.optim_target)
+        if scores.size == 0:
+            return None
+        # Row-major argmax keeps the first best point in edge-then-confidence order.
+        flat_index = int(np.argmax(scores))
+        best_metric = float(scores.flat[flat_index])
+        if best_metric == float("-inf"):
+            return None
+        tau_index, gamma_index = np.unravel_index(flat_index, scores.shape)
+        return {
+            "tau_edge": float(config.edge_grid[tau_index]),
+            "gamma_conf": float(config.confidence_grid[gamma_index]),
+            "metric": best_metric,
+            "metrics": _surface_metrics(surface, int(tau_index), int(gamma_index)),
+        }
 
 
 def _group_by_pair(samples: Sequence[BacktestSample]):
@@ -150,22 +154,112 @@ def build_windows(
 
 
 @dataclass(slots=True)
-class _WindowResult:
-    metrics: BacktestMetrics
+class _ThresholdSurface:
+    """Per-grid-point sums over samples with ``edge >= tau`` and ``confidence >= gamma``."""
+
+    count: np.ndarray
+    wins: np.ndarray
+    edge: np.ndarray
+    price: np.ndarray
+    profit: np.ndarray
+    profit_sq: np.ndarray
+    log_gain: np.ndarray
+
+
+def _threshold_surface(
+    samples: Sequence[BacktestSample],
+    edge_grid: Sequence[float],
+    confidence_grid: Sequence[float],
+) -> _ThresholdSurface:
+    """Aggregate the whole ``edge_grid x confidence_grid`` surface in one pass.
+
+    Samples are sorted by edge once; for each confidence threshold the masked
+    columns are suffix-summed, so the totals for any edge threshold are a single
+    lookup at its ``searchsorted`` position.
+    """
+
+    edges = np.fromiter((item.edge_pct for item in samples), dtype=float, count=len(samples))
+    order = np.argsort(edges, kind="stable")
+    edges = edges[order]
+    confidence = np.array([samples[i].confidence for i in order], dtype=float)
+    prices = np.array([samples[i].price_decimal for i in order], dtype=float)
+    results = np.array([1 if samples[i].result else 0 for i in order], dtype=float)
+
+    profits = np.where(prices <= 1.0, -1.0, results * (prices - 1.0) - (1.0 - results))
+    wealth = 1.0 + profits
+    log_gain = np.where(wealth > 0, np.log(np.where(wealth > 0, wealth, 1.0)), log(1e-9))
+
+    taus = np.asarray(edge_grid, dtype=float)
+    gammas = np.asarray(confidence_grid, dtype=float)
+    # (n_gamma, n_samples) inclusion mask; the trailing zero column makes the
+    # suffix sum at position n (no sample above tau) equal to zero.
+    mask = (confidence[None, :] >= gammas[:, None]).astype(float)
+    starts = np.searchsorted(edges, taus, side="left")
+
+    def _suffix(values: np.ndarray) -> np.ndarray:
+        weighted = mask * values[None, :]
+        padded = np.concatenate([weighted, np.zeros((len(gammas), 1))], axis=1)
+        suffix = np.flip(np.cumsum(np.flip(padded, axis=1), axis=1), axis=1)
+        return suffix[:, starts].T  # (n_tau, n_gamma)
+
+    ones = np.ones_like(edges)
+    return _ThresholdSurface(
+        count=np.rint(_suffix(ones)).astype(int),
+        wins=np.rint(_suffix(results)).astype(int),
+        edge=_suffix(edges),
+        price=_suffix(prices),
+        profit=_suffix(profits),
+        profit_sq=_suffix(profits * profits),
+        log_gain=_suffix(log_gain),
+    )
+
+
+def _surface_sharpe(surface: _ThresholdSurface) -> np.ndarray:
+    count = surface.count.astype(float)
+    safe = np.where(count > 0, count, 1.0)
+    mean_profit = surface.profit / safe
+    mean_sq = surface.profit_sq / safe
+    variance = mean_sq - mean_profit * mean_profit
+    # Cancellation noise must not turn identical outcomes into a huge Sharpe.
+    variance = np.where(variance > 1e-12 * np.maximum(mean_sq, 1.0), variance, 0.0)
+    sharpe = np.divide(
+        mean_profit,
+        np.sqrt(variance),
+        out=np.zeros_like(mean_profit),
+        where=variance > 0,
+    )
+    return np.where(count > 1, sharpe, 0.0)
+
+
+def _score_surface(surface: _ThresholdSurface, target: str) -> np.ndarray:
+    count = surface.count
+    safe = np.where(count > 0, count, 1).astype(float)
+    target_lower = target.lower()
+    if target_lower == "sharpe":
+        scores = _surface_sharpe(surface)
+    elif target_lower == "hit":
+        scores = surface.wins / safe
+    elif target_lower == "loggain":
+        scores = surface.log_gain / safe
+    else:
+        raise ValueError(f"Unknown optimisation target: {target}")
+    return np.where(count > 0, scores, float("-inf"))
 
 
-def _evaluate_thresholds(
-    windows: Iterable[Sequence[BacktestSample]],
-    tau_edge: float,
-    gamma_conf: float,
-) -> _WindowResult:
-    picked: list[BacktestSample] = []
-    for window in windows:
-        for sample in window:
-            if sample.edge_pct >= tau_edge and sample.confidence >= gamma_conf:
-                picked.append(sample)
-    metrics = _compute_metrics(picked)
-    return _WindowResult(metrics=metrics)
+def _surface_metrics(surface: _ThresholdSurface, row: int, col: int) -> BacktestMetrics:
+    samples = int(surface.count[row, col])
+    if samples == 0:
+        return _compute_metrics(())
+    wins = int(surface.wins[row, col])
+    return BacktestMetrics(
+        samples=samples,
+        wins=wins,
+        hit_rate=wins / samples,
+        avg_edge_pct=float(surface.edge[row, col]) / samples,
+        avg_price=float(surface.price[row, col]) / samples,
+        avg_log_gain=float(surface.log_gain[row, col]) / samples,
+        sharpe=float(_surface_sharpe(surface)[row, col]),
+    )
 
 
 def _compute_metrics(samples: Sequence[BacktestSample]) -> BacktestMetrics:
@@ -219,19 +313,6 @@ def _safe_log_return(profit: float) -> float:
     return log(wealth)
 
 
-def _score_metric(metrics: BacktestMetrics, target: str) -> float:
-    if metrics.samples == 0:
-        return float("-inf")
-    target_lower = target.lower()
-    if target_lower == "sharpe":
-        return metrics.sharpe
-    if target_lower == "hit":
-        return metrics.hit_rate
-    if target_lower == "loggain":
-        return metrics.avg_log_gain
-    raise ValueError(f"Unknown optimisation target: {target}")
-
-
 def iter_recent_samples(
     samples: Iterable[BacktestSample],
     *,
@@ -2,7 +2,7 @@
 /**
  * @file: app/value_clv.py
  * @description: Closing line value calculations and picks ledger persistence helpers.
- * @dependencies: sqlite3, dataclasses, app.lines.aggregator, app.value_detector
+ * @dependencies: sqlite3, threading, app.bot.storage, app.lines.aggregator, app.value_detector
  * @created: 2025-10-05
  */
 """
@@ -10,11 +10,15 @@
 from __future__ import annotations
 
 import sqlite3
-from dataclasses import dataclass
+import threading
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from app.bot.storage import ensure_schema
 from app.lines.aggregator import ConsensusMeta
 from config import settings
 
@@ -25,6 +29,10 @@ if TYPE_CHECKING:
 def _to_iso(value: datetime) -> str:
     return value.astimezone(UTC).isoformat().replace("+00:00", "Z")
 
+# Closing lines per set-based UPDATE; 6 bound parameters each.
+_CLOSING_CHUNK = 150
+
+
 def calculate_clv(price_taken: float, closing_price: float) -> float:
     if price_taken <= 0 or closing_price <= 0:
         return 0.0
@@ -34,6 +42,7 @@ def calculate_clv(price_taken: float, closing_price: float) -> float:
 @dataclass(slots=True)
 class PicksLedgerStore:
     db_path: str = settings.DB_PATH
+    _local: threading.local = field(default_factory=threading.local, init=False, repr=False)
 
     def __post_init__(self) -> None:
         path = Path(self.db_path)
@@ -41,10 +50,33 @@ class PicksLedgerStore:
         self.db_path = str(path)
 
     def _connect(self) -> sqlite3.Connection:
+        # schema.sql owns the ledger, the user_portfolio_summary table and the
+        # triggers that maintain it; applying it is a set lookup once current.
+        ensure_schema(self.db_path)
         conn = sqlite3.connect(self.db_path)
         conn.row_factory = sqlite3.Row
         return conn
 
+    @contextmanager
+    def batch(self) -> Iterator[sqlite3.Connection]:
+        """Share one connection and transaction across ledger writes in the block."""
+
+        shared = getattr(self._local, "conn", None)
+        if shared is not None:
+            yield shared
+            return
+        conn = self._connect()
+        self._local.conn = conn
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            conn.close()
+
     def record_pick(
         self,
         user_id: int,
@@ -53,14 +85,24 @@ class PicksLedgerStore:
         *,
         best_price: dict[str, object] | None = None,
     ) -> None:
-        provider_price = (
-            float(best_price.get("price_decimal"))
-            if isinstance(best_price, dict) and best_price.get("price_decimal") is not None
-            else float(pick.market_price)
-        )
-        consensus_price_decimal = float(consensus.price_decimal)
-        with self._connect() as conn:
-            conn.execute(
+        self.record_picks([(user_id, pick, consensus, best_price)])
+
+    def record_picks(
+        self,
+        entries: Iterable[
+            tuple[int, ValuePick, ConsensusMeta, dict[str, object] | None]
+        ],
+    ) -> None:
+        """Upsert ``(user_id, pick, consensus, best_price)`` rows in one statement batch."""
+
+        params = [
+            self._pick_params(user_id, pick, consensus, best_price)
+            for user_id, pick, consensus, best_price in entries
+        ]
+        if not params:
+            return
+        with self.batch() as conn:
+            conn.executemany(
                 """
                 INSERT INTO picks_ledger(
                     user_id, match_key, market, selection, stake, price_taken,
@@ -68,7 +110,10 @@ class PicksLedgerStore:
                     model_probability, market_probability, edge_pct, confidence,
                     pulled_at_utc, kickoff_utc, consensus_price, consensus_price_decimal, consensus_method,
                     consensus_provider_count, created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, DATETIME('now'), DATETIME('now'))
+                ) VALUES (
+                    ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,
+                    DATETIME('now'), DATETIME('now')
+                )
                 ON CONFLICT(user_id, match_key, market, selection, pulled_at_utc) DO UPDATE SET
                     price_taken=excluded.price_taken,
                     provider_price_decimal=excluded.provider_price_decimal,
@@ -82,33 +127,64 @@ class PicksLedgerStore:
                     consensus_provider_count=excluded.consensus_provider_count,
                     updated_at=DATETIME('now')
                 """,
-                (
-                    int(user_id),
-                    pick.match_key,
-                    pick.market,
-                    pick.selection,
-                    1.0,
-                    provider_price,
-                    provider_price,
-                    float(pick.model_probability),
-                    float(pick.market_probability),
-                    float(pick.edge_pct),
-                    float(pick.confidence),
-                    _to_iso(pick.pulled_at),
-                    _to_iso(pick.kickoff_utc),
-                    float(consensus.price_decimal),
-                    consensus_price_decimal,
-                    consensus.method,
-                    int(consensus.provider_count),
-                ),
+                params,
             )
-            conn.commit()
+
+    @staticmethod
+    def _pick_params(
+        user_id: int,
+        pick: ValuePick,
+        consensus: ConsensusMeta,
+        best_price: dict[str, object] | None,
+    ) -> tuple[object, ...]:
+        provider_price = (
+            float(best_price.get("price_decimal"))
+            if isinstance(best_price, dict) and best_price.get("price_decimal") is not None
+            else float(pick.market_price)
+        )
+        consensus_price_decimal = float(consensus.price_decimal)
+        return (
+            int(user_id),
+            pick.match_key,
+            pick.market,
+            pick.selection,
+            1.0,
+            provider_price,
+            provider_price,
+            float(pick.model_probability),
+            float(pick.market_probability),
+            float(pick.edge_pct),
+            float(pick.confidence),
+            _to_iso(pick.pulled_at),
+            _to_iso(pick.kickoff_utc),
+            float(consensus.price_decimal),
+            consensus_price_decimal,
+            consensus.method,
+            int(consensus.provider_count),
+        )
 
     def record_closing_line(self, consensus: ConsensusMeta) -> None:
-        if consensus.closing_price is None or consensus.closing_pulled_at is None:
+        self.record_closing_lines([consensus])
+
+    def record_closing_lines(self, consensuses: Iterable[ConsensusMeta]) -> None:
+        params = [
+            (
+                consensus.match_key,
+                consensus.market,
+                consensus.selection,
+                float(consensus.closing_price),
+                float(consensus.probability),
+                int(consensus.provider_count),
+                consensus.method,
+                _to_iso(consensus.closing_pulled_at),
+            )
+            for consensus in consensuses
+            if consensus.closing_price is not None and consensus.closing_pulled_at is not None
+        ]
+        if not params:
             return
-        with self._connect() as conn:
-            conn.execute(
+        with self.batch() as conn:
+            conn.executemany(
                 """
                 INSERT INTO closing_lines(
                     match_key, market, selection, consensus_price, consensus_probability,
@@ -122,54 +198,87 @@ class PicksLedgerStore:
                     pulled_at_utc=excluded.pulled_at_utc,
                     updated_at=DATETIME('now')
                 """,
-                (
-                    consensus.match_key,
-                    consensus.market,
-                    consensus.selection,
-                    float(consensus.closing_price),
-                    float(consensus.probability),
-                    int(consensus.provider_count),
-                    consensus.method,
-                    _to_iso(consensus.closing_pulled_at),
-                ),
+                params,
             )
-            conn.commit()
 
     def apply_closing_to_picks(self, consensus: ConsensusMeta) -> None:
-        if consensus.closing_price is None or consensus.closing_pulled_at is None:
-            return
-        closing_price = consensus.closing_price
-        closing_time = consensus.closing_pulled_at
-        with self._connect() as conn:
-            rows = conn.execute(
-                """
-                SELECT id, price_taken
-                  FROM picks_ledger
-                 WHERE match_key = ? AND market = ? AND selection = ?
-                """,
-                (consensus.match_key, consensus.market, consensus.selection),
-            ).fetchall()
-            for row in rows:
-                clv_pct = calculate_clv(float(row["price_taken"]), float(closing_price))
+        self.apply_closing_lines([consensus])
+
+    def apply_closing_lines(self, consensuses: Sequence[ConsensusMeta] | None = None) -> int:
+        """Stamp closing odds and CLV onto every matching pick with set-based UPDATEs.
+
+        With explicit ``consensuses`` the picks are joined against those closing
+        lines; without arguments the whole ``closing_lines`` table is applied,
+        which is the end-of-day path. Picks already carrying the same closing
+        line are left untouched, so repeated runs do not fire the summary
+        triggers for the whole ledger. Returns the number of picks updated.
+        """
+
+        # CLV mirrors calculate_clv() so the SQL and Python paths agree.
+        assignments = """
+               SET closing_price = cl.price,
+                   closing_pulled_at = cl.pulled_at,
+                   closing_method = cl.method,
+                   clv_pct = CASE
+                       WHEN picks_ledger.price_taken > 0 AND cl.price > 0
+                       THEN (picks_ledger.price_taken / cl.price - 1.0) * 100.0
+                       ELSE 0.0
+                   END,
+                   updated_at = DATETIME('now')
+              FROM cl
+             WHERE picks_ledger.match_key = cl.match_key
+               AND picks_ledger.market = cl.market
+               AND picks_ledger.selection = cl.selection
+               AND (
+                   picks_ledger.closing_price IS NOT cl.price
+                   OR picks_ledger.closing_pulled_at IS NOT cl.pulled_at
+                   OR picks_ledger.closing_method IS NOT cl.method
+               )
+        """
+        with self.batch() as conn:
+            # rowcount is not reported for WITH-prefixed DML and total_changes
+            # includes summary-trigger writes, so ask SQLite for changes().
+            if consensuses is None:
                 conn.execute(
                     """
+                    WITH cl(match_key, market, selection, price, pulled_at, method) AS (
+                        SELECT match_key, market, selection, consensus_price, pulled_at_utc, method
+                          FROM closing_lines
+                    )
                     UPDATE picks_ledger
-                       SET closing_price = ?,
-                           closing_pulled_at = ?,
-                           closing_method = ?,
-                           clv_pct = ?,
-                           updated_at = DATETIME('now')
-                     WHERE id = ?
-                    """,
-                    (
-                        float(closing_price),
-                        _to_iso(closing_time),
-                        consensus.method,
-                        clv_pct,
-                        int(row["id"]),
-                    ),
+                    """
+                    + assignments
                 )
-            conn.commit()
+                return int(conn.execute("SELECT changes()").fetchone()[0])
+            # Last line per selection wins, as with sequential per-line updates.
+            latest: dict[tuple[str, str, str], tuple[object, ...]] = {}
+            for consensus in consensuses:
+                if consensus.closing_price is None or consensus.closing_pulled_at is None:
+                    continue
+                key = (consensus.match_key, consensus.market, consensus.selection)
+                latest[key] = (
+                    *key,
+                    float(consensus.closing_price),
+                    _to_iso(consensus.closing_pulled_at),
+                    consensus.method,
+                )
+            rows = list(latest.values())
+            updated = 0
+            for start in range(0, len(rows), _CLOSING_CHUNK):
+                chunk = rows[start : start + _CLOSING_CHUNK]
+                values = ", ".join("(?, ?, ?, ?, ?, ?)" for _ in chunk)
+                conn.execute(
+                    f"""
+                    WITH cl(match_key, market, selection, price, pulled_at, method) AS (
+                        VALUES {values}
+                    )
+                    UPDATE picks_ledger
+                    """
+                    + assignments,
+                    [item for row in chunk for item in row],
+                )
+                updated += int(conn.execute("SELECT changes()").fetchone()[0])
+        return updated
 
     def list_user_picks(
         self,
@@ -205,12 +314,8 @@ class PicksLedgerStore:
         with self._connect() as conn:
             totals = conn.execute(
                 """
-                SELECT COUNT(*) AS total,
-                       AVG(clv_pct) AS avg_clv,
-                       SUM(CASE WHEN clv_pct IS NOT NULL THEN 1 ELSE 0 END) AS clv_count,
-                       SUM(CASE WHEN clv_pct IS NOT NULL AND clv_pct >= 0 THEN 1 ELSE 0 END) AS clv_positive,
-                       AVG(edge_pct) AS avg_edge
-                  FROM picks_ledger
+                SELECT total, edge_sum, clv_sum, clv_count, clv_positive
+                  FROM user_portfolio_summary
                  WHERE user_id = ?
                 """,
                 (int(user_id),),
@@ -235,11 +340,11 @@ class PicksLedgerStore:
                 """,
                 (int(user_id), int(page_size), int(offset)),
             ).fetchall()
-        total = int(totals["total"] or 0)
-        clv_count = int(totals["clv_count"] or 0)
-        clv_positive = int(totals["clv_positive"] or 0)
-        avg_clv = float(totals["avg_clv"]) if totals["avg_clv"] is not None else 0.0
-        avg_edge = float(totals["avg_edge"]) if totals["avg_edge"] is not None else 0.0
+        total = int(totals["total"]) if totals else 0
+        clv_count = int(totals["clv_count"]) if totals else 0
+        clv_positive = int(totals["clv_positive"]) if totals else 0
+        avg_clv = float(totals["clv_sum"]) / clv_count if clv_count else 0.0
+        avg_edge = float(totals["edge_sum"]) / total if total else 0.0
         positive_share = (clv_positive / clv_count) if clv_count else 0.0
         avg_roi = float(roi_row["avg_roi"]) if roi_row and roi_row["avg_roi"] is not None else 0.0
         total_pages = max((total + page_size - 1) // page_size, 1)
@@ -316,6 +316,7 @@ class ValueService:
             "closing_pulled_at": payload.get("closing_pulled_at"),
             "pulled_at": payload.get("pulled_at"),
             "kickoff_utc": payload.get("kickoff_utc"),
+            "missing_providers": list(payload.get("missing_providers") or []),
         }
 
     def _get_aggregator(self) -> LinesAggregator | None:
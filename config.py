@@ -36,6 +36,7 @@ class Settings(BaseSettings):
     SPORTMONKS_RETRY_ATTEMPTS: int = 4
     SPORTMONKS_BACKOFF_BASE: float = 0.5
     SPORTMONKS_RPS_LIMIT: float = 3.0
+    SPORTMONKS_PAGE_CONCURRENCY: int = 4
     SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS: int = 7
     SPORTMONKS_LEAGUES_ALLOWLIST: str = ""
     SPORTMONKS_CACHE_TTL_SEC: int = 900
@@ -46,6 +47,7 @@ class Settings(BaseSettings):
     ODDS_REFRESH_SEC: int = 300
     ODDS_RPS_LIMIT: float = 3.0
     ODDS_TIMEOUT_SEC: float = 8.0
+    ODDS_PROVIDER_DEADLINE_SEC: float = 10.0
     ODDS_RETRY_ATTEMPTS: int = 4
     ODDS_BACKOFF_BASE: float = 0.4
     ODDS_OVERROUND_METHOD: str = "proportional"
@@ -79,6 +81,7 @@ class Settings(BaseSettings):
     VALUE_ALERT_MIN_EDGE_DELTA: float = 0.7
     VALUE_ALERT_UPDATE_DELTA: float = 1.5
     VALUE_ALERT_MAX_UPDATES: int = 3
+    VALUE_ALERT_SCHEDULE: str = "@every 5m"
     VALUE_STALENESS_FAIL_MIN: int = 30
     CLV_WINDOW_BEFORE_KICKOFF_MIN: int = 120
     CLV_FAIL_THRESHOLD_PCT: float = -1.0
@@ -134,6 +137,11 @@ class Settings(BaseSettings):
     LOG_DIR: str = "/data/logs"
     BACKUP_DIR: str = "/data/backups"
     BACKUP_KEEP: int = 10
+    BACKUP_CRON: str = "30 4 * * *"
+    VACUUM_CRON: str = "0 5 * * 0"
+    SCHEDULER_JITTER_SEC: float = 600.0
+    DIGEST_SCHEDULE: str = "@every 1m"
+    SM_SYNC_CRON: str = ""
     RUNTIME_LOCK_PATH: str = "/data/runtime.lock"
     ENABLE_HEALTH: bool = False
     HEALTH_HOST: str = "0.0.0.0"
@@ -160,8 +168,10 @@ class Settings(BaseSettings):
     FAILSAFE_MODE: bool = False
     PAGINATION_PAGE_SIZE: int = 5
     CACHE_TTL_SECONDS: int = 120
+    CACHE_STALE_TTL_SECONDS: int = 0
     ADMIN_IDS: str = ""
     DIGEST_DEFAULT_TIME: str = "09:00"
+    DIGEST_SEND_CONCURRENCY: int = 8
     SHOW_DATA_STALENESS: int = 0
     CANARY: bool = False
 
@@ -203,6 +213,7 @@ class Settings(BaseSettings):
     SIM_RHO: float = 0.1
     SIM_N: int = 10000
     SIM_CHUNK: int = 100000
+    SIM_ENGINE: str = "mc"
     SIM_SEED: int = 20240920
 
     # --- Worker coordination ---
@@ -343,6 +354,20 @@ class Settings(BaseSettings):
             raise ValueError("CACHE_TTL_SECONDS must be positive")
         return v
 
+    @field_validator("CACHE_STALE_TTL_SECONDS")
+    @classmethod
+    def validate_cache_stale_ttl(cls, v: int) -> int:
+        if v < 0:
+            raise ValueError("CACHE_STALE_TTL_SECONDS must be non-negative")
+        return v
+
+    @field_validator("DIGEST_SEND_CONCURRENCY")
+    @classmethod
+    def validate_digest_concurrency(cls, v: int) -> int:
+        if v <= 0:
+            raise ValueError("DIGEST_SEND_CONCURRENCY must be positive")
+        return v
+
     @field_validator("DIGEST_DEFAULT_TIME")
     @classmethod
     def validate_digest_time(cls, v: str) -> str:
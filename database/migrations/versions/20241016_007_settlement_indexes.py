@@ -0,0 +1,38 @@
+"""
+@file: 20241016_007_settlement_indexes.py
+@description: Index unsettled picks by kickoff and ledger rows by creation time for settlement.
+@dependencies: alembic, sqlalchemy
+@created: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20241016_007_settlement_indexes"
+down_revision = "20241012_006_provider_reliability_v2"
+branch_labels = None
+depends_on = None
+
+
+async def upgrade() -> None:
+    op.create_index(
+        "picks_ledger_unsettled_idx",
+        "picks_ledger",
+        ["kickoff_utc"],
+        unique=False,
+        sqlite_where=sa.text("outcome IS NULL"),
+        postgresql_where=sa.text("outcome IS NULL"),
+    )
+    op.create_index(
+        "picks_ledger_created_idx",
+        "picks_ledger",
+        ["created_at"],
+        unique=False,
+    )
+
+
+async def downgrade() -> None:
+    op.drop_index("picks_ledger_created_idx", table_name="picks_ledger")
+    op.drop_index("picks_ledger_unsettled_idx", table_name="picks_ledger")
@@ -0,0 +1,166 @@
+"""
+@file: 20241016_008_user_portfolio_summary.py
+@description: Per-user portfolio aggregates maintained by picks_ledger triggers, with backfill.
+@dependencies: alembic, sqlalchemy
+@created: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+revision = "20241016_008_user_portfolio_summary"
+down_revision = "20241016_007_settlement_indexes"
+branch_labels = None
+depends_on = None
+
+_SQLITE_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS picks_ledger_summary_ai AFTER INSERT ON picks_ledger
+    BEGIN
+        INSERT INTO user_portfolio_summary(
+            user_id, total, edge_sum, clv_sum, clv_count, clv_positive, updated_at
+        ) VALUES (
+            NEW.user_id, 1, NEW.edge_pct, COALESCE(NEW.clv_pct, 0),
+            NEW.clv_pct IS NOT NULL, COALESCE(NEW.clv_pct >= 0, 0), DATETIME('now')
+        )
+        ON CONFLICT(user_id) DO UPDATE SET
+            total = total + 1,
+            edge_sum = edge_sum + excluded.edge_sum,
+            clv_sum = clv_sum + excluded.clv_sum,
+            clv_count = clv_count + excluded.clv_count,
+            clv_positive = clv_positive + excluded.clv_positive,
+            updated_at = excluded.updated_at;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS picks_ledger_summary_au
+    AFTER UPDATE OF user_id, edge_pct, clv_pct ON picks_ledger
+    BEGIN
+        UPDATE user_portfolio_summary
+           SET total = total - 1,
+               edge_sum = edge_sum - OLD.edge_pct,
+               clv_sum = clv_sum - COALESCE(OLD.clv_pct, 0),
+               clv_count = clv_count - (OLD.clv_pct IS NOT NULL),
+               clv_positive = clv_positive - COALESCE(OLD.clv_pct >= 0, 0)
+         WHERE user_id = OLD.user_id;
+        INSERT INTO user_portfolio_summary(
+            user_id, total, edge_sum, clv_sum, clv_count, clv_positive, updated_at
+        ) VALUES (
+            NEW.user_id, 1, NEW.edge_pct, COALESCE(NEW.clv_pct, 0),
+            NEW.clv_pct IS NOT NULL, COALESCE(NEW.clv_pct >= 0, 0), DATETIME('now')
+        )
+        ON CONFLICT(user_id) DO UPDATE SET
+            total = total + 1,
+            edge_sum = edge_sum + excluded.edge_sum,
+            clv_sum = clv_sum + excluded.clv_sum,
+            clv_count = clv_count + excluded.clv_count,
+            clv_positive = clv_positive + excluded.clv_positive,
+            updated_at = excluded.updated_at;
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS picks_ledger_summary_ad AFTER DELETE ON picks_ledger
+    BEGIN
+        UPDATE user_portfolio_summary
+           SET total = total - 1,
+               edge_sum = edge_sum - OLD.edge_pct,
+               clv_sum = clv_sum - COALESCE(OLD.clv_pct, 0),
+               clv_count = clv_count - (OLD.clv_pct IS NOT NULL),
+               clv_positive = clv_positive - COALESCE(OLD.clv_pct >= 0, 0),
+               updated_at = DATETIME('now')
+         WHERE user_id = OLD.user_id;
+    END
+    """,
+)
+
+_POSTGRES_TRIGGERS = (
+    """
+    CREATE OR REPLACE FUNCTION picks_ledger_summary_apply() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE user_portfolio_summary
+               SET total = total - 1,
+                   edge_sum = edge_sum - OLD.edge_pct,
+                   clv_sum = clv_sum - COALESCE(OLD.clv_pct, 0),
+                   clv_count = clv_count - (CASE WHEN OLD.clv_pct IS NOT NULL THEN 1 ELSE 0 END),
+                   clv_positive = clv_positive - (CASE WHEN OLD.clv_pct >= 0 THEN 1 ELSE 0 END),
+                   updated_at = NOW()
+             WHERE user_id = OLD.user_id;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO user_portfolio_summary AS s(
+                user_id, total, edge_sum, clv_sum, clv_count, clv_positive, updated_at
+            ) VALUES (
+                NEW.user_id, 1, NEW.edge_pct, COALESCE(NEW.clv_pct, 0),
+                CASE WHEN NEW.clv_pct IS NOT NULL THEN 1 ELSE 0 END,
+                CASE WHEN NEW.clv_pct >= 0 THEN 1 ELSE 0 END, NOW()
+            )
+            ON CONFLICT (user_id) DO UPDATE SET
+                total = s.total + 1,
+                edge_sum = s.edge_sum + EXCLUDED.edge_sum,
+                clv_sum = s.clv_sum + EXCLUDED.clv_sum,
+                clv_count = s.clv_count + EXCLUDED.clv_count,
+                clv_positive = s.clv_positive + EXCLUDED.clv_positive,
+                updated_at = EXCLUDED.updated_at;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER picks_ledger_summary
+    AFTER INSERT OR UPDATE OF user_id, edge_pct, clv_pct OR DELETE ON picks_ledger
+    FOR EACH ROW EXECUTE FUNCTION picks_ledger_summary_apply()
+    """,
+)
+
+_BACKFILL = """
+INSERT INTO user_portfolio_summary(
+    user_id, total, edge_sum, clv_sum, clv_count, clv_positive, updated_at
+)
+SELECT user_id,
+       COUNT(*),
+       COALESCE(SUM(edge_pct), 0),
+       COALESCE(SUM(clv_pct), 0),
+       COUNT(clv_pct),
+       SUM(CASE WHEN clv_pct IS NOT NULL AND clv_pct >= 0 THEN 1 ELSE 0 END),
+       CURRENT_TIMESTAMP
+  FROM picks_ledger
+ GROUP BY user_id
+"""
+
+
+async def upgrade() -> None:
+    op.create_table(
+        "user_portfolio_summary",
+        sa.Column("user_id", sa.BigInteger(), primary_key=True),
+        sa.Column("total", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("edge_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("clv_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("clv_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("clv_positive", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    # Backfill before installing triggers so existing ledger rows count once.
+    op.execute(_BACKFILL)
+    dialect = op.get_bind().dialect.name
+    statements = _POSTGRES_TRIGGERS if dialect == "postgresql" else _SQLITE_TRIGGERS
+    for statement in statements:
+        op.execute(statement)
+
+
+async def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS picks_ledger_summary ON picks_ledger")
+        op.execute("DROP FUNCTION IF EXISTS picks_ledger_summary_apply()")
+    else:
+        for suffix in ("ad", "au", "ai"):
+            op.execute(f"DROP TRIGGER IF EXISTS picks_ledger_summary_{suffix}")
+    op.drop_table("user_portfolio_summary")
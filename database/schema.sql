@@ -2,7 +2,7 @@
 -- schema.sql — SQLite schema for bot user preferences and reports
 -- Generated on 2025-09-23
 --
-PRAGMA user_version = 1;
+PRAGMA user_version = 3;
 
 CREATE TABLE IF NOT EXISTS user_prefs (
     user_id INTEGER PRIMARY KEY,
@@ -33,6 +33,19 @@ CREATE TABLE IF NOT EXISTS reports (
 CREATE INDEX IF NOT EXISTS idx_subscriptions_user ON subscriptions(user_id);
 CREATE INDEX IF NOT EXISTS idx_reports_created_at ON reports(created_at);
 
+-- One row per daily digest outcome, keyed by the subscriber's local date.
+-- status: sent | empty (nothing to send) | blocked | failed (retries exhausted)
+-- | retry (transient error, next try not before next_attempt_at).
+CREATE TABLE IF NOT EXISTS digest_deliveries (
+    user_id INTEGER NOT NULL,
+    local_date TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'sent',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at TEXT NULL,
+    sent_at TEXT NOT NULL DEFAULT (DATETIME('now')),
+    PRIMARY KEY (user_id, local_date)
+);
+
 CREATE TABLE IF NOT EXISTS sm_fixtures (
     id INTEGER PRIMARY KEY,
     league_id INTEGER NULL,
@@ -205,6 +218,93 @@ CREATE INDEX IF NOT EXISTS picks_ledger_user_idx
 CREATE INDEX IF NOT EXISTS picks_ledger_match_idx
     ON picks_ledger(match_key, market, selection);
 
+CREATE INDEX IF NOT EXISTS picks_ledger_unsettled_idx
+    ON picks_ledger(kickoff_utc) WHERE outcome IS NULL;
+
+CREATE INDEX IF NOT EXISTS picks_ledger_created_idx
+    ON picks_ledger(created_at);
+
+-- Per-user aggregates kept current by triggers inside every ledger write, so
+-- settlement and closing-line updates maintain them too. The backfill only fills
+-- a freshly created (empty) table from an existing ledger; afterwards it is a no-op.
+CREATE TABLE IF NOT EXISTS user_portfolio_summary (
+    user_id INTEGER PRIMARY KEY,
+    total INTEGER NOT NULL DEFAULT 0,
+    edge_sum REAL NOT NULL DEFAULT 0,
+    clv_sum REAL NOT NULL DEFAULT 0,
+    clv_count INTEGER NOT NULL DEFAULT 0,
+    clv_positive INTEGER NOT NULL DEFAULT 0,
+    updated_at TEXT NOT NULL DEFAULT (DATETIME('now'))
+);
+
+CREATE TRIGGER IF NOT EXISTS picks_ledger_summary_ai AFTER INSERT ON picks_ledger
+BEGIN
+    INSERT INTO user_portfolio_summary(
+        user_id, total, edge_sum, clv_sum, clv_count, clv_positive, updated_at
+    ) VALUES (
+        NEW.user_id, 1, NEW.edge_pct, COALESCE(NEW.clv_pct, 0),
+        NEW.clv_pct IS NOT NULL, COALESCE(NEW.clv_pct >= 0, 0), DATETIME('now')
+    )
+    ON CONFLICT(user_id) DO UPDATE SET
+        total = total + 1,
+        edge_sum = edge_sum + excluded.edge_sum,
+        clv_sum = clv_sum + excluded.clv_sum,
+        clv_count = clv_count + excluded.clv_count,
+        clv_positive = clv_positive + excluded.clv_positive,
+        updated_at = excluded.updated_at;
+END;
+
+CREATE TRIGGER IF NOT EXISTS picks_ledger_summary_au
+AFTER UPDATE OF user_id, edge_pct, clv_pct ON picks_ledger
+BEGIN
+    UPDATE user_portfolio_summary
+       SET total = total - 1,
+           edge_sum = edge_sum - OLD.edge_pct,
+           clv_sum = clv_sum - COALESCE(OLD.clv_pct, 0),
+           clv_count = clv_count - (OLD.clv_pct IS NOT NULL),
+           clv_positive = clv_positive - COALESCE(OLD.clv_pct >= 0, 0)
+     WHERE user_id = OLD.user_id;
+    INSERT INTO user_portfolio_summary(
+        user_id, total, edge_sum, clv_sum, clv_count, clv_positive, updated_at
+    ) VALUES (
+        NEW.user_id, 1, NEW.edge_pct, COALESCE(NEW.clv_pct, 0),
+        NEW.clv_pct IS NOT NULL, COALESCE(NEW.clv_pct >= 0, 0), DATETIME('now')
+    )
+    ON CONFLICT(user_id) DO UPDATE SET
+        total = total + 1,
+        edge_sum = edge_sum + excluded.edge_sum,
+        clv_sum = clv_sum + excluded.clv_sum,
+        clv_count = clv_count + excluded.clv_count,
+        clv_positive = clv_positive + excluded.clv_positive,
+        updated_at = excluded.updated_at;
+END;
+
+CREATE TRIGGER IF NOT EXISTS picks_ledger_summary_ad AFTER DELETE ON picks_ledger
+BEGIN
+    UPDATE user_portfolio_summary
+       SET total = total - 1,
+           edge_sum = edge_sum - OLD.edge_pct,
+           clv_sum = clv_sum - COALESCE(OLD.clv_pct, 0),
+           clv_count = clv_count - (OLD.clv_pct IS NOT NULL),
+           clv_positive = clv_positive - COALESCE(OLD.clv_pct >= 0, 0),
+           updated_at = DATETIME('now')
+     WHERE user_id = OLD.user_id;
+END;
+
+INSERT INTO user_portfolio_summary(
+    user_id, total, edge_sum, clv_sum, clv_count, clv_positive, updated_at
+)
+SELECT user_id,
+       COUNT(*),
+       COALESCE(SUM(edge_pct), 0),
+       COALESCE(SUM(clv_pct), 0),
+       COUNT(clv_pct),
+       SUM(CASE WHEN clv_pct IS NOT NULL AND clv_pct >= 0 THEN 1 ELSE 0 END),
+       DATETIME('now')
+  FROM picks_ledger
+ WHERE NOT EXISTS (SELECT 1 FROM user_portfolio_summary)
+ GROUP BY user_id;
+
 CREATE TABLE IF NOT EXISTS provider_stats (
     provider TEXT NOT NULL,
     market TEXT NOT NULL,
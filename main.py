@@ -6,10 +6,13 @@ import os
 import signal
 import sys
 import time
-from collections.abc import Callable
 from contextlib import asynccontextmanager
 from pathlib import Path
 
+from app.bot.alerts import ValueAlertDispatcher
+from app.bot.digest import DigestDispatcher
+from app.bot.routers.commands import close_value_service, get_value_service
+from app.bot.storage import close_connections as close_bot_storage
 from app.db_maintenance import backup_sqlite, vacuum_analyze
 from app.health import HealthServer
 from app.metrics import (
@@ -25,16 +28,19 @@ from config import settings
 from database.cache_postgres import init_cache, shutdown_cache
 from logger import logger
 from ml.models.poisson_regression_model import poisson_regression_model
-from tgbotapp.bot import get_bot
+from tgbotapp.bot import TelegramBot, get_bot
 from workers.retrain_scheduler import schedule_retrain
-from workers.runtime_scheduler import clear_jobs, register as register_runtime_job
+from workers.runtime_scheduler import (
+    prune_jobs as prune_runtime_jobs,
+    register as register_runtime_job,
+    run_scheduler,
+)
 
 shutdown_event = asyncio.Event()
 _runtime_lock: RuntimeLock | None = None
 _health_server: HealthServer | None = None
 _metrics_task: asyncio.Task | None = None
-_backup_task: asyncio.Task | None = None
-_vacuum_task: asyncio.Task | None = None
+_scheduler_task: asyncio.Task | None = None
 
 
 def _ensure_writable(path: Path, label: str) -> None:
@@ -94,31 +100,83 @@ def _register_retrain_job() -> tuple[bool, str | None]:
         return False, None
 
 
-async def _periodic_executor(
-    label: str, interval: float, runner: Callable[[], None]
-) -> None:
-    loop = asyncio.get_running_loop()
-    while not shutdown_event.is_set():
-        try:
-            await loop.run_in_executor(None, runner)
-            logger.info("%s выполнено успешно", label)
-        except FileNotFoundError:
-            logger.warning("%s: файл базы данных не найден", label)
-        except Exception as exc:  # pragma: no cover - defensive
-            logger.warning("%s завершилось с ошибкой: %s", label, exc)
-        try:
-            await asyncio.wait_for(shutdown_event.wait(), timeout=interval)
-        except asyncio.TimeoutError:
-            continue
+def _register_maintenance_jobs() -> None:
+    jitter = float(settings.SCHEDULER_JITTER_SEC)
+    register_runtime_job(
+        settings.BACKUP_CRON,
+        lambda: backup_sqlite(settings.DB_PATH, settings.BACKUP_DIR, keep=settings.BACKUP_KEEP),
+        name="sqlite_backup",
+        jitter=jitter,
+    )
+    register_runtime_job(
+        settings.VACUUM_CRON,
+        lambda: vacuum_analyze(settings.DB_PATH),
+        name="sqlite_vacuum",
+        jitter=jitter,
+    )
+
+
+async def _sportmonks_sync() -> None:
+    from scripts.sm_sync import run_incremental_sync
+
+    await run_incremental_sync()
+
+
+def _register_sync_job() -> None:
+    cron_raw = settings.SM_SYNC_CRON.strip()
+    if not cron_raw or cron_raw.lower() in {"off", "disabled", "none", "false"}:
+        return
+    register_runtime_job(
+        cron_raw,
+        _sportmonks_sync,
+        name="sportmonks_sync",
+        jitter=float(settings.SCHEDULER_JITTER_SEC),
+    )
+
+
+def _register_digest_job(telegram: TelegramBot) -> None:
+    schedule = settings.DIGEST_SCHEDULE.strip()
+    if not schedule or settings.FAILSAFE_MODE:
+        return
+
+    async def _dispatch_digests() -> None:
+        # The aiogram client appears once polling has initialised the bot.
+        if telegram.bot is None:
+            return
+        await DigestDispatcher(telegram.bot).dispatch()
+
+    register_runtime_job(schedule, _dispatch_digests, name="daily_digest", catch_up=False)
+
+
+def _register_value_alerts_job(telegram: TelegramBot) -> None:
+    schedule = settings.VALUE_ALERT_SCHEDULE.strip()
+    if not schedule or settings.FAILSAFE_MODE or not settings.ENABLE_VALUE_FEATURES:
+        return
+
+    async def _dispatch_value_alerts() -> None:
+        if telegram.bot is None:
+            return
+        await ValueAlertDispatcher(telegram.bot).dispatch()
+
+    register_runtime_job(schedule, _dispatch_value_alerts, name="value_alerts", catch_up=False)
+
+
+def _prune_runtime_jobs() -> None:
+    # Runs after every job of this process is bound: a persisted job nobody
+    # binds any more (e.g. SM_SYNC_CRON emptied) would otherwise stay listed.
+    if settings.FAILSAFE_MODE:
+        return
+    removed = prune_runtime_jobs()
+    if removed:
+        logger.info("Удалены незарегистрированные задачи планировщика: %s", ", ".join(removed))
 
 
 @asynccontextmanager
 async def app_lifespan(dry_run: bool = False):
-    global _runtime_lock, _health_server, _metrics_task, _backup_task, _vacuum_task
+    global _runtime_lock, _health_server, _metrics_task, _scheduler_task
     _runtime_lock = RuntimeLock(Path(settings.RUNTIME_LOCK_PATH))
     _metrics_task = None
-    _backup_task = None
-    _vacuum_task = None
+    _scheduler_task = None
     STATE.started_at = time.time()
     STATE.db_ready = False
     STATE.polling_ready = not settings.ENABLE_POLLING
@@ -149,6 +207,12 @@ async def app_lifespan(dry_run: bool = False):
         else:
             logger.info("CANARY=1 — пропуск регистрации retrain scheduler")
 
+        if settings.ENABLE_VALUE_FEATURES:
+            try:
+                get_value_service()
+            except Exception as exc:  # pragma: no cover - defensive
+                logger.warning("Не удалось подготовить стек котировок: %s", exc)
+
         if settings.ENABLE_HEALTH:
             _health_server = HealthServer(settings.HEALTH_HOST, settings.HEALTH_PORT)
             await _health_server.start()
@@ -172,24 +236,10 @@ async def app_lifespan(dry_run: bool = False):
             logger.info("CANARY=1 — сервер метрик не запускается")
 
         if not settings.FAILSAFE_MODE and not canary_mode:
-            _backup_task = asyncio.create_task(
-                _periodic_executor(
-                    "SQLite backup",
-                    24 * 60 * 60,
-                    lambda: backup_sqlite(
-                        settings.DB_PATH,
-                        settings.BACKUP_DIR,
-                        keep=settings.BACKUP_KEEP,
-                    ),
-                )
-            )
-            _vacuum_task = asyncio.create_task(
-                _periodic_executor(
-                    "SQLite vacuum/analyze",
-                    7 * 24 * 60 * 60,
-                    lambda: vacuum_analyze(settings.DB_PATH),
-                )
-            )
+            # Backups and VACUUM run off-peak via the persistent runtime scheduler.
+            _register_maintenance_jobs()
+            _register_sync_job()
+            _scheduler_task = asyncio.create_task(run_scheduler(shutdown_event))
             if settings.ENABLE_SCHEDULER:
                 STATE.scheduler_ready = True
         elif not settings.FAILSAFE_MODE and canary_mode:
@@ -199,19 +249,19 @@ async def app_lifespan(dry_run: bool = False):
             yield
         finally:
             logger.info("Завершение приложения...")
-            for task in (_metrics_task, _backup_task, _vacuum_task):
+            for task in (_metrics_task, _scheduler_task):
                 if task:
                     task.cancel()
                     with contextlib.suppress(asyncio.CancelledError):
                         await task
             _metrics_task = None
-            _backup_task = None
-            _vacuum_task = None
+            _scheduler_task = None
             if _health_server:
                 await _health_server.stop()
                 _health_server = None
+            await close_value_service()
             await shutdown_cache()
-            clear_jobs()
+            close_bot_storage()
             STATE.db_ready = False
             STATE.polling_ready = False
             STATE.scheduler_ready = False
@@ -236,6 +286,10 @@ async def main(dry_run: bool = False) -> None:
                 await bot.run(dry_run=True, shutdown_event=shutdown_event)
                 return
 
+            _register_digest_job(bot)
+            _register_value_alerts_job(bot)
+            _prune_runtime_jobs()
+
             if not settings.ENABLE_POLLING:
                 logger.info("Polling отключен (ENABLE_POLLING=0), ожидание сигнала")
                 STATE.polling_ready = True
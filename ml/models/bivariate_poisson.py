@@ -1,14 +1,111 @@
 # ml/models/bivariate_poisson.py
 """Bivariate Poisson модель для прогнозирования коррелированных исходов."""
-import math
 from typing import Any
 
 import numpy as np
-from scipy.special import gammaln
+from scipy.special import gammaln, logsumexp, xlogy
 
 from logger import logger
 
 
+def bivariate_log_pmf(
+    x: Any,
+    y: Any,
+    lam1: Any,
+    lam2: Any,
+    rho: Any,
+) -> np.ndarray:
+    """
+    Векторизованный log P(X=x, Y=y) двумерного Пуассона.
+    Все аргументы транслируются (broadcast) друг с другом, поэтому одним вызовом
+    считается вся сетка счетов и/или сразу много матчей. lam1, lam2 — маргинальные
+    средние, rho — общая компонента (0 <= rho <= min(lam1, lam2)).
+    Args:
+        x, y: Голы команд (целые, отрицательные дают -inf)
+        lam1, lam2: Ожидаемые голы команд
+        rho: Ковариационный параметр
+    Returns:
+        np.ndarray: log P(X=x, Y=y) формы broadcast(x, y, lam1, lam2, rho)
+    """
+    x, y, lam1, lam2, rho = np.broadcast_arrays(
+        np.asarray(x, dtype=int),
+        np.asarray(y, dtype=int),
+        np.asarray(lam1, dtype=float),
+        np.asarray(lam2, dtype=float),
+        np.asarray(rho, dtype=float),
+    )
+    a = lam1 - rho
+    b = lam2 - rho
+    k_top = np.minimum(x, y)
+    k_max = max(int(k_top.max(initial=0)), 0)
+    # Сумма по k разворачивается в последнюю ось и сворачивается через logsumexp.
+    k = np.arange(k_max + 1)
+    xk = x[..., None] - k
+    yk = y[..., None] - k
+    valid = k <= k_top[..., None]
+    xk_safe = np.where(valid, xk, 0)
+    yk_safe = np.where(valid, yk, 0)
+    terms = (
+        xlogy(k, rho[..., None])
+        - gammaln(k + 1)
+        + xlogy(xk_safe, a[..., None])
+        - gammaln(xk_safe + 1)
+        + xlogy(yk_safe, b[..., None])
+        - gammaln(yk_safe + 1)
+    )
+    terms = np.where(valid, terms, -np.inf)
+    with np.errstate(divide="ignore"):
+        log_p = logsumexp(terms, axis=-1) - (a + b + rho)
+    return np.where((x < 0) | (y < 0), -np.inf, log_p)
+
+
+def bivariate_log_pmf_grad(
+    x: Any,
+    y: Any,
+    lam1: Any,
+    lam2: Any,
+    rho: Any,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    log P(X=x, Y=y) и его градиент по (lam1, lam2, rho) для обучения.
+    Использует рекуррентные соотношения dP/da = P(x-1, y) - P(x, y) и
+    dP/dc = P(x-1, y-1) - P(x, y) для a = lam1 - rho, b = lam2 - rho, c = rho.
+    Returns:
+        Tuple[np.ndarray, ...]: (log_p, d/d lam1, d/d lam2, d/d rho)
+    """
+    log_p = bivariate_log_pmf(x, y, lam1, lam2, rho)
+    x = np.asarray(x, dtype=int)
+    y = np.asarray(y, dtype=int)
+    ratio_x = np.exp(bivariate_log_pmf(x - 1, y, lam1, lam2, rho) - log_p)
+    ratio_y = np.exp(bivariate_log_pmf(x, y - 1, lam1, lam2, rho) - log_p)
+    ratio_xy = np.exp(bivariate_log_pmf(x - 1, y - 1, lam1, lam2, rho) - log_p)
+    d_a = ratio_x - 1.0
+    d_b = ratio_y - 1.0
+    d_c = ratio_xy - 1.0
+    return log_p, d_a, d_b, d_c - d_a - d_b
+
+
+def bivariate_prob_matrices(
+    lam1: Any,
+    lam2: Any,
+    rho: Any,
+    max_goals: int = 10,
+) -> np.ndarray:
+    """
+    Матрицы вероятностей счетов сразу для многих матчей.
+    Args:
+        lam1, lam2, rho: Параметры матчей (скаляры или массивы формы (n,))
+        max_goals (int): Максимальное количество голов
+    Returns:
+        np.ndarray: Массив формы (n, max_goals+1, max_goals+1) (или 2D для скаляров)
+    """
+    goals = np.arange(max_goals + 1)
+    lam1 = np.asarray(lam1, dtype=float)[..., None, None]
+    lam2 = np.asarray(lam2, dtype=float)[..., None, None]
+    rho = np.asarray(rho, dtype=float)[..., None, None]
+    return np.exp(bivariate_log_pmf(goals[:, None], goals[None, :], lam1, lam2, rho))
+
+
 class BivariatePoisson:
     """Bivariate Poisson модель для учета корреляции между голами команд."""
 
@@ -38,53 +135,7 @@ class BivariatePoisson:
             float: log(P(X=x, Y=y))
         """
         try:
-            # Специальный случай: если rho=0, то это произведение двух независимых Пуассонов
-            if self.rho == 0:
-                log_p = (
-                    x * np.log(self.l1)
-                    - self.l1
-                    - gammaln(x + 1)
-                    + y * np.log(self.l2)
-                    - self.l2
-                    - gammaln(y + 1)
-                )
-                return log_p
-            # Верхняя граница суммы по k
-            max_k = min(x, y)
-            if max_k == 0:
-                # Специальный случай: k может быть только 0
-                log_p = (
-                    x * np.log(self.l1 - self.rho)
-                    - (self.l1 - self.rho)
-                    - gammaln(x + 1)
-                    + y * np.log(self.l2 - self.rho)
-                    - (self.l2 - self.rho)
-                    - gammaln(y + 1)
-                    + -self.rho
-                )
-                return log_p
-            # Вычисляем логарифмы вероятностей для каждого k
-            log_probs = []
-            for k in range(max_k + 1):
-                log_prob_k = (
-                    k * np.log(self.rho)
-                    - self.rho
-                    - gammaln(k + 1)
-                    + (x - k) * np.log(self.l1 - self.rho)
-                    - (self.l1 - self.rho)
-                    - gammaln(x - k + 1)
-                    + (y - k) * np.log(self.l2 - self.rho)
-                    - (self.l2 - self.rho)
-                    - gammaln(y - k + 1)
-                )
-                log_probs.append(log_prob_k)
-            # Численно стабильное суммирование логарифмов вероятностей
-            if len(log_probs) == 1:
-                return log_probs[0]
-            # Используем logsumexp для численной стабильности
-            max_log_prob = max(log_probs)
-            sum_exp = sum(np.exp(lp - max_log_prob) for lp in log_probs)
-            return max_log_prob + np.log(sum_exp)
+            return float(bivariate_log_pmf(x, y, self.l1, self.l2, self.rho))
         except Exception as e:
             logger.error(f"Ошибка при вычислении лог-вероятности для ({x},{y}): {e}")
             return float("-inf")
@@ -114,10 +165,10 @@ class BivariatePoisson:
             np.ndarray: Матрица вероятностей размером (max_goals+1) x (max_goals+1)
         """
         try:
-            prob_matrix = np.zeros((max_goals + 1, max_goals + 1))
-            for i in range(max_goals + 1):
-                for j in range(max_goals + 1):
-                    prob_matrix[i, j] = self.prob(i, j)
+            goals = np.arange(max_goals + 1)
+            prob_matrix = np.exp(
+                bivariate_log_pmf(goals[:, None], goals[None, :], self.l1, self.l2, self.rho)
+            )
             logger.debug(f"Сгенерирована матрица вероятностей. Сумма: {prob_matrix.sum():.6f}")
             return prob_matrix
         except Exception as e:
@@ -179,16 +230,10 @@ class BivariatePoisson:
         """
         try:
             prob_matrix = self.prob_matrix(max_goals)
-            over_prob = 0.0
-            under_prob = 0.0
-            for i in range(max_goals + 1):
-                for j in range(max_goals + 1):
-                    total = i + j
-                    if total > threshold:
-                        over_prob += prob_matrix[i, j]
-                    elif total < threshold:
-                        under_prob += prob_matrix[i, j]
-                    # Равенство (total == threshold) обычно не учитывается
+            total = np.add.outer(np.arange(max_goals + 1), np.arange(max_goals + 1))
+            # Равенство (total == threshold) обычно не учитывается
+            over_prob = float(prob_matrix[total > threshold].sum())
+            under_prob = float(prob_matrix[total < threshold].sum())
             return over_prob, under_prob
         except Exception as e:
             logger.error(f"Ошибка при вычислении тоталов: {e}")
@@ -265,20 +310,21 @@ def score_matrix(
     max_goals: int = 10,
     apply_dixon_coles: bool = True,
 ) -> np.ndarray:
-    pm = np.zeros((max_goals + 1, max_goals + 1), dtype=float)
+    goals = np.arange(max_goals + 1)
     pmf = globals().get("bivariate_poisson_pmf", None)
-    for gh in range(max_goals + 1):
-        for ga in range(max_goals + 1):
-            if pmf:
-                pm[gh, ga] = pmf(gh, ga, lam_home, lam_away, rho)
-            else:
-                # независимая аппроксимация
-                def pois(k, lam):
-                    return (lam**k) * np.exp(-lam) / float(math.factorial(k))
-
-                pm[gh, ga] = pois(gh, lam_home) * pois(ga, lam_away)
-    if pm.sum() > 0:
-        pm /= pm.sum()
+    if pmf:
+        pm = np.vectorize(pmf, otypes=[float])(
+            goals[:, None], goals[None, :], lam_home, lam_away, rho
+        )
+    else:
+        # независимая аппроксимация; массивы лямбд дают стопку матриц (n, G+1, G+1)
+        lam_h = np.asarray(lam_home, dtype=float)[..., None]
+        lam_a = np.asarray(lam_away, dtype=float)[..., None]
+        log_home = xlogy(goals, lam_h) - lam_h - gammaln(goals + 1)
+        log_away = xlogy(goals, lam_a) - lam_a - gammaln(goals + 1)
+        pm = np.exp(log_home[..., :, None] + log_away[..., None, :])
+    total = pm.sum(axis=(-2, -1), keepdims=True)
+    pm = np.divide(pm, total, out=pm, where=total > 0)
     return pm
 
 
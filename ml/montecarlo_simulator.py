@@ -1,7 +1,7 @@
 """
 @file: montecarlo_simulator.py
-@description: Минимальный Пуассон-симулятор для расчёта рынков.
-@dependencies: numpy
+@description: Минимальный Пуассон-симулятор для расчёта рынков и его аналитический аналог.
+@dependencies: numpy, ml.sim.analytic
 @created: 2025-08-23
 """
 from dataclasses import dataclass
@@ -47,3 +47,32 @@ def simulate(
     }
     top_scores = sorted(scorelines.items(), key=lambda x: x[1], reverse=True)[:top_n]
     return SimResult(home_win, draw, away_win, over_2_5, over_3_5, btts, top_scores)
+
+
+def simulate_analytic(
+    lambda_home: float,
+    lambda_away: float,
+    rho: float = 0.0,
+    top_n: int = 5,
+    max_goals: int = 10,
+) -> SimResult:
+    """Точный аналог :func:`simulate` по матрице вероятностей счетов (без сэмплирования)."""
+    from ml.sim.analytic import markets_from_matrix, probability_matrix
+
+    matrix = probability_matrix(lambda_home, lambda_away, rho, max_goals)
+    markets = markets_from_matrix(matrix, totals=(2.5, 3.5))
+    scorelines = {
+        f"{h}-{a}": float(matrix[h, a])
+        for h in range(matrix.shape[0])
+        for a in range(matrix.shape[1])
+    }
+    top_scores = sorted(scorelines.items(), key=lambda x: x[1], reverse=True)[:top_n]
+    return SimResult(
+        markets["1x2"]["1"],
+        markets["1x2"]["x"],
+        markets["1x2"]["2"],
+        markets["totals"]["2.5"]["over"],
+        markets["totals"]["3.5"]["over"],
+        markets["btts"]["yes"],
+        top_scores,
+    )
@@ -0,0 +1,115 @@
+"""
+@file: analytic.py
+@description: Closed-form football markets from the bivariate Poisson score matrix.
+@dependencies: numpy, ml.models.bivariate_poisson, ml.metrics.entropy, ml.sim.bivariate_poisson
+@created: 2026-10-16
+"""
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+
+from ml.metrics.entropy import entropy_1x2, entropy_cs, entropy_totals
+from ml.models.bivariate_poisson import BivariatePoisson, bivariate_prob_matrices
+from ml.sim.bivariate_poisson import TOTAL_LINES, shared_rate
+
+
+def shared_component(lam_home: float, lam_away: float, rho: float) -> float:
+    """Translate the simulator correlation ``rho`` into the shared Poisson rate.
+
+    Mirrors :func:`ml.sim.bivariate_poisson.simulate_bipoisson` so both engines
+    price the same distribution.
+    """
+
+    return float(shared_rate(lam_home, lam_away, rho))
+
+
+def probability_matrix(
+    lam_home: float,
+    lam_away: float,
+    rho: float,
+    max_goals: int = 10,
+) -> np.ndarray:
+    """Return the normalised ``(max_goals + 1)``-square score matrix (rows = home goals)."""
+
+    if lam_home <= 0 or lam_away <= 0:
+        raise ValueError("Lambdas must be positive")
+    lam_c = shared_component(lam_home, lam_away, rho)
+    matrix = BivariatePoisson(lam_home, lam_away, lam_c).prob_matrix(max_goals)
+    total = float(matrix.sum())
+    if total > 0:
+        matrix = matrix / total
+    return matrix
+
+
+def probability_matrices(
+    lam_home: Any,
+    lam_away: Any,
+    rho: Any,
+    max_goals: int = 10,
+) -> np.ndarray:
+    """Normalised score matrices for a slate, shaped ``(n, max_goals + 1, max_goals + 1)``."""
+
+    lam_h = np.atleast_1d(np.asarray(lam_home, dtype=float))
+    lam_a = np.atleast_1d(np.asarray(lam_away, dtype=float))
+    if np.any(lam_h <= 0) or np.any(lam_a <= 0):
+        raise ValueError("Lambdas must be positive")
+    lam_c = np.broadcast_to(shared_rate(lam_h, lam_a, rho), lam_h.shape)
+    matrices = bivariate_prob_matrices(lam_h, lam_a, lam_c, max_goals)
+    return matrices / matrices.sum(axis=(1, 2), keepdims=True)
+
+
+def markets_from_matrix(
+    matrix: np.ndarray,
+    totals: tuple[float, ...] = TOTAL_LINES,
+    max_cs: int = 6,
+) -> dict[str, Any]:
+    """Price 1X2, totals, BTTS and correct score from a score matrix.
+
+    The layout matches :meth:`services.simulator.Simulator.run` so callers can
+    switch engines without touching downstream formatting or persistence.
+    """
+
+    win1 = float(np.tril(matrix, k=-1).sum())
+    draw = float(np.trace(matrix))
+    win2 = float(np.triu(matrix, k=1).sum())
+    markets: dict[str, Any] = {"1x2": {"1": win1, "x": draw, "2": win2}}
+
+    btts_yes = float(matrix[1:, 1:].sum())
+    markets["btts"] = {"yes": btts_yes, "no": 1.0 - btts_yes}
+
+    goals = np.add.outer(np.arange(matrix.shape[0]), np.arange(matrix.shape[1]))
+    totals_out: dict[str, dict[str, float]] = {}
+    for line in totals:
+        under = float(matrix[goals < line].sum())
+        push = float(matrix[goals == line].sum())
+        totals_out[f"{line:.1f}"] = {"over": 1.0 - under - push, "under": under}
+    markets["totals"] = totals_out
+
+    side = min(max_cs + 1, matrix.shape[0])
+    cs: dict[str, float] = {}
+    for h in range(side):
+        for a in range(side):
+            cs[f"{h}:{a}"] = float(matrix[h, a])
+    cs["OTHER"] = max(0.0, 1.0 - float(matrix[:side, :side].sum()))
+    markets["cs"] = cs
+
+    ent: dict[str, float] = {}
+    ent.update(entropy_1x2(win1, draw, win2))
+    main_total = totals_out.get("2.5") or next(iter(totals_out.values()))
+    ent.update(entropy_totals(main_total["over"], main_total["under"]))
+    ent.update(entropy_cs(cs))
+    markets["entropy"] = ent
+    return markets
+
+
+def analytic_markets(
+    lam_home: float,
+    lam_away: float,
+    rho: float,
+    max_goals: int = 10,
+) -> dict[str, Any]:
+    """Exact market probabilities for a single fixture without sampling noise."""
+
+    return markets_from_matrix(probability_matrix(lam_home, lam_away, rho, max_goals))
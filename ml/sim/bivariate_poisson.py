@@ -1,15 +1,51 @@
 """
 @file: bivariate_poisson.py
-@description: Simulate correlated Poisson goal counts with optional chunking.
+@description: Simulate correlated Poisson goal counts with optional chunking and slate batching.
 @dependencies: numpy, os
 @created: 2025-09-15
 """
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
+from typing import Any
 
 import numpy as np
 
+TOTAL_LINES: tuple[float, ...] = (0.5, 1.5, 2.5, 3.5, 4.5, 5.5)
+
+
+def shared_rate(lam_home: Any, lam_away: Any, rho: Any) -> np.ndarray:
+    """Shared Poisson rate implied by correlation ``rho`` (clipped to [0, 1]).
+
+    Works element-wise on scalars or arrays; every engine derives the common
+    component here so Monte-Carlo and closed-form prices agree.
+    """
+
+    lam_h = np.asarray(lam_home, dtype=float)
+    lam_a = np.asarray(lam_away, dtype=float)
+    rho_arr = np.clip(np.asarray(rho, dtype=float), 0.0, 1.0)
+    return np.minimum(rho_arr * np.sqrt(lam_h * lam_a), np.minimum(lam_h, lam_a))
+
+
+def _draw_fixture(
+    rng: np.random.Generator,
+    lam_c: float,
+    lam_h_ind: float,
+    lam_a_ind: float,
+    n_sims: int,
+    chunk_size: int,
+    home: np.ndarray,
+    away: np.ndarray,
+) -> None:
+    """Fill ``home``/``away`` with one fixture's draws in ``chunk_size`` pieces."""
+
+    for start in range(0, n_sims, max(chunk_size, 1)):
+        stop = min(start + chunk_size, n_sims)
+        shared = rng.poisson(lam_c, stop - start)
+        home[start:stop] = rng.poisson(lam_h_ind, stop - start) + shared
+        away[start:stop] = rng.poisson(lam_a_ind, stop - start) + shared
+
 
 def simulate_bipoisson(
     lam_home: float,
@@ -35,22 +71,163 @@ def simulate_bipoisson(
     if lam_home <= 0 or lam_away <= 0:
         raise ValueError("Lambdas must be positive")
 
-    rho = max(min(rho, 1.0), 0.0)
-    lam_c = min(rho * np.sqrt(lam_home * lam_away), lam_home, lam_away)
-    lam_h_ind = lam_home - lam_c
-    lam_a_ind = lam_away - lam_c
+    lam_c = float(shared_rate(lam_home, lam_away, rho))
+    home = np.empty(int(n_sims), dtype=np.int64)
+    away = np.empty_like(home)
+    _draw_fixture(
+        np.random.default_rng(seed),
+        lam_c,
+        lam_home - lam_c,
+        lam_away - lam_c,
+        int(n_sims),
+        int(os.getenv("SIM_CHUNK", "100000")),
+        home,
+        away,
+    )
+    return home, away
+
+
+def _slate_arrays(
+    lam_home: np.ndarray | list[float],
+    lam_away: np.ndarray | list[float],
+    rho: np.ndarray | list[float] | float,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    lam_h = np.atleast_1d(np.asarray(lam_home, dtype=float))
+    lam_a = np.atleast_1d(np.asarray(lam_away, dtype=float))
+    if lam_h.ndim != 1 or lam_h.shape != lam_a.shape:
+        raise ValueError("lam_home and lam_away must be 1-D arrays of equal length")
+    if np.any(lam_h <= 0) or np.any(lam_a <= 0):
+        raise ValueError("Lambdas must be positive")
+    lam_c = np.broadcast_to(shared_rate(lam_h, lam_a, rho), lam_h.shape)
+    return lam_h, lam_a, lam_c
+
+
+def iter_bipoisson_blocks(
+    lam_home: np.ndarray | list[float],
+    lam_away: np.ndarray | list[float],
+    rho: np.ndarray | list[float] | float,
+    n_sims: int = 10000,
+    seed: int | None = 42,
+) -> Iterator[tuple[slice, np.ndarray, np.ndarray]]:
+    """Yield ``(fixture_slice, home, away)`` blocks of at most ``SIM_CHUNK`` draws each.
+
+    Whole fixtures are grouped so every block holds ``rows * n_sims <= SIM_CHUNK``
+    draws (at least one fixture per block), which bounds peak memory for large
+    slates the same way :func:`simulate_bipoisson` bounds a single fixture.
+
+    Every fixture draws from its own generator seeded with ``seed``, in the same
+    order as :func:`simulate_bipoisson`, so its samples do not depend on which
+    other fixtures share the slate and match a single-fixture run exactly.
+    """
 
-    rng = np.random.default_rng(seed)
+    lam_h, lam_a, lam_c = _slate_arrays(lam_home, lam_away, rho)
+    n_sims = int(n_sims)
     chunk_size = int(os.getenv("SIM_CHUNK", "100000"))
-    homes = []
-    aways = []
-    remaining = n_sims
-    while remaining > 0:
-        batch = min(remaining, chunk_size)
-        shared = rng.poisson(lam_c, batch)
-        homes.append(rng.poisson(lam_h_ind, batch) + shared)
-        aways.append(rng.poisson(lam_a_ind, batch) + shared)
-        remaining -= batch
-    home = np.concatenate(homes)
-    away = np.concatenate(aways)
+    rows = max(1, chunk_size // max(n_sims, 1))
+    for start in range(0, lam_h.shape[0], rows):
+        block = slice(start, min(start + rows, lam_h.shape[0]))
+        home = np.empty((block.stop - block.start, n_sims), dtype=np.int64)
+        away = np.empty_like(home)
+        for row, idx in enumerate(range(block.start, block.stop)):
+            _draw_fixture(
+                np.random.default_rng(seed),
+                float(lam_c[idx]),
+                float(lam_h[idx] - lam_c[idx]),
+                float(lam_a[idx] - lam_c[idx]),
+                n_sims,
+                chunk_size,
+                home[row],
+                away[row],
+            )
+        yield block, home, away
+
+
+def simulate_bipoisson_batch(
+    lam_home: np.ndarray | list[float],
+    lam_away: np.ndarray | list[float],
+    rho: np.ndarray | list[float] | float,
+    n_sims: int = 10000,
+    seed: int | None = 42,
+) -> tuple[np.ndarray, np.ndarray]:
+    """Generate correlated goal counts for a whole slate of fixtures at once.
+
+    Parameters mirror :func:`simulate_bipoisson` but accept 1-D arrays, one entry
+    per fixture (``rho`` may also be a scalar shared by all fixtures). Draws are
+    taken as matrix blocks from :func:`iter_bipoisson_blocks`, so temporaries
+    stay within ``SIM_CHUNK`` and each row equals :func:`simulate_bipoisson`
+    for that fixture with the same ``seed``.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Home and away goal matrices shaped ``(n_fixtures, n_sims)``.
+    """
+
+    lam_h, _, _ = _slate_arrays(lam_home, lam_away, rho)
+    home = np.empty((lam_h.shape[0], int(n_sims)), dtype=np.int64)
+    away = np.empty_like(home)
+    for block, block_home, block_away in iter_bipoisson_blocks(
+        lam_home, lam_away, rho, n_sims, seed
+    ):
+        home[block] = block_home
+        away[block] = block_away
     return home, away
+
+
+def batch_market_probabilities(
+    home: np.ndarray,
+    away: np.ndarray,
+    totals: tuple[float, ...] = TOTAL_LINES,
+    max_cs: int = 6,
+) -> dict[str, np.ndarray]:
+    """Reduce simulated goal matrices into per-fixture market probabilities.
+
+    ``home`` and ``away`` are ``(n_fixtures, n_sims)`` matrices as returned by
+    :func:`simulate_bipoisson_batch`. Every returned array has the fixtures on
+    axis 0: ``1x2``/``btts`` arrays are ``(n, 3)``/``(n, 2)``, ``over``/``under``
+    are ``(n, len(totals))`` and ``cs`` is ``(n, max_cs + 1, max_cs + 1)`` with
+    scores beyond ``max_cs`` folded into ``cs_other``.
+    """
+
+    home = np.atleast_2d(home)
+    away = np.atleast_2d(away)
+    n_fixtures, n_sims = home.shape
+    if n_sims == 0:
+        raise ValueError("n_sims must be positive")
+
+    win1 = np.mean(home > away, axis=1)
+    draw = np.mean(home == away, axis=1)
+    win2 = np.mean(home < away, axis=1)
+    btts_yes = np.mean((home > 0) & (away > 0), axis=1)
+
+    lines = np.asarray(totals, dtype=float)
+    total_goals = home + away
+    # Totals are integers, so "over t" reduces to a histogram tail per fixture.
+    top = int(np.ceil(lines.max())) + 1 if lines.size else 1
+    capped = np.minimum(total_goals, top)
+    offsets = np.arange(n_fixtures)[:, None] * (top + 1)
+    hist = np.bincount((capped + offsets).ravel(), minlength=n_fixtures * (top + 1))
+    hist = hist.reshape(n_fixtures, top + 1) / float(n_sims)
+    cdf = np.cumsum(hist, axis=1)
+    floor_idx = np.floor(lines).astype(int)
+    ceil_idx = np.ceil(lines).astype(int)
+    over = 1.0 - cdf[:, floor_idx]
+    under = np.where(ceil_idx > 0, cdf[:, np.maximum(ceil_idx - 1, 0)], 0.0)
+
+    side = max_cs + 1
+    in_grid = (home <= max_cs) & (away <= max_cs)
+    cells = np.where(in_grid, home * side + away, side * side)
+    offsets = np.arange(n_fixtures)[:, None] * (side * side + 1)
+    cs_counts = np.bincount(
+        (cells + offsets).ravel(), minlength=n_fixtures * (side * side + 1)
+    ).reshape(n_fixtures, side * side + 1) / float(n_sims)
+
+    return {
+        "1x2": np.column_stack([win1, draw, win2]),
+        "btts": np.column_stack([btts_yes, 1.0 - btts_yes]),
+        "totals": lines,
+        "over": over,
+        "under": under,
+        "cs": cs_counts[:, :-1].reshape(n_fixtures, side, side),
+        "cs_other": cs_counts[:, -1],
+    }
@@ -31,6 +31,8 @@ from app.data_providers.sportmonks.schemas import FixtureDTO
 from app.mapping.sportmonks_map import SportmonksMappingRepository, TeamMappingConflict
 from logger import logger
 
+DEFAULT_SYNC_CONCURRENCY = 4
+
 
 @click.command()
 @click.option("--mode", type=click.Choice(["backfill", "incremental"]), required=True)
@@ -39,6 +41,13 @@ from logger import logger
 @click.option("--leagues", type=str, help="Comma separated list of league identifiers")
 @click.option("--window-days", type=int, help="Override incremental window in days")
 @click.option("--dry-run/--no-dry-run", default=False, help="Run against local fixtures without network access")
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_SYNC_CONCURRENCY,
+    show_default=True,
+    help="Maximum concurrent team/standings/injuries fetches",
+)
 def main(
     mode: str,
     from_: datetime | None,
@@ -46,11 +55,43 @@ def main(
     leagues: str | None,
     window_days: int | None,
     dry_run: bool,
+    concurrency: int,
 ) -> None:
     """Execute Sportmonks synchronization pipeline."""
 
     league_ids = _parse_leagues(leagues)
-    asyncio.run(_execute(mode, from_, to, league_ids, window_days, dry_run))
+    asyncio.run(
+        _execute(mode, from_, to, league_ids, window_days, dry_run, concurrency=concurrency)
+    )
+
+
+async def run_incremental_sync(
+    *,
+    league_ids: Sequence[str] = (),
+    window_days: int | None = None,
+    concurrency: int = DEFAULT_SYNC_CONCURRENCY,
+) -> None:
+    """Run one incremental sync from an already running event loop.
+
+    The pipeline, including its synchronous SQLite reads and writes, runs on a
+    worker thread with its own event loop, so the caller's loop (the bot's
+    scheduler) keeps serving updates meanwhile.
+    """
+
+    def _run() -> None:
+        asyncio.run(
+            _execute(
+                "incremental",
+                None,
+                None,
+                league_ids,
+                window_days,
+                False,
+                concurrency=concurrency,
+            )
+        )
+
+    await asyncio.to_thread(_run)
 
 
 async def _execute(
@@ -60,8 +101,11 @@ async def _execute(
     league_ids: Sequence[str],
     window_days: int | None,
     dry_run: bool,
+    *,
+    concurrency: int = DEFAULT_SYNC_CONCURRENCY,
 ) -> None:
     repository = SportmonksRepository()
+    etag_meta = _DeferredMeta(repository)
     mapping_repository = SportmonksMappingRepository()
     client: SportmonksClient | None = None
     provider: SportmonksProvider | None = None
@@ -70,9 +114,13 @@ async def _execute(
         config = SportmonksClientConfig.from_env()
     else:
         client = SportmonksClient()
+        # One budget for every request of the run, pages included: at most
+        # ``concurrency`` requests are in flight, whatever page_concurrency is.
         provider = SportmonksProvider(
             client,
-            etag_cache=SportmonksETagCache(repository, client.config.cache_ttl_seconds),
+            etag_cache=SportmonksETagCache(etag_meta, client.config.cache_ttl_seconds),
+            page_concurrency=client.config.page_concurrency,
+            request_slots=asyncio.Semaphore(max(1, concurrency)),
         )
         config = client.config
 
@@ -114,33 +162,48 @@ async def _execute(
         else:
             assert provider is not None
             fixtures = await provider.fetch_fixtures(resolved_from, resolved_to, league_ids=league_ids)
-            fixture_count = repository.upsert_fixtures(fixtures, pulled_at=pulled_at)
-            sm_etl_rows_upserted_total.labels(table="sm_fixtures").inc(fixture_count)
-
             leagues_to_fetch = sorted({f.league_id for f in fixtures if f.league_id})
-            teams_total = 0
-            for league_id in leagues_to_fetch:
-                teams = await provider.fetch_teams(str(league_id))
-                all_teams.extend(teams)
-                teams_total += repository.upsert_teams(teams, pulled_at=pulled_at)
-            sm_etl_rows_upserted_total.labels(table="sm_teams").inc(teams_total)
+            league_seasons = sorted(_unique_league_seasons(fixtures))
+            # Every fetch shares the client's token bucket and the provider's
+            # request budget, so the fan-out below cannot exceed ``concurrency``.
+            team_batches, standing_batches, injuries = await asyncio.gather(
+                asyncio.gather(
+                    *(provider.fetch_teams(str(league_id)) for league_id in leagues_to_fetch)
+                ),
+                asyncio.gather(
+                    *(
+                        provider.fetch_standings(str(league_id), str(season_id))
+                        for league_id, season_id in league_seasons
+                    )
+                ),
+                provider.fetch_injuries(resolved_from, resolved_to, league_ids=league_ids),
+            )
 
-            standings_total = 0
-            for pair in _unique_league_seasons(fixtures):
-                league_id, season_id = pair
-                rows = await provider.fetch_standings(str(league_id), str(season_id))
-                standings_total += repository.upsert_standings(rows, pulled_at=pulled_at)
+            all_teams = [team for batch in team_batches for team in batch]
+            standings = [row for batch in standing_batches for row in batch]
+            # All writes happen after the network phase, in one transaction, so a
+            # run is all-or-nothing: if any fetch or upsert fails, no fixtures,
+            # teams, standings, injuries or ETags are stored and the next run
+            # re-downloads everything. ETags always land with the rows they describe.
+            with repository.unit_of_work():
+                fixture_count = repository.upsert_fixtures(fixtures, pulled_at=pulled_at)
+                teams_total = repository.upsert_teams(all_teams, pulled_at=pulled_at)
+                standings_total = repository.upsert_standings(standings, pulled_at=pulled_at)
+                injuries_total = repository.upsert_injuries(injuries, pulled_at=pulled_at)
+                repository.upsert_meta_many(
+                    {
+                        **etag_meta.pending,
+                        "last_sync_mode": mode,
+                        "last_sync_from": resolved_from.isoformat(),
+                        "last_sync_to": resolved_to.isoformat(),
+                        "last_sync_completed_at": pulled_at.isoformat(),
+                    }
+                )
+            sm_etl_rows_upserted_total.labels(table="sm_fixtures").inc(fixture_count)
+            sm_etl_rows_upserted_total.labels(table="sm_teams").inc(teams_total)
             sm_etl_rows_upserted_total.labels(table="sm_standings").inc(standings_total)
-
-            injuries = await provider.fetch_injuries(resolved_from, resolved_to, league_ids=league_ids)
-            injuries_total = repository.upsert_injuries(injuries, pulled_at=pulled_at)
             sm_etl_rows_upserted_total.labels(table="sm_injuries").inc(injuries_total)
 
-            repository.upsert_meta("last_sync_mode", mode)
-            repository.upsert_meta("last_sync_from", resolved_from.isoformat())
-            repository.upsert_meta("last_sync_to", resolved_to.isoformat())
-            repository.upsert_meta("last_sync_completed_at", pulled_at.isoformat())
-
             update_last_sync(mode, pulled_at)
 
         collision_status = _handle_team_collisions(all_teams)
@@ -164,9 +227,26 @@ async def _execute(
     finally:
         if client is not None:
             await client.aclose()
+        repository.close()
         mapping_repository.ensure_tables()
 
 
+class _DeferredMeta:
+    """``sm_meta`` view for the ETag cache that holds writes until the data is stored."""
+
+    def __init__(self, repository: SportmonksRepository) -> None:
+        self._repository = repository
+        self.pending: dict[str, str] = {}
+
+    def get_meta(self, key: str) -> str | None:
+        if key in self.pending:
+            return self.pending[key]
+        return self._repository.get_meta(key)
+
+    def upsert_meta(self, key: str, value: str) -> None:
+        self.pending[key] = value
+
+
 def _resolve_window(
     mode: str,
     date_from: datetime | None,
@@ -43,6 +43,7 @@ from aiogram.exceptions import (
 )
 from aiogram.types import BotCommand
 
+from app.bot.routers.commands import close_value_service
 from app.runtime_state import STATE
 from app.utils.retry import retry_async
 from config import settings
@@ -124,8 +125,8 @@ async def _create_application() -> tuple[Bot, Dispatcher]:
 
     dispatcher = Dispatcher()
 
-    message_rate = RateLimitMiddleware()
-    callback_rate = RateLimitMiddleware()
+    message_rate = RateLimitMiddleware(name="rate_limit_message")
+    callback_rate = RateLimitMiddleware(name="rate_limit_callback")
     dispatcher.message.middleware.register(message_rate)
     dispatcher.callback_query.middleware.register(callback_rate)
     dispatcher.message.middleware.register(IdempotencyMiddleware())
@@ -236,6 +237,8 @@ async def main_async() -> None:
             break
         await asyncio.sleep(0)
 
+    with suppress(Exception):
+        await close_value_service()
     logger.info("Telegram polling worker stopped")
 
 
@@ -1,7 +1,9 @@
 """
 @file: update_upcoming.py
-@description: Cron entrypoint to refresh upcoming fixtures, build features, run simulations and persist results.
-@dependencies: asyncio, argparse, datetime, config, sportmonks package, services.feature_builder, services.simulator
+@description: Cron entrypoint refreshing upcoming fixtures via staged concurrent fetch,
+    batch simulation and bulk persist.
+@dependencies: asyncio, argparse, datetime, config, sportmonks package, services.feature_builder,
+    services.simulator
 @created: 2025-09-23
 """
 
@@ -10,22 +12,35 @@ from __future__ import annotations
 import argparse
 import asyncio
 from datetime import date, datetime, timedelta
+from typing import Any, Awaitable, TypeVar
+
 from config import get_settings
+from logger import logger
 from services.feature_builder import FeatureBundle, feature_builder
-from services.simulator import simulate_markets
+from services.simulator import simulate_markets_batch
 from sportmonks import SportMonksClient, SportMonksEndpoints
 from sportmonks.cache import sportmonks_cache
-from sportmonks.repository import sportmonks_repository
-from sportmonks.schemas import Fixture, LineupPlayerDetail, TeamStats
+from sportmonks.repository import PredictionRecord, sportmonks_repository
+from sportmonks.schemas import Fixture, LineupPlayerDetail, OddsQuote, TeamStats
+
+DEFAULT_FETCH_CONCURRENCY = 8
+
+_T = TypeVar("_T")
 
 
 def _parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Update upcoming fixtures from SportMonks")
     parser.add_argument("--days", type=int, default=3, help="How many days ahead to refresh")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_FETCH_CONCURRENCY,
+        help="Maximum number of concurrent SportMonks requests",
+    )
     return parser.parse_args()
 
 
-async def _extract_team_stats(fixture: Fixture, team_id: int | None) -> TeamStats | None:
+def _extract_team_stats(fixture: Fixture, team_id: int | None) -> TeamStats | None:
     if not team_id:
         return None
     stats_raw = fixture.statistics.get(str(team_id), {}) if fixture.statistics else {}
@@ -76,80 +91,171 @@ def _confidence(bundle: FeatureBundle, degraded: bool) -> float:
     return max(0.25, min(0.98, base - penalty))
 
 
-async def refresh_upcoming(days: int) -> None:
+async def _bounded(budget: asyncio.Semaphore, awaitable: Awaitable[_T]) -> _T:
+    async with budget:
+        return await awaitable
+
+
+async def _fetch_card(
+    endpoints: SportMonksEndpoints, fixture_id: int, budget: asyncio.Semaphore
+) -> Fixture | None:
+    try:
+        return await _bounded(budget, endpoints.fixture_card(fixture_id))
+    except Exception as exc:
+        logger.warning("Failed to fetch fixture card %s: %s", fixture_id, exc)
+        return None
+
+
+async def _fetch_odds(
+    endpoints: SportMonksEndpoints, fixture_id: int, budget: asyncio.Semaphore
+) -> list[OddsQuote]:
+    try:
+        prematch, inplay = await asyncio.gather(
+            _bounded(budget, endpoints.odds_for_fixture(fixture_id, inplay=False)),
+            _bounded(budget, endpoints.odds_for_fixture(fixture_id, inplay=True)),
+        )
+    except Exception as exc:
+        logger.warning("Failed to fetch odds for fixture %s: %s", fixture_id, exc)
+        return []
+    return prematch + inplay
+
+
+def _prepare_fixture(
+    card: Fixture,
+    expected_lineups: dict[int, tuple[list[LineupPlayerDetail], bool]],
+    settings: Any,
+) -> tuple[Fixture, FeatureBundle, bool]:
+    lineup_override, degraded_lineup = expected_lineups.get(card.id, ([], False))
+    if lineup_override:
+        card.lineups = lineup_override
+    degraded = degraded_lineup or any(value.degraded_mode for value in card.xg_fixture)
+    home_players = [p for p in card.lineups if p.team_id == card.home_team_id]
+    away_players = [p for p in card.lineups if p.team_id == card.away_team_id]
+    context = {
+        "home_rest_days": settings.SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS,
+        "away_rest_days": settings.SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS,
+        "home_key_absences": _count_key_absences(home_players),
+        "away_key_absences": _count_key_absences(away_players),
+        "home_motivation": 0.0,
+        "away_motivation": 0.0,
+    }
+    bundle = feature_builder.build(
+        card,
+        home_stats=_extract_team_stats(card, card.home_team_id),
+        away_stats=_extract_team_stats(card, card.away_team_id),
+        context=context,
+    )
+    return card, bundle, degraded
+
+
+async def refresh_upcoming(days: int, *, concurrency: int = DEFAULT_FETCH_CONCURRENCY) -> None:
+    """Refresh the upcoming slate in stages instead of one round trip chain per fixture.
+
+    1. fixture cards, expected lineups and odds are fetched concurrently under a
+       shared request budget;
+    2. features are built for the whole slate and simulated in one vectorised draw;
+    3. fixtures, predictions, odds and cache entries are written in bulk; odds are
+       kept only for fixtures whose card was fetched, so none reference a missing row.
+    """
+
     settings = get_settings()
     client = SportMonksClient()
     endpoints = SportMonksEndpoints(client=client)
+    budget = asyncio.Semaphore(max(1, concurrency))
     today = date.today()
     start = today.isoformat()
     end = (today + timedelta(days=days)).isoformat()
 
-    fixtures = await endpoints.fixtures_between(start, end)
-    fixture_ids = [fixture.id for fixture in fixtures]
-    expected_lineups = await endpoints.expected_lineups(fixture_ids)
-
-    for fixture in fixtures:
-        card = await endpoints.fixture_card(fixture.id)
-        lineup_override, degraded_lineup = expected_lineups.get(fixture.id, ([], False))
-        if lineup_override:
-            card.lineups = lineup_override
-        degraded = degraded_lineup or any(value.degraded_mode for value in card.xg_fixture)
-        home_players = [p for p in card.lineups if p.team_id == card.home_team_id]
-        away_players = [p for p in card.lineups if p.team_id == card.away_team_id]
-        context = {
-            "home_rest_days": settings.SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS,
-            "away_rest_days": settings.SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS,
-            "home_key_absences": _count_key_absences(home_players),
-            "away_key_absences": _count_key_absences(away_players),
-            "home_motivation": 0.0,
-            "away_motivation": 0.0,
-        }
-        home_stats = await _extract_team_stats(card, card.home_team_id)
-        away_stats = await _extract_team_stats(card, card.away_team_id)
-        bundle = feature_builder.build(card, home_stats=home_stats, away_stats=away_stats, context=context)
-        markets = simulate_markets(bundle.lambda_home, bundle.lambda_away, settings.SIM_RHO, settings.SIM_N)
-        confidence = _confidence(bundle, degraded)
-        features_snapshot = bundle.snapshot | {"adjustments": bundle.adjustments}
-
-        await sportmonks_repository.upsert_fixture(card)
-        await sportmonks_repository.store_prediction(
-            fixture=card,
-            lambda_home=bundle.lambda_home,
-            lambda_away=bundle.lambda_away,
-            markets=markets,
-            confidence=confidence,
-            model_version=settings.MODEL_VERSION or settings.MODEL_VERSION_FORMAT,
-            features_snapshot=features_snapshot,
+    try:
+        fixtures = await endpoints.fixtures_between(start, end)
+        fixture_ids = [fixture.id for fixture in fixtures]
+        if not fixture_ids:
+            return
+
+        expected_lineups, cards, odds_batches = await asyncio.gather(
+            endpoints.expected_lineups(fixture_ids),
+            asyncio.gather(*(_fetch_card(endpoints, fid, budget) for fid in fixture_ids)),
+            asyncio.gather(*(_fetch_odds(endpoints, fid, budget) for fid in fixture_ids)),
         )
 
-        cached_payload = {
-            "fixture": card.model_dump(mode="json"),
-            "markets": markets,
-            "confidence": confidence,
-            "generated_at": datetime.utcnow().isoformat(),
-        }
-        await sportmonks_cache.set_ttl(
-            "fixture-prediction",
-            (card.id,),
-            "fixtures_upcoming",
-            cached_payload,
+        prepared = [
+            _prepare_fixture(card, expected_lineups, settings) for card in cards if card is not None
+        ]
+
+        # Simulate the whole slate in a single vectorised draw instead of per fixture.
+        slate_markets = (
+            simulate_markets_batch(
+                [bundle.lambda_home for _, bundle, _ in prepared],
+                [bundle.lambda_away for _, bundle, _ in prepared],
+                settings.SIM_RHO,
+                settings.SIM_N,
+                engine=settings.SIM_ENGINE,
+            )
+            if prepared
+            else []
         )
 
-        odds = await endpoints.odds_for_fixture(card.id, inplay=False)
-        odds += await endpoints.odds_for_fixture(card.id, inplay=True)
-        if odds:
-            await sportmonks_repository.store_odds(odds)
+        model_version = settings.MODEL_VERSION or settings.MODEL_VERSION_FORMAT
+        generated_at = datetime.utcnow().isoformat()
+        records: list[PredictionRecord] = []
+        cache_entries: list[tuple[tuple[Any, ...], dict[str, Any]]] = []
+        for (card, bundle, degraded), markets in zip(prepared, slate_markets, strict=True):
+            confidence = _confidence(bundle, degraded)
+            records.append(
+                PredictionRecord(
+                    fixture=card,
+                    lambda_home=bundle.lambda_home,
+                    lambda_away=bundle.lambda_away,
+                    markets=markets,
+                    confidence=confidence,
+                    model_version=model_version,
+                    features_snapshot=bundle.snapshot | {"adjustments": bundle.adjustments},
+                )
+            )
+            cache_entries.append(
+                (
+                    (card.id,),
+                    {
+                        "fixture": card.model_dump(mode="json"),
+                        "markets": markets,
+                        "confidence": confidence,
+                        "generated_at": generated_at,
+                    },
+                )
+            )
+
+        stored_ids = {card.id for card, _, _ in prepared}
+        odds = [
+            quote
+            for fixture_id, batch in zip(fixture_ids, odds_batches, strict=True)
+            if fixture_id in stored_ids
+            for quote in batch
+        ]
 
-    await client.close()
+        # Predictions reference fixtures, so fixtures land first; the rest is independent.
+        await sportmonks_repository.upsert_fixtures([card for card, _, _ in prepared])
+        await asyncio.gather(
+            sportmonks_repository.store_predictions(records),
+            sportmonks_repository.store_odds(odds),
+            sportmonks_cache.set_many("fixture-prediction", cache_entries, "fixtures_upcoming"),
+        )
+        logger.info(
+            "Upcoming refresh: fixtures=%s, predicted=%s, odds=%s",
+            len(fixture_ids),
+            len(records),
+            len(odds),
+        )
+    finally:
+        await client.close()
 
 
-async def main_async(days: int) -> None:
-    await refresh_upcoming(days)
+async def main_async(days: int, concurrency: int = DEFAULT_FETCH_CONCURRENCY) -> None:
+    await refresh_upcoming(days, concurrency=concurrency)
 
 
 def main() -> None:
     args = _parse_args()
-    asyncio.run(main_async(args.days))
+    asyncio.run(main_async(args.days, args.concurrency))
 
 
 if __name__ == "__main__":
@@ -22,6 +22,50 @@ REQUIRED_FEATURE_COLUMNS = {
     "season_id",
 }
 
+# Ограничения пакетной обработки матчей
+BATCH_MATCH_CONCURRENCY = 8
+BATCH_REQUEST_CONCURRENCY = 16
+
+
+class _SharedRequests:
+    """Обёртка клиента SportMonks на время одного пакета.
+
+    Вызовы ``get_*`` с одинаковыми аргументами разделяют одну задачу, а
+    число одновременных запросов ограничено семафором.
+    """
+
+    def __init__(self, client: Any, limit: int) -> None:
+        self._client = client
+        self._semaphore = asyncio.Semaphore(max(1, limit))
+        self._tasks: dict[tuple[Any, ...], asyncio.Task] = {}
+        self.requests = 0
+        self.shared = 0
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._client, name)
+        if not name.startswith("get_") or not callable(attr):
+            return attr
+
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            key = (name, args, tuple(sorted(kwargs.items())))
+            try:
+                task = self._tasks.get(key)
+            except TypeError:  # нехэшируемые аргументы — без дедупликации
+                return await self._limited(attr, args, kwargs)
+            if task is None:
+                task = asyncio.ensure_future(self._limited(attr, args, kwargs))
+                self._tasks[key] = task
+            else:
+                self.shared += 1
+            return await asyncio.shield(task)
+
+        return call
+
+    async def _limited(self, method: Any, args: tuple[Any, ...], kwargs: dict[str, Any]) -> Any:
+        async with self._semaphore:
+            self.requests += 1
+            return await method(*args, **kwargs)
+
 
 class DataProcessor:
     """Класс для обработки данных матчей."""
@@ -980,14 +1024,21 @@ class DataProcessor:
             # Возвращаем исходные признаки и пустую маску в случае ошибки
             return features or {}, {}
 
-    async def get_match_context(self, fixture_id: int) -> dict[str, Any] | None:
+    async def get_match_context(
+        self, fixture_id: int, *, client: Any | None = None
+    ) -> dict[str, Any] | None:
         """
         Получение контекста матча: погода, составы, таблица, форма и т.д.
+        Args:
+            fixture_id (int): ID матча.
+            client: Клиент SportMonks (по умолчанию ``self.client``); пакетная
+                обработка передаёт сюда общий дедуплицирующий клиент.
         """
+        client = client or self.client
         try:
             logger.info(f"Начало получения контекста для матча {fixture_id}")
             # Получаем базовую информацию о матче
-            fixture = await self.client.get_fixture(fixture_id)
+            fixture = await client.get_fixture(fixture_id)
             if not fixture:
                 logger.error(f"Не удалось получить данные матча {fixture_id}")
                 return None
@@ -1011,18 +1062,27 @@ class DataProcessor:
             # Определяем диапазон дат для получения недавних матчей (последние 90 дней)
             date_to = match_date
             date_from = date_to - timedelta(days=90)
+            # Таблица запрашивается по сезону: матчи одного сезона в пакете
+            # разделяют один запрос через общий клиент.
+            league_id = fixture.get("league_id")
+            season_id = fixture.get("season_id")
+            if league_id and season_id:
+                standings_request = client.get_season_table(league_id, season_id)
+            else:
+                logger.warning(f"Не указаны лига или сезон для матча {fixture_id}")
+                standings_request = asyncio.sleep(0, result=None)
             # Создаем задачи для параллельного получения данных
             tasks = [
-                asyncio.create_task(self.client.get_weather(home_team_id, match_date)),
-                asyncio.create_task(self.client.get_lineups(fixture_id)),
-                asyncio.create_task(self.client.get_injuries(home_team_id)),
-                asyncio.create_task(self.client.get_injuries(away_team_id)),
-                asyncio.create_task(self.client.get_table(fixture_id)),
+                asyncio.create_task(client.get_weather(home_team_id, match_date)),
+                asyncio.create_task(client.get_lineups(fixture_id)),
+                asyncio.create_task(client.get_injuries(home_team_id)),
+                asyncio.create_task(client.get_injuries(away_team_id)),
+                asyncio.create_task(standings_request),
                 asyncio.create_task(
-                    self.client.get_last_team_matches(home_team_id, date_from=date_from)
+                    client.get_last_team_matches(home_team_id, date_from=date_from)
                 ),
                 asyncio.create_task(
-                    self.client.get_last_team_matches(away_team_id, date_from=date_from)
+                    client.get_last_team_matches(away_team_id, date_from=date_from)
                 ),
             ]
             # Дожидаемся завершения всех задач
@@ -1066,8 +1126,8 @@ class DataProcessor:
                 "rounds_left": standings_data.get("rounds_left") if standings_data else None,
                 "home_last_matches": home_fixtures_raw,
                 "away_last_matches": away_fixtures_raw,
-                "league_id": fixture.get("league_id"),  # Добавлено: league_id
-                "season_id": fixture.get("season_id"),  # Добавлено: season_id
+                "league_id": league_id,  # Добавлено: league_id
+                "season_id": season_id,  # Добавлено: season_id
             }
             # Вычисляем важность матча, если доступны необходимые данные
             match_importance = 0.0
@@ -1103,18 +1163,19 @@ class DataProcessor:
             return None
 
     async def process_match(
-        self, match_: dict[str, Any]
+        self, match_: dict[str, Any], *, client: Any | None = None
     ) -> tuple[bool, dict[str, Any] | None, str | None]:
         """
         Обработка одного матча: извлечение статистики, формирование признаков.
         """
+        client = client or self.client
         try:
             fixture_id = match_.get("id")
             if not fixture_id:
                 return False, None, "Отсутствует ID матча"
             logger.info(f"Начало обработки матча {fixture_id}")
             # Получаем контекст матча
-            context = await self.get_match_context(fixture_id)
+            context = await self.get_match_context(fixture_id, client=client)
             if not context:
                 return False, None, "Не удалось получить контекст матча"
             # Извлекаем данные из контекста
@@ -1123,24 +1184,24 @@ class DataProcessor:
             match_date = context["match_date"]
             # Получаем статистику команд
             home_stats_task = asyncio.create_task(
-                self.client.get_team_stats(home_team_id, match_date)
+                client.get_team_stats(home_team_id, match_date)
             )
             away_stats_task = asyncio.create_task(
-                self.client.get_team_stats(away_team_id, match_date)
+                client.get_team_stats(away_team_id, match_date)
             )
             # Добавлено: Получаем PPDA домашней и гостевой команд
             home_ppda_task = asyncio.create_task(
-                self.client.get_team_stats(home_team_id, match_date, stat_type="ppda")
+                client.get_team_stats(home_team_id, match_date, stat_type="ppda")
             )
             away_ppda_task = asyncio.create_task(
-                self.client.get_team_stats(away_team_id, match_date, stat_type="ppda")
+                client.get_team_stats(away_team_id, match_date, stat_type="ppda")
             )
             # Добавлено: Получаем Build-up Play домашней и гостевой команд
             home_build_up_task = asyncio.create_task(
-                self.client.get_team_stats(home_team_id, match_date, stat_type="build_up_play")
+                client.get_team_stats(home_team_id, match_date, stat_type="build_up_play")
             )
             away_build_up_task = asyncio.create_task(
-                self.client.get_team_stats(away_team_id, match_date, stat_type="build_up_play")
+                client.get_team_stats(away_team_id, match_date, stat_type="build_up_play")
             )
             # Дожидаемся завершения всех задач
             (
@@ -1258,13 +1319,29 @@ class DataProcessor:
             logger.error(error_msg, exc_info=True)
             return False, None, error_msg
 
-    async def process_matches_batch(self, matches: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    async def process_matches_batch(
+        self,
+        matches: list[dict[str, Any]],
+        *,
+        max_concurrency: int = BATCH_MATCH_CONCURRENCY,
+        max_requests: int = BATCH_REQUEST_CONCURRENCY,
+    ) -> list[dict[str, Any]]:
         """
         Пакетная обработка списка матчей.
+        Одновременно обрабатывается не более ``max_concurrency`` матчей, а все
+        запросы к SportMonks идут через общий клиент пакета: одинаковые
+        запросы (статистика и последние матчи одной команды, таблица)
+        выполняются один раз, в полёте не более ``max_requests`` запросов.
         """
         logger.info(f"Начало пакетной обработки {len(matches)} матчей")
-        # Создаем задачи для параллельной обработки матчей
-        tasks = [asyncio.create_task(self.process_match(match)) for match in matches]
+        shared_client = _SharedRequests(self.client, max_requests)
+        match_slots = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def _run(match_: dict[str, Any]) -> tuple[bool, dict[str, Any] | None, str | None]:
+            async with match_slots:
+                return await self.process_match(match_, client=shared_client)
+
+        tasks = [asyncio.create_task(_run(match)) for match in matches]
         # Выполняем все задачи
         results = await asyncio.gather(*tasks, return_exceptions=True)
         # Обрабатываем результаты
@@ -1293,7 +1370,11 @@ class DataProcessor:
                 processed_results.append(
                     {"match": matches[i], "success": False, "error": str(process_error)}
                 )
-        logger.info(f"Получены данные для {len(processed_results)} матчей")
+        logger.info(
+            f"Получены данные для {len(processed_results)} матчей "
+            f"(запросов к API: {shared_client.requests}, "
+            f"переиспользовано: {shared_client.shared})"
+        )
         return processed_results
 
 
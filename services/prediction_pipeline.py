@@ -87,6 +87,8 @@ class PredictionPipeline:
                 base_dir = getattr(self._reg, "base_dir", None)
                 if base_dir is not None:
                     for sub in base_dir.iterdir():
+                        if not sub.is_dir():
+                            continue
                         m_home = self._reg.load("glm_home", season=sub.name)
                         m_away = self._reg.load("glm_away", season=sub.name)
                         return m_home, m_away
@@ -172,7 +174,9 @@ class PredictionPipeline:
 
             lam_home = float(pred_home[0])
             lam_away = float(pred_away[0])
-            markets = simulate_markets(lam_home, lam_away, settings.sim_rho, settings.sim_n)
+            markets = simulate_markets(
+                lam_home, lam_away, settings.sim_rho, settings.sim_n, engine=settings.sim_engine
+            )
 
             season = str(df.get("season", [os.getenv("SEASON_ID", "default")])[0])
             home_team = str(df.get("home", ["home"])[0])
@@ -1,18 +1,24 @@
 """
 @file: simulator.py
-@description: Monte-Carlo simulator for football markets with entropy analytics.
-@dependencies: numpy, collections, ml.metrics.entropy
+@description: Monte-Carlo and closed-form simulators for football markets with entropy analytics.
+@dependencies: numpy, collections, ml.metrics.entropy, ml.sim.bivariate_poisson, ml.sim.analytic
 @created: 2025-09-15
 """
 from __future__ import annotations
 
+from collections.abc import Sequence
 from pathlib import Path
 from typing import Any
 
 import numpy as np
 
 from ml.metrics.entropy import entropy_1x2, entropy_cs, entropy_totals
-from ml.sim.bivariate_poisson import simulate_bipoisson
+from ml.sim.analytic import analytic_markets, markets_from_matrix, probability_matrices
+from ml.sim.bivariate_poisson import (
+    batch_market_probabilities,
+    iter_bipoisson_blocks,
+    simulate_bipoisson,
+)
 
 
 class Simulator:
@@ -66,6 +72,28 @@ class Simulator:
             return markets, home, away
         return markets
 
+    def run_batch(
+        self,
+        lam_home: Sequence[float] | np.ndarray,
+        lam_away: Sequence[float] | np.ndarray,
+        rho: Sequence[float] | np.ndarray | float,
+        n_sims: int = 10000,
+        seed: int | None = 42,
+    ) -> list[dict[str, Any]]:
+        """Simulate a slate of fixtures and return per-fixture markets.
+
+        The output list is aligned with the input arrays and every item has the
+        same layout as :meth:`run`. Fixtures are simulated and reduced in blocks
+        of at most ``SIM_CHUNK`` draws, so raw samples never exist for the whole
+        slate at once. Each fixture uses its own ``seed``-ed stream, so adding or
+        reordering fixtures does not change the others' probabilities.
+        """
+        markets: list[dict[str, Any]] = []
+        for _, home, away in iter_bipoisson_blocks(lam_home, lam_away, rho, n_sims, seed):
+            reduced = batch_market_probabilities(home, away)
+            markets.extend(_markets_from_batch(reduced, idx) for idx in range(home.shape[0]))
+        return markets
+
     def save(self, result: dict[str, Any], path: Path) -> None:
         import json
 
@@ -74,18 +102,107 @@ class Simulator:
             json.dump(result, f, ensure_ascii=False, indent=2)
 
 
+class AnalyticSimulator(Simulator):
+    """Drop-in :class:`Simulator` pricing markets exactly from the score matrix.
+
+    ``n_sims`` is accepted for signature compatibility and ignored; raw samples do
+    not exist for the closed-form engine.
+    """
+
+    def __init__(self, max_goals: int = 10) -> None:
+        self.max_goals = max_goals
+
+    def run(
+        self,
+        lam_home: float,
+        lam_away: float,
+        rho: float,
+        n_sims: int = 10000,
+        return_samples: bool = False,
+    ) -> dict[str, Any]:
+        if return_samples:
+            raise ValueError("Analytic engine does not produce samples")
+        return analytic_markets(lam_home, lam_away, rho, self.max_goals)
+
+    def run_batch(
+        self,
+        lam_home: Sequence[float] | np.ndarray,
+        lam_away: Sequence[float] | np.ndarray,
+        rho: Sequence[float] | np.ndarray | float,
+        n_sims: int = 10000,
+        seed: int | None = 42,
+    ) -> list[dict[str, Any]]:
+        matrices = probability_matrices(lam_home, lam_away, rho, self.max_goals)
+        return [markets_from_matrix(matrix) for matrix in matrices]
+
+
+SIM_ENGINES: dict[str, type[Simulator]] = {"mc": Simulator, "analytic": AnalyticSimulator}
+
+
+def get_simulator(engine: str = "mc") -> Simulator:
+    """Return a simulator for ``engine`` (``mc`` or ``analytic``)."""
+    try:
+        return SIM_ENGINES[engine]()
+    except KeyError as exc:
+        raise ValueError(f"Unknown simulation engine: {engine}") from exc
+
+
 def simulate_markets(
     lam_home: float,
     lam_away: float,
     rho: float,
     n_sims: int = 10000,
     return_samples: bool = False,
+    engine: str = "mc",
 ) -> dict[str, Any] | tuple[dict[str, Any], np.ndarray, np.ndarray]:
     """Convenience wrapper around :class:`Simulator`."""
-    sim = Simulator()
+    sim = get_simulator(engine)
     return sim.run(lam_home, lam_away, rho, n_sims, return_samples)
 
 
+def simulate_markets_batch(
+    lam_home: Sequence[float] | np.ndarray,
+    lam_away: Sequence[float] | np.ndarray,
+    rho: Sequence[float] | np.ndarray | float,
+    n_sims: int = 10000,
+    engine: str = "mc",
+) -> list[dict[str, Any]]:
+    """Convenience wrapper around :meth:`Simulator.run_batch`."""
+    sim = get_simulator(engine)
+    return sim.run_batch(lam_home, lam_away, rho, n_sims)
+
+
+def _markets_from_batch(reduced: dict[str, np.ndarray], idx: int) -> dict[str, Any]:
+    win1, draw, win2 = (float(v) for v in reduced["1x2"][idx])
+    markets: dict[str, Any] = {"1x2": {"1": win1, "x": draw, "2": win2}}
+    btts_yes, btts_no = (float(v) for v in reduced["btts"][idx])
+    markets["btts"] = {"yes": btts_yes, "no": btts_no}
+
+    totals: dict[str, dict[str, float]] = {}
+    for pos, line in enumerate(reduced["totals"]):
+        totals[f"{line:.1f}"] = {
+            "over": float(reduced["over"][idx, pos]),
+            "under": float(reduced["under"][idx, pos]),
+        }
+    markets["totals"] = totals
+
+    grid = reduced["cs"][idx]
+    cs: dict[str, float] = {}
+    for h in range(grid.shape[0]):
+        for a in range(grid.shape[1]):
+            cs[f"{h}:{a}"] = float(grid[h, a])
+    cs["OTHER"] = float(reduced["cs_other"][idx])
+    markets["cs"] = cs
+
+    ent: dict[str, float] = {}
+    ent.update(entropy_1x2(win1, draw, win2))
+    main_total = totals.get("2.5") or next(iter(totals.values()))
+    ent.update(entropy_totals(main_total["over"], main_total["under"]))
+    ent.update(entropy_cs(cs))
+    markets["entropy"] = ent
+    return markets
+
+
 def render_markdown(markets: dict[str, Any], n_sims: int, rho: float) -> str:
     """Render markets and entropies into a Markdown report."""
     lines = [f"n_sims: {n_sims}", f"rho: {rho}", "", "### 1X2", "|Sel|Prob|", "|---|---|"]
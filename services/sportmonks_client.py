@@ -1,8 +1,10 @@
 # services/sportmonks_client.py
 """Клиент для взаимодействия с API SportMonks."""
+import asyncio
 import hashlib
 import json
 import os
+from collections.abc import Awaitable, Callable
 from datetime import date
 from functools import wraps
 from typing import Any
@@ -51,8 +53,38 @@ async def fetch_lineup_api(fixture_id: int) -> dict[str, Any] | None:
 
 
 # --- Конец добавления ---
+class _SingleFlight:
+    """Объединяет одновременные вызовы с одинаковым ключом в один запрос."""
+
+    def __init__(self) -> None:
+        self._inflight: dict[str, asyncio.Future[Any]] = {}
+
+    async def run(self, key: str, func: Callable[[], Awaitable[Any]]) -> Any:
+        existing = self._inflight.get(key)
+        if existing is not None:
+            return await asyncio.shield(existing)
+        future = asyncio.ensure_future(func())
+        self._inflight[key] = future
+
+        def _release(done: asyncio.Future[Any]) -> None:
+            if self._inflight.get(key) is done:
+                self._inflight.pop(key, None)
+            if not done.cancelled():
+                done.exception()  # помечаем ошибку как полученную, даже если ждать некому
+
+        future.add_done_callback(_release)
+        return await asyncio.shield(future)
+
+
+_single_flight = _SingleFlight()
+
+
 def cached(ttl: int = 300):
-    """Декоратор для кеширования результатов функций через Redis кэш"""
+    """Декоратор для кеширования результатов функций через Redis кэш.
+
+    Одновременные промахи кэша с одинаковыми аргументами выполняют один
+    запрос к API: остальные вызовы дожидаются его результата.
+    """
 
     def decorator(func):
         @wraps(func)
@@ -68,9 +100,13 @@ def cached(ttl: int = 300):
                     return cached_result
             except Exception as e:
                 logger.error(f"Ошибка при получении данных из кэша: {e}")
-            # Если в кэше нет данных, вызываем функцию
-            try:
-                result = await func(*args, **kwargs)
+            # Если в кэше нет данных, вызываем функцию (один раз на ключ)
+            async def _load():
+                try:
+                    result = await func(*args, **kwargs)
+                except Exception as e:
+                    logger.error(f"Ошибка в функции {func.__name__}: {e}")
+                    raise
                 # Сохраняем результат в кэш
                 try:
                     await cache.set(cache_key, result, ttl=ttl)
@@ -78,9 +114,8 @@ def cached(ttl: int = 300):
                 except Exception as e:
                     logger.error(f"Ошибка при сохранении данных в кэш: {e}")
                 return result
-            except Exception as e:
-                logger.error(f"Ошибка в функции {func.__name__}: {e}")
-                raise
+
+            return await _single_flight.run(cache_key, _load)
 
         return wrapper
 
@@ -285,16 +320,27 @@ class SportMonksClient:
         Returns:
             Optional[Dict]: Таблица лиги или None
         """
+        # Сначала получаем информацию о матче для определения лиги
+        fixture = await self.get_fixture(fixture_id)
+        if not fixture:
+            return None
+        league_id = fixture.get("league_id")
+        season_id = fixture.get("season_id")
+        if not league_id or not season_id:
+            logger.error(f"Не удалось определить лигу или сезон для матча {fixture_id}")
+            return None
+        return await self.get_season_table(league_id, season_id)
+
+    @cached(ttl=3600)  # Кэшируем на 1 час
+    async def get_season_table(self, league_id: int, season_id: int) -> dict[str, Any] | None:
+        """Получение таблицы лиги за сезон.
+        Args:
+            league_id (int): ID лиги
+            season_id (int): ID сезона
+        Returns:
+            Optional[Dict]: Таблица лиги или None
+        """
         try:
-            # Сначала получаем информацию о матче для определения лиги
-            fixture = await self.get_fixture(fixture_id)
-            if not fixture:
-                return None
-            league_id = fixture.get("league_id")
-            season_id = fixture.get("season_id")
-            if not league_id or not season_id:
-                logger.error(f"Не удалось определить лигу или сезон для матча {fixture_id}")
-                return None
             session = await self._get_session()
             url = f"{self.base_url}/tables/seasons/{season_id}"
             params = {"api_token": self.api_token, "include": "standings.team"}
@@ -316,12 +362,12 @@ class SportMonksClient:
                     return None
                 else:
                     logger.error(
-                        f"Ошибка получения таблицы для матча {fixture_id}: статус {response.status}"
+                        f"Ошибка получения таблицы сезона {season_id}: статус {response.status}"
                     )
                     return None
         except Exception as e:
             logger.error(
-                f"Ошибка при получении таблицы для матча {fixture_id}: {e}",
+                f"Ошибка при получении таблицы сезона {season_id}: {e}",
                 exc_info=True,
             )
             return None
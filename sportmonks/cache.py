@@ -1,13 +1,14 @@
 """
 @file: cache.py
 @description: Redis-backed cache helpers tailored for SportMonks data with TTL profiles.
-@dependencies: database.cache_postgres, typing
+@dependencies: asyncio, database.cache_postgres, typing
 @created: 2025-09-23
 """
 
 from __future__ import annotations
 
-from typing import Any, Awaitable, Callable
+import asyncio
+from typing import Any, Awaitable, Callable, Iterable
 
 from database.cache_postgres import cache, versioned_key
 from logger import logger
@@ -53,6 +54,20 @@ class SportMonksCache:
         except Exception as exc:  # pragma: no cover
             logger.error("sportmonks_cache_set_error", extra={"error": str(exc)})
 
+    async def set_many(
+        self,
+        prefix: str,
+        items: Iterable[tuple[tuple[Any, ...], Any]],
+        ttl_name: str,
+    ) -> None:
+        """Store several ``(key_parts, value)`` pairs concurrently under one TTL profile."""
+
+        if self._cache is None:
+            return
+        await asyncio.gather(
+            *(self.set_ttl(prefix, key_parts, ttl_name, value) for key_parts, value in items)
+        )
+
     async def invalidate(self, prefix: str, key_parts: tuple[Any, ...]) -> None:
         if self._cache is None:
             return
@@ -8,12 +8,14 @@
 from __future__ import annotations
 
 import asyncio
+import math
 import random
 import time
-from collections.abc import AsyncIterator, Mapping
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Iterable, Mapping
 from contextlib import asynccontextmanager
 from dataclasses import dataclass
-from typing import Any, Callable
+from typing import Any, Callable, TypeVar
 
 import httpx
 
@@ -21,6 +23,7 @@ from config import get_settings
 from logger import logger
 
 _JSON = dict[str, Any]
+_T = TypeVar("_T")
 
 
 class RequestError(RuntimeError):
@@ -63,6 +66,41 @@ class _SingleFlight:
                 self._inflight.pop(key, None)
 
 
+async def _ordered_prefetch(
+    jobs: Iterable[Callable[[], Awaitable[_T]]], budget: int
+) -> AsyncIterator[_T]:
+    """Run jobs with at most ``budget`` in flight, yielding results in job order."""
+
+    pending: deque[asyncio.Task[_T]] = deque()
+    iterator = iter(jobs)
+    try:
+        while True:
+            while len(pending) < budget:
+                job = next(iterator, None)
+                if job is None:
+                    break
+                pending.append(asyncio.ensure_future(job()))
+            if not pending:
+                return
+            yield await pending.popleft()
+    finally:
+        for task in pending:
+            if task.done() and not task.cancelled():
+                task.exception()  # consumed: the caller stopped iterating or failed earlier
+            task.cancel()
+
+
+def _page_count(pagination: Mapping[str, Any], per_page: int) -> int | None:
+    for key in ("total_pages", "last_page"):
+        value = pagination.get(key)
+        if isinstance(value, int) and value > 0:
+            return value
+    total = pagination.get("total")
+    if isinstance(total, int) and total >= 0 and per_page > 0:
+        return max(1, math.ceil(total / per_page))
+    return None
+
+
 class SportMonksClient:
     """HTTP client wrapper for SportMonks API."""
 
@@ -76,6 +114,7 @@ class SportMonksClient:
         backoff_base: float | None = None,
         jitter: float = 0.25,
         concurrency: int | None = None,
+        page_concurrency: int | None = None,
         use_header_auth: bool = False,
     ) -> None:
         settings = get_settings()
@@ -90,6 +129,9 @@ class SportMonksClient:
         self._jitter = jitter
         limit = concurrency or max(1, int(settings.SPORTMONKS_RPS_LIMIT))
         self._semaphore = asyncio.Semaphore(limit)
+        self._page_concurrency = max(
+            1, page_concurrency or int(getattr(settings, "SPORTMONKS_PAGE_CONCURRENCY", 4))
+        )
         self._use_header_auth = use_header_auth
         self._default_params = {
             "timezone": "Europe/Berlin",
@@ -235,31 +277,48 @@ class SportMonksClient:
         headers: Mapping[str, str] | None = None,
         per_page: int = 50,
         limit: int | None = None,
+        concurrency: int | None = None,
     ) -> AsyncIterator[_JSON]:
+        """Yield items across pages in page order.
+
+        When the first page reports the total page count, the remaining pages
+        are requested concurrently (at most ``concurrency`` at a time, the HTTP
+        semaphore still applies); otherwise the next-page cursor is followed.
+        """
+
         page_params = dict(params or {})
         page_params["per_page"] = min(per_page, 50)
+        budget = max(1, concurrency or self._page_concurrency)
         fetched = 0
         cursor: str | None = None
+        first_page = True
         while True:
             if cursor:
                 page_params["page"] = cursor
             payload = await self.get_json(path, params=page_params, headers=headers)
-            data = payload.get("data")
-            if data is None:
-                break
-            if isinstance(data, list):
-                for item in data:
-                    yield item
-                    fetched += 1
-                    if limit is not None and fetched >= limit:
-                        return
-            else:
-                yield data
+            for item in self._page_items(payload):
+                yield item
                 fetched += 1
                 if limit is not None and fetched >= limit:
                     return
+            if payload.get("data") is None:
+                break
             meta = payload.get("meta", {})
             pagination = meta.get("pagination", {}) if isinstance(meta, Mapping) else {}
+            if first_page and budget > 1 and isinstance(pagination, Mapping):
+                remaining = self._remaining_pages(pagination, page_params, limit)
+                if remaining is not None:
+                    async for payload in _ordered_prefetch(
+                        (self._page_job(path, page_params, headers, page) for page in remaining),
+                        budget,
+                    ):
+                        for item in self._page_items(payload):
+                            yield item
+                            fetched += 1
+                            if limit is not None and fetched >= limit:
+                                return
+                    return
+            first_page = False
             cursor = (
                 pagination.get("next_page")
                 or pagination.get("next")
@@ -268,6 +327,40 @@ class SportMonksClient:
             if not cursor:
                 break
 
+    @staticmethod
+    def _page_items(payload: _JSON) -> list[Any]:
+        data = payload.get("data")
+        if data is None:
+            return []
+        return data if isinstance(data, list) else [data]
+
+    @staticmethod
+    def _remaining_pages(
+        pagination: Mapping[str, Any],
+        page_params: Mapping[str, Any],
+        limit: int | None,
+    ) -> range | None:
+        per_page = int(page_params["per_page"])
+        total_pages = _page_count(pagination, per_page)
+        if total_pages is None:
+            return None
+        current = pagination.get("current_page", 1)
+        if not isinstance(current, int):
+            return None
+        if limit is not None:
+            total_pages = min(total_pages, current + math.ceil(limit / per_page) - 1)
+        return range(current + 1, total_pages + 1)
+
+    def _page_job(
+        self,
+        path: str,
+        page_params: Mapping[str, Any],
+        headers: Mapping[str, str] | None,
+        page: int,
+    ) -> Callable[[], Awaitable[_JSON]]:
+        params = {**page_params, "page": page}
+        return lambda: self.get_json(path, params=params, headers=headers)
+
     async def chunked_between(
         self,
         path_template: str,
@@ -276,22 +369,37 @@ class SportMonksClient:
         end: str,
         chunk_days: int,
         params: Mapping[str, Any] | None = None,
+        concurrency: int | None = None,
     ) -> AsyncIterator[_JSON]:
+        """Yield items for consecutive date windows, fetching windows concurrently.
+
+        Window order (and item order inside each window) is preserved.
+        """
+
         from datetime import datetime, timedelta
 
         fmt = "%Y-%m-%d"
         start_dt = datetime.fromisoformat(start)
         end_dt = datetime.fromisoformat(end)
+        paths: list[str] = []
         current = start_dt
         while current <= end_dt:
             chunk_end = min(current + timedelta(days=chunk_days - 1), end_dt)
-            path = path_template.format(
-                start=current.strftime(fmt), end=chunk_end.strftime(fmt)
+            paths.append(
+                path_template.format(start=current.strftime(fmt), end=chunk_end.strftime(fmt))
             )
-            async for item in self.paginate(path, params=params):
-                yield item
             current = chunk_end + timedelta(days=1)
 
+        async def _collect(path: str) -> list[_JSON]:
+            return [item async for item in self.paginate(path, params=params)]
+
+        budget = max(1, concurrency or self._page_concurrency)
+        async for items in _ordered_prefetch(
+            ((lambda path=path: _collect(path)) for path in paths), budget
+        ):
+            for item in items:
+                yield item
+
     async def healthcheck(self) -> dict[str, Any]:
         start_time = time.monotonic()
         payload = await self.get_json("/status")
@@ -1,7 +1,8 @@
 """
 @file: repository.py
 @description: Persistence helpers for SportMonks ingestion with Postgres upserts.
-@dependencies: asyncio, datetime, json, sqlalchemy, config, database.db_router, sportmonks.schemas
+@dependencies: asyncio, dataclasses, datetime, json, sqlalchemy, config, database.db_router,
+    sportmonks.schemas
 @created: 2025-09-23
 """
 
@@ -9,6 +10,7 @@ from __future__ import annotations
 
 import asyncio
 import json
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Any, Iterable
 
@@ -41,6 +43,155 @@ def _resolve_router(settings: Any):
         return None
 
 
+_UPSERT_FIXTURE_SQL = """
+    INSERT INTO sm_fixtures (
+        id, league_id, season_id, home_id, away_id, kickoff_utc, status, payload_json, pulled_at_utc
+    )
+    VALUES (:id, :league_id, :season_id, :home_id, :away_id, :kickoff, :status, :payload, :pulled)
+    ON CONFLICT (id) DO UPDATE SET
+        league_id = EXCLUDED.league_id,
+        season_id = EXCLUDED.season_id,
+        home_id = EXCLUDED.home_id,
+        away_id = EXCLUDED.away_id,
+        kickoff_utc = EXCLUDED.kickoff_utc,
+        status = EXCLUDED.status,
+        payload_json = EXCLUDED.payload_json,
+        pulled_at_utc = EXCLUDED.pulled_at_utc
+"""
+
+_STORE_PREDICTION_SQL = """
+    INSERT INTO predictions (
+        fixture_id,
+        league_id,
+        season_id,
+        home_team_id,
+        away_team_id,
+        match_start,
+        model_name,
+        model_version,
+        lambda_home,
+        lambda_away,
+        prob_home_win,
+        prob_draw,
+        prob_away_win,
+        totals_probs,
+        btts_probs,
+        recommendations,
+        confidence,
+        features_snapshot,
+        meta
+    ) VALUES (
+        :fixture_id,
+        :league_id,
+        :season_id,
+        :home_id,
+        :away_id,
+        :match_start,
+        :model_name,
+        :model_version,
+        :lambda_home,
+        :lambda_away,
+        :prob_home,
+        :prob_draw,
+        :prob_away,
+        :totals,
+        :btts,
+        :recommendations,
+        :confidence,
+        :features,
+        :meta
+    )
+    ON CONFLICT (fixture_id, model_version) DO UPDATE SET
+        lambda_home = EXCLUDED.lambda_home,
+        lambda_away = EXCLUDED.lambda_away,
+        prob_home_win = EXCLUDED.prob_home_win,
+        prob_draw = EXCLUDED.prob_draw,
+        prob_away_win = EXCLUDED.prob_away_win,
+        totals_probs = EXCLUDED.totals_probs,
+        btts_probs = EXCLUDED.btts_probs,
+        recommendations = EXCLUDED.recommendations,
+        confidence = EXCLUDED.confidence,
+        features_snapshot = EXCLUDED.features_snapshot,
+        meta = EXCLUDED.meta,
+        updated_at = NOW()
+"""
+
+_STORE_ODDS_SQL = """
+    INSERT INTO odds_snapshots (
+        provider, pulled_at_utc, match_key, league, kickoff_utc, market, selection, price_decimal,
+        extra_json
+    )
+    VALUES (:provider, :pulled, :match_key, :league, :kickoff, :market, :selection, :price, :extra)
+    ON CONFLICT (provider, match_key, market, selection, pulled_at_utc) DO NOTHING
+"""
+
+
+@dataclass(slots=True)
+class PredictionRecord:
+    fixture: Fixture
+    lambda_home: float
+    lambda_away: float
+    markets: dict[str, Any]
+    confidence: float
+    model_version: str
+    features_snapshot: dict[str, Any]
+
+
+def _fixture_params(fixture: Fixture, pulled: str) -> dict[str, Any]:
+    payload = json.dumps(fixture.model_dump(mode="json"), ensure_ascii=False)
+    return {
+        "id": fixture.id,
+        "league_id": fixture.league_id,
+        "season_id": fixture.season_id,
+        "home_id": fixture.home_team_id,
+        "away_id": fixture.away_team_id,
+        "kickoff": fixture.starting_at.isoformat() if fixture.starting_at else None,
+        "status": fixture.status,
+        "payload": payload,
+        "pulled": pulled,
+    }
+
+
+def _prediction_params(record: PredictionRecord) -> dict[str, Any]:
+    fixture = record.fixture
+    markets = record.markets
+    return {
+        "fixture_id": fixture.id,
+        "league_id": fixture.league_id,
+        "season_id": fixture.season_id,
+        "home_id": fixture.home_team_id,
+        "away_id": fixture.away_team_id,
+        "match_start": fixture.starting_at,
+        "model_name": "sportmonks_ingestion",
+        "model_version": record.model_version,
+        "lambda_home": record.lambda_home,
+        "lambda_away": record.lambda_away,
+        "prob_home": markets.get("1x2", {}).get("1"),
+        "prob_draw": markets.get("1x2", {}).get("x"),
+        "prob_away": markets.get("1x2", {}).get("2"),
+        "totals": json.dumps(markets.get("totals"), ensure_ascii=False),
+        "btts": json.dumps(markets.get("btts"), ensure_ascii=False),
+        "recommendations": json.dumps(markets.get("recommendations", {}), ensure_ascii=False),
+        "confidence": record.confidence,
+        "features": json.dumps(record.features_snapshot, ensure_ascii=False),
+        "meta": json.dumps({"source": "sportmonks_update"}, ensure_ascii=False),
+    }
+
+
+def _odds_params(quote: OddsQuote) -> dict[str, Any]:
+    return {
+        "provider": str(quote.bookmaker_id),
+        "pulled": quote.pulled_at.isoformat() if quote.pulled_at else datetime.utcnow().isoformat(),
+        "match_key": f"{quote.fixture_id}",
+        "league": None,
+        "kickoff": None,
+        "market": str(quote.market_id),
+        "selection": quote.label,
+        "price": quote.price,
+        "extra": json.dumps(quote.extra, ensure_ascii=False),
+    }
+
+
 class SportMonksRepository:
     """Persist SportMonks payloads into analytical storage."""
 
@@ -61,40 +212,25 @@ class SportMonksRepository:
                 self._started = True
 
     async def upsert_fixture(self, fixture: Fixture, pulled_at: datetime | None = None) -> None:
+        await self.upsert_fixtures([fixture], pulled_at=pulled_at)
+
+    async def upsert_fixtures(
+        self, fixtures: Iterable[Fixture], pulled_at: datetime | None = None
+    ) -> None:
+        """Upsert a slate of fixtures with one ``executemany`` and a single commit."""
+
+        items = list(fixtures)
+        if not items:
+            return
         if self._router is None:
-            logger.debug("Offline mode: skipping fixture upsert for %s", fixture.id)
+            logger.debug("Offline mode: skipping fixture upsert for %s fixtures", len(items))
             return
         await self.ensure_ready()
-        payload = json.dumps(fixture.model_dump(mode="json"), ensure_ascii=False)
         pulled = (pulled_at or datetime.utcnow()).isoformat()
         async with self._router.session() as session:
             await session.execute(
-                text(
-                    """
-                    INSERT INTO sm_fixtures (id, league_id, season_id, home_id, away_id, kickoff_utc, status, payload_json, pulled_at_utc)
-                    VALUES (:id, :league_id, :season_id, :home_id, :away_id, :kickoff, :status, :payload, :pulled)
-                    ON CONFLICT (id) DO UPDATE SET
-                        league_id = EXCLUDED.league_id,
-                        season_id = EXCLUDED.season_id,
-                        home_id = EXCLUDED.home_id,
-                        away_id = EXCLUDED.away_id,
-                        kickoff_utc = EXCLUDED.kickoff_utc,
-                        status = EXCLUDED.status,
-                        payload_json = EXCLUDED.payload_json,
-                        pulled_at_utc = EXCLUDED.pulled_at_utc
-                    """
-                ),
-                {
-                    "id": fixture.id,
-                    "league_id": fixture.league_id,
-                    "season_id": fixture.season_id,
-                    "home_id": fixture.home_team_id,
-                    "away_id": fixture.away_team_id,
-                    "kickoff": fixture.starting_at.isoformat() if fixture.starting_at else None,
-                    "status": fixture.status,
-                    "payload": payload,
-                    "pulled": pulled,
-                },
+                text(_UPSERT_FIXTURE_SQL),
+                [_fixture_params(fixture, pulled) for fixture in items],
             )
             await session.commit()
 
@@ -177,98 +313,43 @@ class SportMonksRepository:
         model_version: str,
         features_snapshot: dict[str, Any],
     ) -> None:
+        await self.store_predictions(
+            [
+                PredictionRecord(
+                    fixture=fixture,
+                    lambda_home=lambda_home,
+                    lambda_away=lambda_away,
+                    markets=markets,
+                    confidence=confidence,
+                    model_version=model_version,
+                    features_snapshot=features_snapshot,
+                )
+            ]
+        )
+
+    async def store_predictions(self, records: Iterable[PredictionRecord]) -> None:
+        """Upsert predictions for a slate with one ``executemany`` and a single commit."""
+
+        items = list(records)
+        if not items:
+            return
         if self._router is None:
             logger.debug(
-                "Offline mode: skipping prediction store for fixture %s", fixture.id
+                "Offline mode: skipping prediction store for %s fixtures", len(items)
             )
             return
         await self.ensure_ready()
         async with self._router.session() as session:
             await session.execute(
-                text(
-                    """
-                    INSERT INTO predictions (
-                        fixture_id,
-                        league_id,
-                        season_id,
-                        home_team_id,
-                        away_team_id,
-                        match_start,
-                        model_name,
-                        model_version,
-                        lambda_home,
-                        lambda_away,
-                        prob_home_win,
-                        prob_draw,
-                        prob_away_win,
-                        totals_probs,
-                        btts_probs,
-                        recommendations,
-                        confidence,
-                        features_snapshot,
-                        meta
-                    ) VALUES (
-                        :fixture_id,
-                        :league_id,
-                        :season_id,
-                        :home_id,
-                        :away_id,
-                        :match_start,
-                        :model_name,
-                        :model_version,
-                        :lambda_home,
-                        :lambda_away,
-                        :prob_home,
-                        :prob_draw,
-                        :prob_away,
-                        :totals,
-                        :btts,
-                        :recommendations,
-                        :confidence,
-                        :features,
-                        :meta
-                    )
-                    ON CONFLICT (fixture_id, model_version) DO UPDATE SET
-                        lambda_home = EXCLUDED.lambda_home,
-                        lambda_away = EXCLUDED.lambda_away,
-                        prob_home_win = EXCLUDED.prob_home_win,
-                        prob_draw = EXCLUDED.prob_draw,
-                        prob_away_win = EXCLUDED.prob_away_win,
-                        totals_probs = EXCLUDED.totals_probs,
-                        btts_probs = EXCLUDED.btts_probs,
-                        recommendations = EXCLUDED.recommendations,
-                        confidence = EXCLUDED.confidence,
-                        features_snapshot = EXCLUDED.features_snapshot,
-                        meta = EXCLUDED.meta,
-                        updated_at = NOW()
-                    """
-                ),
-                {
-                    "fixture_id": fixture.id,
-                    "league_id": fixture.league_id,
-                    "season_id": fixture.season_id,
-                    "home_id": fixture.home_team_id,
-                    "away_id": fixture.away_team_id,
-                    "match_start": fixture.starting_at,
-                    "model_name": "sportmonks_ingestion",
-                    "model_version": model_version,
-                    "lambda_home": lambda_home,
-                    "lambda_away": lambda_away,
-                    "prob_home": markets.get("1x2", {}).get("1"),
-                    "prob_draw": markets.get("1x2", {}).get("x"),
-                    "prob_away": markets.get("1x2", {}).get("2"),
-                    "totals": json.dumps(markets.get("totals"), ensure_ascii=False),
-                    "btts": json.dumps(markets.get("btts"), ensure_ascii=False),
-                    "recommendations": json.dumps(markets.get("recommendations", {}), ensure_ascii=False),
-                    "confidence": confidence,
-                    "features": json.dumps(features_snapshot, ensure_ascii=False),
-                    "meta": json.dumps({"source": "sportmonks_update"}, ensure_ascii=False),
-                },
+                text(_STORE_PREDICTION_SQL),
+                [_prediction_params(record) for record in items],
             )
             await session.commit()
 
     async def store_odds(self, quotes: Iterable[OddsQuote]) -> None:
         payload = list(quotes)
+        if not payload:
+            return
         if self._router is None:
             logger.debug(
                 "Offline mode: skipping odds store for %s quotes",
@@ -277,27 +358,9 @@ class SportMonksRepository:
             return
         await self.ensure_ready()
         async with self._router.session() as session:
-            for quote in payload:
-                await session.execute(
-                    text(
-                        """
-                        INSERT INTO odds_snapshots (provider, pulled_at_utc, match_key, league, kickoff_utc, market, selection, price_decimal, extra_json)
-                        VALUES (:provider, :pulled, :match_key, :league, :kickoff, :market, :selection, :price, :extra)
-                        ON CONFLICT (provider, match_key, market, selection, pulled_at_utc) DO NOTHING
-                        """
-                    ),
-                    {
-                        "provider": str(quote.bookmaker_id),
-                        "pulled": quote.pulled_at.isoformat() if quote.pulled_at else datetime.utcnow().isoformat(),
-                        "match_key": f"{quote.fixture_id}",
-                        "league": None,
-                        "kickoff": None,
-                        "market": str(quote.market_id),
-                        "selection": quote.label,
-                        "price": quote.price,
-                        "extra": json.dumps(quote.extra, ensure_ascii=False),
-                    },
-                )
+            await session.execute(
+                text(_STORE_ODDS_SQL), [_odds_params(quote) for quote in payload]
+            )
             await session.commit()
 
 
@@ -28,3 +28,105 @@ async def test_ttl_cache_hit_and_miss() -> None:
     stats = cache.stats()
     assert stats["hits"] >= 1
     assert stats["misses"] >= 1
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_coalesces_concurrent_misses() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl_seconds=5.0)
+    calls = 0
+
+    async def factory() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return 7
+
+    results = await asyncio.gather(*(cache.get_or_set("key", factory) for _ in range(5)))
+    assert calls == 1
+    assert [value for value, _ in results] == [7] * 5
+    assert sum(1 for _, hit in results if not hit) == 1
+    assert cache.stats()["coalesced"] == 4
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_propagates_errors_to_waiters_and_retries() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl_seconds=5.0)
+
+    async def failing() -> int:
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    results = await asyncio.gather(
+        cache.get_or_set("key", failing),
+        cache.get_or_set("key", failing),
+        return_exceptions=True,
+    )
+    assert all(isinstance(item, RuntimeError) for item in results)
+    value, hit = await cache.get_or_set("key", lambda: 3)
+    assert (value, hit) == (3, False)
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_serves_stale_while_refreshing() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl_seconds=0.05, stale_ttl_seconds=5.0)
+    await cache.set("key", 1)
+    await asyncio.sleep(0.08)
+    calls = 0
+
+    async def refresh() -> int:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return 2
+
+    first = await cache.get_or_set("key", refresh, ttl_seconds=5.0)
+    second = await cache.get_or_set("key", refresh, ttl_seconds=5.0)
+    assert first == (1, True)
+    assert second == (1, True)
+    await asyncio.sleep(0.1)
+    assert calls == 1
+    assert await cache.get("key") == 2
+    assert cache.stats()["stale_hits"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_leader_cancellation_does_not_fail_waiters() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl_seconds=5.0)
+    release = asyncio.Event()
+    calls = 0
+
+    async def factory() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return 7
+
+    leader = asyncio.create_task(cache.get_or_set("key", factory))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.get_or_set("key", factory))
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert await waiter == (7, True)
+    assert calls == 1
+    assert await cache.get("key") == 7
+
+
+@pytest.mark.asyncio
+async def test_ttl_cache_invalidate_drops_inflight_result() -> None:
+    cache: TTLCache[str, int] = TTLCache(maxsize=4, ttl_seconds=5.0)
+    release = asyncio.Event()
+
+    async def factory() -> int:
+        await release.wait()
+        return 1
+
+    pending = asyncio.create_task(cache.get_or_set("key", factory))
+    await asyncio.sleep(0)
+    await cache.invalidate("key")
+    release.set()
+    assert await pending == (1, False)
+    assert await cache.get("key") is None
+    assert cache.stats()["inflight"] == 0.0
@@ -0,0 +1,176 @@
+"""
+/**
+ * @file: tests/bot/test_digest.py
+ * @description: Digest dispatcher renders once per (league, date), bounds sends, sends once a day.
+ * @dependencies: asyncio, app.bot.digest, app.bot.storage
+ * @created: 2026-10-16
+ */
+"""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+
+from app.bot import storage
+from app.bot.digest import DigestDispatcher
+
+
+class _Source:
+    def __init__(self) -> None:
+        self.calls: list[tuple[date, str | None]] = []
+
+    async def today(self, target_date: date, *, league: str | None = None):
+        self.calls.append((target_date, league))
+        await asyncio.sleep(0)
+        if league == "empty":
+            return []
+        return [SimpleNamespace(home=f"{league or 'all'}-H", away="A", confidence=0.6)]
+
+
+class _Sender:
+    def __init__(
+        self,
+        *,
+        fail_for: int | None = None,
+        retry_for: int | None = None,
+        blocked_for: int | None = None,
+    ) -> None:
+        self.sent: dict[int, str] = {}
+        self.calls: list[int] = []
+        self.active = 0
+        self.peak = 0
+        self.fail_for = fail_for
+        self.retry_for = retry_for
+        self.blocked_for = blocked_for
+
+    async def __call__(self, bot, chat_id, text, **kwargs):
+        self.calls.append(chat_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if chat_id == self.retry_for:
+                self.retry_for = None
+                raise TelegramRetryAfter(method=None, message="flood", retry_after=0)
+            if chat_id == self.fail_for:
+                raise RuntimeError("network down")
+            if chat_id == self.blocked_for:
+                raise TelegramForbiddenError(method=None, message="bot was blocked by the user")
+            self.sent[chat_id] = text
+        finally:
+            self.active -= 1
+
+
+def _sub(user_id: int, send_at: str, tz: str = "UTC", league: str | None = None) -> dict:
+    return {"user_id": user_id, "send_at": send_at, "tz": tz, "league": league}
+
+
+@pytest.mark.asyncio
+async def test_digest_renders_each_group_once_and_bounds_sends(tmp_path) -> None:
+    source = _Source()
+    sender = _Sender(fail_for=7, retry_for=3)
+    dispatcher = DigestDispatcher(
+        object(),
+        source=source,
+        send_text=sender,
+        concurrency=2,
+        db_path=str(tmp_path / "digest.sqlite3"),
+    )
+    now = datetime(2026, 10, 16, 21, 30, tzinfo=UTC)
+    subscriptions = [
+        _sub(1, "21:30", league="EPL"),
+        _sub(2, "21:30", league="epl"),
+        _sub(3, "21:30"),
+        _sub(4, "00:30", tz="Europe/Moscow"),  # next local day, all leagues
+        _sub(5, "22:00"),  # not due yet
+        _sub(6, "21:30", league="empty"),
+        _sub(7, "21:30"),
+    ]
+
+    report = await dispatcher.dispatch(now, subscriptions=subscriptions)
+
+    assert sorted(source.calls, key=str) == sorted(
+        [(date(2026, 10, 16), "epl"), (date(2026, 10, 16), None),
+         (date(2026, 10, 17), None), (date(2026, 10, 16), "empty")],
+        key=str,
+    )
+    assert report.due == 6
+    assert report.rendered == 3
+    assert report.sent == 4
+    assert report.failed == 1 and report.failed_chats == [7]
+    assert report.skipped == 1
+    assert sender.peak <= 2
+    assert sender.sent[1] is sender.sent[2]
+    assert "2026-10-17" in sender.sent[4]
+    assert "epl-H" in sender.sent[1]
+
+
+@pytest.mark.asyncio
+async def test_digest_sends_late_after_missed_tick_and_only_once_per_day(tmp_path) -> None:
+    db_path = str(tmp_path / "digest.sqlite3")
+    storage.upsert_subscription(1, send_at="21:30", tz="UTC", db_path=db_path)
+    storage.upsert_subscription(2, send_at="21:30", tz="UTC", db_path=db_path)
+    sender = _Sender(fail_for=2)
+    dispatcher = DigestDispatcher(object(), source=_Source(), send_text=sender, db_path=db_path)
+
+    # The 21:30 tick was missed: the next tick still delivers.
+    report = await dispatcher.dispatch(datetime(2026, 10, 16, 21, 31, tzinfo=UTC))
+    assert (report.sent, report.failed) == (1, 1)
+
+    # Later ticks the same day only retry the failed delivery, after its backoff.
+    sender.fail_for = None
+    report = await dispatcher.dispatch(datetime(2026, 10, 16, 21, 32, tzinfo=UTC))
+    assert report.due == 0
+    report = await dispatcher.dispatch(datetime(2026, 10, 16, 21, 36, tzinfo=UTC))
+    assert (report.due, report.sent) == (1, 1)
+    report = await dispatcher.dispatch(datetime(2026, 10, 16, 23, 0, tzinfo=UTC))
+    assert report.due == 0
+
+    report = await dispatcher.dispatch(datetime(2026, 10, 17, 21, 30, tzinfo=UTC))
+    assert report.sent == 2
+    rows = storage.list_subscriptions(db_path=db_path)
+    last = {row["user_id"]: row["last_digest_date"] for row in rows}
+    assert last == {1: "2026-10-17", 2: "2026-10-17"}
+
+
+@pytest.mark.asyncio
+async def test_digest_records_empty_and_failed_outcomes(tmp_path) -> None:
+    db_path = str(tmp_path / "digest.sqlite3")
+    storage.upsert_subscription(1, send_at="09:00", tz="UTC", league="empty", db_path=db_path)
+    storage.upsert_subscription(2, send_at="09:00", tz="UTC", db_path=db_path)
+    storage.upsert_subscription(3, send_at="09:00", tz="UTC", db_path=db_path)
+    source = _Source()
+    sender = _Sender(fail_for=2, blocked_for=3)
+    dispatcher = DigestDispatcher(object(), source=source, send_text=sender, db_path=db_path)
+
+    start = datetime(2026, 10, 16, 9, 0, tzinfo=UTC)
+    report = await dispatcher.dispatch(start)
+    assert (report.due, report.sent, report.failed, report.skipped) == (3, 0, 2, 1)
+    calls = (len(source.calls), len(sender.calls))
+
+    # The next tick renders nothing and sends nothing.
+    report = await dispatcher.dispatch(datetime(2026, 10, 16, 9, 1, tzinfo=UTC))
+    assert report.due == 0
+    assert (len(source.calls), len(sender.calls)) == calls
+
+    # The transient failure is retried with growing backoff, then given up.
+    retries = 0
+    minute = start
+    while minute < datetime(2026, 10, 16, 23, 59, tzinfo=UTC):
+        minute += timedelta(minutes=1)
+        report = await dispatcher.dispatch(minute)
+        retries += report.due
+    assert sender.calls.count(2) == 5
+    assert retries == 4
+    assert sender.calls.count(3) == 1
+    rows = {row["user_id"]: row for row in storage.list_subscriptions(db_path=db_path)}
+    assert {user: row["last_digest_status"] for user, row in rows.items()} == {
+        1: "empty",
+        2: "failed",
+        3: "blocked",
+    }
@@ -30,3 +30,24 @@ def test_delete_subscription_removes_row(tmp_path) -> None:
     storage.upsert_subscription(321, send_at="08:00", tz="UTC", league=None, db_path=str(db_path))
     storage.delete_subscription(321, db_path=str(db_path))
     assert storage.list_subscriptions(db_path=str(db_path)) == []
+
+
+def test_schema_applied_once_and_connection_reused(tmp_path, monkeypatch) -> None:
+    db_path = str(tmp_path / "pooled.sqlite3")
+    calls: list[str] = []
+    original = storage._schema_is_current
+
+    def _tracking(conn, version, objects):
+        calls.append(db_path)
+        return original(conn, version, objects)
+
+    monkeypatch.setattr(storage, "_schema_is_current", _tracking)
+    storage.upsert_user_preferences(1, tz="UTC", db_path=db_path)
+    storage.upsert_subscription(1, send_at="10:00", tz="UTC", db_path=db_path)
+    storage.list_subscriptions(db_path=db_path)
+    assert calls == [db_path]
+    assert storage._connect(db_path) is storage._connect(db_path)
+
+    storage.close_connections()
+    assert storage.list_subscriptions(db_path=db_path)[0]["send_at"] == "10:00"
+    assert len(calls) == 2
@@ -0,0 +1,75 @@
+"""
+/**
+ * @file: tests/bot/test_value_alerts.py
+ * @description: Value alert dispatcher scans once per league and applies batched hygiene.
+ * @dependencies: asyncio, app.bot.alerts, app.bot.storage, app.value_alerts
+ * @created: 2026-10-16
+ */
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, date, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.bot import storage
+from app.bot.alerts import ValueAlertDispatcher
+from app.value_alerts import AlertHygiene
+from config import settings
+
+NOW = datetime(2026, 10, 16, 12, 0, tzinfo=UTC)
+
+
+class _Source:
+    def __init__(self) -> None:
+        self.calls: list[tuple[date, str | None]] = []
+
+    async def value_picks(self, *, target_date: date, league: str | None):
+        self.calls.append((target_date, league))
+        pick = SimpleNamespace(
+            match_key=f"{league or 'all'}-m1",
+            market="1X2",
+            selection="HOME",
+            edge_pct=6.0,
+            pulled_at=NOW - timedelta(minutes=5),
+            kickoff_utc=NOW + timedelta(hours=3),
+        )
+        return [{"match": {"home": "H", "away": "A"}, "pick": pick}]
+
+
+@pytest.mark.asyncio
+async def test_value_alerts_fan_out_once_per_league_and_respect_cooldown(
+    monkeypatch, tmp_path
+) -> None:
+    monkeypatch.setattr(settings, "DB_PATH", str(tmp_path / "alerts.sqlite3"))
+    storage.upsert_value_alert(1, enabled=True, edge_threshold=5.0)
+    storage.upsert_value_alert(2, enabled=True, edge_threshold=5.0)
+    storage.upsert_value_alert(3, enabled=True, edge_threshold=7.5)
+    storage.upsert_value_alert(4, enabled=True, edge_threshold=5.0, league="EPL")
+    storage.upsert_value_alert(5, enabled=False, edge_threshold=1.0)
+
+    source = _Source()
+    sent: dict[int, str] = {}
+
+    async def _send(bot, chat_id, text, **kwargs):
+        sent[chat_id] = text
+
+    hygiene = AlertHygiene(cooldown_minutes=60, min_edge_delta=0.5, staleness_fail_minutes=30)
+    monkeypatch.setattr(
+        "app.bot.alerts.format_value_picks",
+        lambda *, title, cards: ",".join(card["pick"].match_key for card in cards),
+    )
+    dispatcher = ValueAlertDispatcher(object(), source=source, hygiene=hygiene, send_text=_send)
+
+    report = await dispatcher.dispatch(NOW)
+
+    assert sorted(source.calls, key=str) == [(NOW.date(), "EPL"), (NOW.date(), None)]
+    assert sent == {1: "all-m1", 2: "all-m1", 4: "EPL-m1"}
+    assert (report.candidates, report.sent, report.failed) == (3, 3, 0)
+
+    sent.clear()
+    report = await dispatcher.dispatch(NOW + timedelta(minutes=10))
+    assert sent == {}
+    assert report.suppressed == {"cooldown": 3}
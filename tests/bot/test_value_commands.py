@@ -67,6 +67,7 @@ async def test_handle_value_renders_picks(monkeypatch: pytest.MonkeyPatch) -> No
         async def value_picks(self, *, target_date, league):  # noqa: D401
             return cards
 
+    monkeypatch.setattr(commands, "_VALUE_STACK", None)
     monkeypatch.setattr(commands, "_create_value_service", lambda: (FakeService(), FakeProvider()))
     monkeypatch.setattr(
         commands,
@@ -102,6 +103,7 @@ async def test_handle_compare_outputs_table(monkeypatch: pytest.MonkeyPatch) ->
                 },
             }
 
+    monkeypatch.setattr(commands, "_VALUE_STACK", None)
     monkeypatch.setattr(commands, "_create_value_service", lambda: (FakeService(), FakeProvider()))
     monkeypatch.setattr(
         commands,
@@ -141,3 +143,28 @@ async def test_handle_alerts_updates_preferences(monkeypatch: pytest.MonkeyPatch
     assert message.responses
     assert "6.5%" in message.responses[0]
     assert "EPL" in message.responses[0]
+
+
+@pytest.mark.asyncio
+async def test_value_service_is_shared_until_closed(monkeypatch: pytest.MonkeyPatch) -> None:
+    _ensure_commands_enabled()
+    built: list[object] = []
+    closed: list[object] = []
+
+    class ClosingProvider:
+        async def close(self) -> None:
+            closed.append(self)
+
+    def _factory():
+        built.append(object())
+        return SimpleNamespace(marker=len(built)), ClosingProvider()
+
+    monkeypatch.setattr(commands, "_VALUE_STACK", None)
+    monkeypatch.setattr(commands, "_create_value_service", _factory)
+    first = commands.get_value_service()
+    assert commands.get_value_service() is first
+    assert len(built) == 1
+    await commands.close_value_service()
+    assert len(closed) == 1
+    assert commands.get_value_service() is not first
+    assert len(built) == 2
@@ -0,0 +1,48 @@
+"""
+@file: test_analytic_markets.py
+@description: Closed-form market engine agrees with Monte-Carlo and is normalised.
+@dependencies: numpy
+@created: 2026-10-16
+"""
+import pytest
+
+from ml.montecarlo_simulator import simulate, simulate_analytic
+from ml.sim.analytic import analytic_markets
+from services.simulator import AnalyticSimulator, Simulator, simulate_markets
+
+
+@pytest.mark.needs_np
+def test_analytic_matches_monte_carlo():
+    exact = analytic_markets(1.5, 1.1, 0.2)
+    sampled = Simulator().run(1.5, 1.1, 0.2, n_sims=200000)
+
+    for key in ("1", "x", "2"):
+        assert exact["1x2"][key] == pytest.approx(sampled["1x2"][key], abs=0.01)
+    for thr, vals in exact["totals"].items():
+        assert vals["over"] == pytest.approx(sampled["totals"][thr]["over"], abs=0.01)
+    assert exact["btts"]["yes"] == pytest.approx(sampled["btts"]["yes"], abs=0.01)
+    assert exact["cs"]["1:1"] == pytest.approx(sampled["cs"]["1:1"], abs=0.01)
+
+
+@pytest.mark.needs_np
+def test_analytic_markets_normalised():
+    markets = simulate_markets(1.3, 0.9, 0.1, engine="analytic")
+    assert sum(markets["1x2"].values()) == pytest.approx(1.0, 1e-9)
+    assert sum(markets["cs"].values()) == pytest.approx(1.0, 1e-9)
+    for vals in markets["totals"].values():
+        assert vals["over"] + vals["under"] == pytest.approx(1.0, 1e-9)
+    assert set(markets) == {"1x2", "btts", "totals", "cs", "entropy"}
+
+    batch = AnalyticSimulator().run_batch([1.3, 2.0], [0.9, 0.6], 0.1)
+    assert batch[0] == markets
+    with pytest.raises(ValueError):
+        simulate_markets(1.3, 0.9, 0.1, engine="unknown")
+
+
+@pytest.mark.needs_np
+def test_simulate_analytic_matches_sampled_result():
+    exact = simulate_analytic(1.4, 1.0)
+    sampled = simulate(100000, 1.4, 1.0, seed=3)
+    assert exact.home_win == pytest.approx(sampled.home_win, abs=0.01)
+    assert exact.over_2_5 == pytest.approx(sampled.over_2_5, abs=0.01)
+    assert exact.top_scorelines[0][1] == pytest.approx(sampled.top_scorelines[0][1], abs=0.01)
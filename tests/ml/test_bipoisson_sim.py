@@ -7,7 +7,7 @@
 import numpy as np
 import pytest
 
-from ml.sim.bivariate_poisson import simulate_bipoisson
+from ml.sim.bivariate_poisson import simulate_bipoisson, simulate_bipoisson_batch
 from services.simulator import Simulator
 
 
@@ -34,3 +34,62 @@ def test_market_normalization():
 
     cs_total = sum(result["cs"].values())
     assert cs_total == pytest.approx(1.0, 1e-6)
+
+
+@pytest.mark.needs_np
+def test_batch_matches_single_fixture_markets():
+    lam_h = np.array([1.4, 0.9, 2.1])
+    lam_a = np.array([1.1, 1.3, 0.7])
+    sim = Simulator()
+    batch = sim.run_batch(lam_h, lam_a, rho=0.1, n_sims=40000, seed=7)
+
+    assert len(batch) == 3
+    for idx, markets in enumerate(batch):
+        single = sim.run(float(lam_h[idx]), float(lam_a[idx]), rho=0.1, n_sims=40000)
+        for key in ("1", "x", "2"):
+            assert markets["1x2"][key] == pytest.approx(single["1x2"][key], abs=0.02)
+        for thr, vals in markets["totals"].items():
+            assert vals["over"] == pytest.approx(single["totals"][thr]["over"], abs=0.02)
+            assert vals["over"] + vals["under"] == pytest.approx(1.0, 1e-9)
+        assert sum(markets["cs"].values()) == pytest.approx(1.0, 1e-9)
+        assert set(markets["cs"]) == set(single["cs"])
+
+
+@pytest.mark.needs_np
+def test_batch_shapes_and_validation():
+    home, away = simulate_bipoisson_batch([1.2, 1.5], [0.8, 1.0], [0.0, 0.5], n_sims=100)
+    assert home.shape == away.shape == (2, 100)
+    with pytest.raises(ValueError):
+        simulate_bipoisson_batch([1.2, -1.0], [0.8, 1.0], 0.1)
+
+
+@pytest.mark.needs_np
+def test_batch_respects_sim_chunk(monkeypatch):
+    from ml.sim.bivariate_poisson import iter_bipoisson_blocks
+
+    monkeypatch.setenv("SIM_CHUNK", "250")
+    blocks = list(iter_bipoisson_blocks([1.2, 1.5, 0.9, 1.1, 1.3], [0.8] * 5, 0.1, n_sims=100))
+    assert [block.stop - block.start for block, _, _ in blocks] == [2, 2, 1]
+    assert all(home.size <= 250 for _, home, _ in blocks)
+    home, away = simulate_bipoisson_batch([1.2, 1.5, 0.9, 1.1, 1.3], [0.8] * 5, 0.1, n_sims=100)
+    assert home.shape == away.shape == (5, 100)
+    assert np.array_equal(home, np.concatenate([h for _, h, _ in blocks]))
+
+
+@pytest.mark.needs_np
+def test_batch_fixture_draws_do_not_depend_on_the_slate(monkeypatch):
+    monkeypatch.setenv("SIM_CHUNK", "150")
+    home, away = simulate_bipoisson_batch([1.4, 0.9], [1.1, 1.3], 0.2, n_sims=100, seed=5)
+    wider_home, wider_away = simulate_bipoisson_batch(
+        [2.0, 1.4, 0.9], [0.6, 1.1, 1.3], 0.2, n_sims=100, seed=5
+    )
+    assert np.array_equal(home, wider_home[1:])
+    assert np.array_equal(away, wider_away[1:])
+    single_home, single_away = simulate_bipoisson(0.9, 1.3, 0.2, n_sims=100, seed=5)
+    assert np.array_equal(home[1], single_home)
+    assert np.array_equal(away[1], single_away)
+
+    sim = Simulator()
+    first = sim.run_batch([1.4, 0.9], [1.1, 1.3], 0.2, n_sims=1000)
+    second = sim.run_batch([2.0, 1.4, 0.9], [0.6, 1.1, 1.3], 0.2, n_sims=1000)
+    assert first == second[1:]
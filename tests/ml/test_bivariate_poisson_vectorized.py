@@ -0,0 +1,73 @@
+"""
+@file: test_bivariate_poisson_vectorized.py
+@description: Vectorised bivariate Poisson pmf, gradients and score matrices.
+@dependencies: numpy, scipy
+@created: 2026-10-16
+"""
+import math
+
+import numpy as np
+import pytest
+
+from ml.models.bivariate_poisson import (
+    BivariatePoisson,
+    bivariate_log_pmf,
+    bivariate_log_pmf_grad,
+    bivariate_prob_matrices,
+    score_matrix,
+)
+
+
+def _reference_prob(x: int, y: int, lam1: float, lam2: float, rho: float) -> float:
+    a, b = lam1 - rho, lam2 - rho
+    total = 0.0
+    for k in range(min(x, y) + 1):
+        total += (
+            a ** (x - k)
+            / math.factorial(x - k)
+            * b ** (y - k)
+            / math.factorial(y - k)
+            * rho**k
+            / math.factorial(k)
+        )
+    return math.exp(-(a + b + rho)) * total
+
+
+@pytest.mark.needs_np
+@pytest.mark.parametrize("rho", [0.0, 0.25])
+def test_prob_matrix_matches_reference(rho):
+    model = BivariatePoisson(1.6, 1.1, rho)
+    matrix = model.prob_matrix(8)
+    expected = np.array(
+        [[_reference_prob(i, j, 1.6, 1.1, rho) for j in range(9)] for i in range(9)]
+    )
+    np.testing.assert_allclose(matrix, expected, rtol=1e-10, atol=1e-15)
+    assert model.prob(3, 2) == pytest.approx(expected[3, 2])
+
+
+@pytest.mark.needs_np
+def test_batched_matrices_and_gradients():
+    lam1 = np.array([1.2, 1.8, 0.9])
+    lam2 = np.array([1.0, 0.7, 1.4])
+    rho = np.array([0.1, 0.0, 0.3])
+    stacked = bivariate_prob_matrices(lam1, lam2, rho, max_goals=6)
+    assert stacked.shape == (3, 7, 7)
+    for idx in range(3):
+        single = BivariatePoisson(lam1[idx], lam2[idx], rho[idx]).prob_matrix(6)
+        np.testing.assert_allclose(stacked[idx], single)
+
+    x = np.array([0, 2, 3])
+    y = np.array([1, 2, 0])
+    log_p, d_l1, d_l2, d_rho = bivariate_log_pmf_grad(x, y, lam1, lam2, rho + 0.05)
+    eps = 1e-6
+    for grad, shift in ((d_l1, (eps, 0, 0)), (d_l2, (0, eps, 0)), (d_rho, (0, 0, eps))):
+        bumped = bivariate_log_pmf(x, y, lam1 + shift[0], lam2 + shift[1], rho + 0.05 + shift[2])
+        np.testing.assert_allclose((bumped - log_p) / eps, grad, atol=1e-4)
+
+
+@pytest.mark.needs_np
+def test_score_matrix_accepts_many_matches():
+    stacked = score_matrix(np.array([1.3, 0.8]), np.array([0.9, 1.6]), 0.1, max_goals=6)
+    assert stacked.shape == (2, 7, 7)
+    np.testing.assert_allclose(stacked.sum(axis=(1, 2)), 1.0)
+    np.testing.assert_allclose(stacked[0], score_matrix(1.3, 0.9, 0.1, max_goals=6))
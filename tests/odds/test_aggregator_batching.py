@@ -0,0 +1,82 @@
+"""
+/**
+ * @file: tests/odds/test_aggregator_batching.py
+ * @description: LinesAggregator loads history in bulk and flushes reliability once per pass.
+ * @dependencies: datetime, app.lines.aggregator, app.lines.reliability, app.lines.storage
+ * @created: 2026-10-16
+ */
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, timedelta
+
+from app.lines.aggregator import LinesAggregator
+from app.lines.providers.base import OddsSnapshot
+from app.lines.reliability import ProviderReliabilityStore, ProviderReliabilityTracker
+from app.lines.storage import OddsSQLiteStore
+
+
+def _snapshot(
+    provider: str, match_key: str, selection: str, price: float, minutes: int
+) -> OddsSnapshot:
+    kickoff = datetime(2025, 10, 10, 18, 0, tzinfo=UTC)
+    return OddsSnapshot(
+        provider=provider,
+        pulled_at=kickoff - timedelta(minutes=minutes),
+        match_key=match_key,
+        league="EPL",
+        kickoff_utc=kickoff,
+        market="1X2",
+        selection=selection,
+        price_decimal=price,
+        extra=None,
+    )
+
+
+def _slate() -> list[OddsSnapshot]:
+    rows: list[OddsSnapshot] = []
+    for match in ("m-1", "m-2", "m-3"):
+        for selection in ("HOME", "DRAW", "AWAY"):
+            for minutes, bump in ((90, 0.0), (30, 0.05)):
+                rows.append(_snapshot("csv", match, selection, 2.0 + bump, minutes))
+                rows.append(_snapshot("http", match, selection, 2.1 + bump, minutes))
+    return rows
+
+
+def test_history_many_matches_single_key_history(tmp_path) -> None:
+    store = OddsSQLiteStore(db_path=str(tmp_path / "odds.sqlite3"))
+    store.upsert_many(_slate())
+    keys = [("m-1", "1X2", "HOME"), ("m-3", "1X2", "AWAY"), ("missing", "1X2", "HOME")]
+    bulk = store.history_many(keys, limit=3)
+    for match_key, market, selection in keys:
+        single = store.history(match_key=match_key, market=market, selection=selection, limit=3)
+        assert bulk[(match_key, market, selection)] == single
+    assert bulk[("missing", "1X2", "HOME")] == []
+
+
+def test_aggregate_batches_history_and_reliability(tmp_path, monkeypatch) -> None:
+    store = OddsSQLiteStore(db_path=str(tmp_path / "odds.sqlite3"))
+    rel_store = ProviderReliabilityStore(db_path=str(tmp_path / "rel.sqlite3"))
+    tracker = ProviderReliabilityTracker(store=rel_store)
+    aggregator = LinesAggregator(store=store, reliability=tracker, known_providers=["csv", "http"])
+
+    def _fail_history(self, **_: object) -> None:
+        raise AssertionError("per-key history must not be used")
+
+    flushes: list[int] = []
+    original_upsert = rel_store.upsert_many
+
+    def _count_upsert(stats) -> None:
+        items = list(stats)
+        flushes.append(len(items))
+        original_upsert(items)
+
+    monkeypatch.setattr(OddsSQLiteStore, "history", _fail_history)
+    monkeypatch.setattr(rel_store, "upsert_many", _count_upsert)
+
+    consensus = aggregator.aggregate(_slate())
+
+    assert len(consensus) == 9
+    assert flushes == [2]
+    assert {item.provider for item in rel_store.load_all().values()} == {"csv", "http"}
@@ -0,0 +1,114 @@
+"""
+/**
+ * @file: tests/odds/test_aggregator_fanout.py
+ * @description: Concurrent provider fan-out with per-provider deadlines.
+ * @dependencies: asyncio, datetime, app.lines.aggregator, app.value_service
+ * @created: 2026-10-16
+ */
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.lines.aggregator import AggregatingLinesProvider, LinesAggregator
+from app.lines.providers.base import OddsSnapshot
+from app.value_service import ValueService
+
+KICKOFF = datetime(2025, 10, 10, 18, 0, tzinfo=UTC)
+
+
+class _FakeProvider:
+    def __init__(self, price: float, *, delay: float = 0.0, error: Exception | None = None):
+        self.price = price
+        self.delay = delay
+        self.error = error
+
+    async def fetch_odds(self, *, date_from, date_to, leagues=None) -> list[OddsSnapshot]:
+        await asyncio.sleep(self.delay)
+        if self.error:
+            raise self.error
+        return [
+            OddsSnapshot(
+                provider="upstream",
+                pulled_at=KICKOFF - timedelta(minutes=30),
+                match_key="m-1",
+                league="EPL",
+                kickoff_utc=KICKOFF,
+                market="1X2",
+                selection="HOME",
+                price_decimal=self.price,
+                extra=None,
+            )
+        ]
+
+
+async def test_fetch_odds_runs_providers_concurrently_and_reports_missing() -> None:
+    providers = {
+        "a": _FakeProvider(2.0, delay=0.1),
+        "b": _FakeProvider(2.2, delay=0.1),
+        "slow": _FakeProvider(3.0, delay=5.0),
+        "broken": _FakeProvider(2.5, error=RuntimeError("boom")),
+    }
+    feed = AggregatingLinesProvider(providers, aggregator=LinesAggregator(), deadline_sec=0.3)
+
+    started = time.perf_counter()
+    rows = await feed.fetch_odds(date_from=KICKOFF, date_to=KICKOFF)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 0.3 + 0.15
+    assert len(rows) == 1
+    consensus = rows[0].extra["consensus"]
+    assert {item["name"] for item in consensus["providers"]} == {"a", "b"}
+    assert consensus["missing_providers"] == ["slow", "broken"]
+    meta = feed.aggregator.last_metadata[("m-1", "1X2", "HOME")]
+    assert meta.missing_providers == ("slow", "broken")
+    assert feed.last_missing_providers == ("slow", "broken")
+
+
+async def test_fetch_odds_raises_when_every_provider_fails() -> None:
+    providers = {"x": _FakeProvider(2.0, error=RuntimeError("down"))}
+    feed = AggregatingLinesProvider(providers, aggregator=LinesAggregator(), deadline_sec=1.0)
+    with pytest.raises(RuntimeError, match="down"):
+        await feed.fetch_odds(date_from=KICKOFF, date_to=KICKOFF)
+
+
+async def test_value_card_consensus_reports_timed_out_provider() -> None:
+    from app.bot.routers.commands import _consensus_from_payload
+
+    providers = {"a": _FakeProvider(2.0), "slow": _FakeProvider(3.0, delay=5.0)}
+    feed = AggregatingLinesProvider(providers, aggregator=LinesAggregator(), deadline_sec=0.2)
+    prediction = SimpleNamespace(
+        home="Home",
+        away="Away",
+        league="EPL",
+        kickoff=KICKOFF,
+        confidence=0.8,
+        markets={"1x2": {"home": 0.6}},
+        totals={},
+        btts={},
+    )
+    pick = SimpleNamespace(match_key="m-1", market="1X2", selection="HOME", league="EPL")
+
+    async def _today(target_date, league=None):
+        return [prediction]
+
+    service = ValueService(
+        facade=SimpleNamespace(today=_today),
+        provider=feed,
+        detector=SimpleNamespace(
+            detect=lambda model, market: [pick], overround_method="proportional"
+        ),
+    )
+
+    cards = await service.value_picks(target_date=KICKOFF.date(), league="EPL")
+
+    assert cards[0]["consensus"]["missing_providers"] == ["slow"]
+    meta = _consensus_from_payload(cards[0]["consensus"])
+    assert meta is not None
+    assert meta.missing_providers == ("slow",)
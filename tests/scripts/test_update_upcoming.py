@@ -0,0 +1,148 @@
+"""
+@file: tests/scripts/test_update_upcoming.py
+@description: Staged upcoming refresh keeps slate order, skips failed cards and their odds,
+    writes fixtures first.
+@dependencies: asyncio, scripts.update_upcoming
+@created: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+
+class _Client:
+    closed = False
+
+    async def close(self) -> None:
+        _Client.closed = True
+
+
+class _Endpoints:
+    slate = (3, 1, 2)
+
+    def __init__(self, client: Any) -> None:
+        self.client = client
+
+    async def fixtures_between(self, start: str, end: str) -> list[Any]:
+        return [SimpleNamespace(id=fixture_id) for fixture_id in self.slate]
+
+    async def expected_lineups(self, fixture_ids: list[int]) -> dict[int, Any]:
+        return {}
+
+    async def fixture_card(self, fixture_id: int) -> Any:
+        # Later fixtures answer first, so ordering cannot come from completion order.
+        await asyncio.sleep(0.001 * fixture_id)
+        if fixture_id == 1:
+            raise RuntimeError("card unavailable")
+        return SimpleNamespace(
+            id=fixture_id,
+            home_team_id=fixture_id * 10,
+            away_team_id=fixture_id * 10 + 1,
+            lineups=[],
+            xg_fixture=[],
+            statistics={},
+            model_dump=lambda mode: {"id": fixture_id},
+        )
+
+    async def odds_for_fixture(self, fixture_id: int, *, inplay: bool) -> list[str]:
+        return [f"{fixture_id}-{'live' if inplay else 'pre'}"]
+
+
+class _Repository:
+    def __init__(self) -> None:
+        self.events: list[tuple[str, Any]] = []
+
+    async def upsert_fixtures(self, fixtures: list[Any]) -> None:
+        await asyncio.sleep(0.01)
+        self.events.append(("fixtures", [card.id for card in fixtures]))
+
+    async def store_predictions(self, records: list[Any]) -> None:
+        self.events.append(("predictions", [(r.fixture.id, r.markets) for r in records]))
+
+    async def store_odds(self, quotes: Any) -> None:
+        self.events.append(("odds", sorted(quotes)))
+
+
+@pytest.fixture
+def update_upcoming(monkeypatch):
+    # The real cache and repository need asyncpg/greenlet; the pipeline only
+    # calls a handful of their coroutines, which the test replaces anyway.
+    monkeypatch.setitem(
+        sys.modules,
+        "database.cache_postgres",
+        SimpleNamespace(cache=None, set_with_ttl=None, versioned_key=None),
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "sportmonks.repository",
+        SimpleNamespace(PredictionRecord=SimpleNamespace, sportmonks_repository=None),
+    )
+    names = ("scripts.update_upcoming", "sportmonks", "sportmonks.cache", "sportmonks.endpoints")
+    for name in names:
+        if name in sys.modules:
+            monkeypatch.delitem(sys.modules, name)
+    module = importlib.import_module("scripts.update_upcoming")
+    yield module
+    for name in names:
+        sys.modules.pop(name, None)
+
+
+def test_refresh_upcoming_keeps_order_and_skips_failed_cards(update_upcoming, monkeypatch):
+    module = update_upcoming
+    repository = _Repository()
+    cached: list[Any] = []
+
+    async def _set_many(namespace: str, entries: list[Any], *tags: str) -> None:
+        cached.extend(key for key, _ in entries)
+
+    monkeypatch.setattr(module, "SportMonksClient", _Client)
+    monkeypatch.setattr(module, "SportMonksEndpoints", _Endpoints)
+    monkeypatch.setattr(module, "sportmonks_repository", repository)
+    monkeypatch.setattr(module, "sportmonks_cache", SimpleNamespace(set_many=_set_many))
+    monkeypatch.setattr(
+        module,
+        "get_settings",
+        lambda: SimpleNamespace(
+            SPORTMONKS_DEFAULT_TIMEWINDOW_DAYS=3,
+            SIM_RHO=0.0,
+            SIM_N=100,
+            SIM_ENGINE="mc",
+            MODEL_VERSION="v-test",
+            MODEL_VERSION_FORMAT="",
+        ),
+    )
+    monkeypatch.setattr(
+        module,
+        "feature_builder",
+        SimpleNamespace(
+            build=lambda card, **_: SimpleNamespace(
+                lambda_home=float(card.id),
+                lambda_away=1.0,
+                degraded=False,
+                adjustments={},
+                snapshot={},
+            )
+        ),
+    )
+    monkeypatch.setattr(
+        module,
+        "simulate_markets_batch",
+        lambda homes, aways, rho, n, engine: [{"lambda_home": value} for value in homes],
+    )
+
+    asyncio.run(module.refresh_upcoming(3, concurrency=2))
+
+    assert [name for name, _ in repository.events][0] == "fixtures"
+    events = dict(repository.events)
+    assert events["fixtures"] == [3, 2]
+    assert events["predictions"] == [(3, {"lambda_home": 3.0}), (2, {"lambda_home": 2.0})]
+    assert events["odds"] == ["2-live", "2-pre", "3-live", "3-pre"]
+    assert cached == [(3,), (2,)]
+    assert _Client.closed
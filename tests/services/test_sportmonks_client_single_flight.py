@@ -0,0 +1,127 @@
+"""
+@file: tests/services/test_sportmonks_client_single_flight.py
+@description: Single-flight coalescing of concurrent cache misses in the ``cached`` decorator.
+@dependencies: services.sportmonks_client
+@created: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+
+class _Cache:
+    def __init__(self) -> None:
+        self.stored: dict[str, object] = {}
+
+    async def get(self, key: str) -> object | None:
+        return self.stored.get(key)
+
+    async def set(self, key: str, value: object, ttl: int | None = None) -> None:
+        self.stored[key] = value
+
+
+@pytest.fixture
+def client_module(monkeypatch):
+    # The real cache backend needs asyncpg/greenlet; the decorator only uses get/set.
+    cache = _Cache()
+    monkeypatch.setitem(
+        sys.modules,
+        "database.cache_postgres",
+        SimpleNamespace(cache=cache, set_with_ttl=None, versioned_key=None),
+    )
+    previous = sys.modules.pop("services.sportmonks_client", None)
+    module = importlib.import_module("services.sportmonks_client")
+    try:
+        yield module, cache
+    finally:
+        sys.modules.pop("services.sportmonks_client", None)
+        if previous is not None:
+            sys.modules["services.sportmonks_client"] = previous
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_call(client_module) -> None:
+    module, cache = client_module
+    calls: list[int] = []
+
+    @module.cached(ttl=60)
+    async def fetch(fixture_id: int) -> dict[str, int]:
+        calls.append(fixture_id)
+        await asyncio.sleep(0.01)
+        return {"id": fixture_id}
+
+    results = await asyncio.gather(*(fetch(7) for _ in range(5)))
+
+    assert calls == [7]
+    assert results == [{"id": 7}] * 5
+    assert list(cache.stored.values()) == [{"id": 7}]
+    assert module._single_flight._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_error_is_shared_with_waiters_and_key_released(client_module) -> None:
+    module, _cache = client_module
+    calls = 0
+
+    @module.cached(ttl=60)
+    async def fetch(fixture_id: int) -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        raise RuntimeError("api down")
+
+    results = await asyncio.gather(*(fetch(7) for _ in range(3)), return_exceptions=True)
+
+    assert calls == 1
+    assert all(isinstance(item, RuntimeError) for item in results)
+    assert module._single_flight._inflight == {}
+    with pytest.raises(RuntimeError):
+        await fetch(7)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_cancellation_keeps_waiters_and_releases_key(client_module) -> None:
+    module, _cache = client_module
+    release = asyncio.Event()
+    calls = 0
+
+    @module.cached(ttl=60)
+    async def fetch(fixture_id: int) -> dict[str, int]:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return {"id": fixture_id}
+
+    # Cancelling the caller that started the load does not fail the waiter.
+    leader = asyncio.create_task(fetch(7))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(fetch(7))
+    await asyncio.sleep(0)
+    leader.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    release.set()
+    assert await waiter == {"id": 7}
+    assert calls == 1
+    assert module._single_flight._inflight == {}
+
+    # A cancelled load frees its key, so the next miss starts a fresh call.
+    release.clear()
+    pending = asyncio.create_task(fetch(8))
+    await asyncio.sleep(0.01)
+    assert calls == 2
+    (load,) = module._single_flight._inflight.values()
+    load.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await pending
+    assert module._single_flight._inflight == {}
+    release.set()
+    assert await fetch(8) == {"id": 8}
+    assert calls == 3
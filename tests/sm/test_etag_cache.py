@@ -152,3 +152,59 @@ def test_etag_cache_touch_keeps_original_timestamp(tmp_path: Path) -> None:
     )
 
     assert cache.load("/injuries", {"from": "2025-01-01"}) is None
+
+
+@pytest.mark.asyncio
+async def test_etag_cache_revalidates_later_pages_after_first_page_304(tmp_path: Path) -> None:
+    repo = _prepare_meta_db(tmp_path / "sm.sqlite")
+    cache = SportmonksETagCache(repo, ttl_seconds=3600)
+
+    def _page(page: int, ids: list[int], has_more: bool) -> dict[str, object]:
+        return {
+            "data": [{"id": item} for item in ids],
+            "pagination": {"current_page": page, "has_more": has_more},
+        }
+
+    pages = {1: _page(1, [1, 2], True), 2: _page(2, [3], False)}
+    etags = {1: '"p1"', 2: '"p2-v1"'}
+    requests: list[tuple[int, str | None]] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        page = int(request.url.params.get("page", "1"))
+        sent = request.headers.get("If-None-Match")
+        requests.append((page, sent))
+        if page not in pages:
+            return httpx.Response(200, json=_page(page, [], False))
+        if sent == etags[page]:
+            return httpx.Response(304, headers={"ETag": etags[page]})
+        return httpx.Response(200, json=pages[page], headers={"ETag": etags[page]})
+
+    config = SportmonksClientConfig(
+        api_token="token",
+        base_url="https://example.test",
+        timeout=1.0,
+        retry_attempts=0,
+        backoff_base=0.0,
+        rps_limit=50.0,
+    )
+    client = SportmonksClient(config, transport=httpx.MockTransport(handler))
+    provider = SportmonksProvider(client, etag_cache=cache, page_concurrency=1)
+    try:
+        first = await provider._get_all("/teams", params={"include": "country"})
+        assert [item["id"] for item in first] == [1, 2, 3]
+
+        # Page 1 is unchanged, page 2 gained a record and now has a successor.
+        pages[2] = _page(2, [3, 4], True)
+        pages[3] = _page(3, [5], False)
+        etags[2] = '"p2-v2"'
+        etags[3] = '"p3"'
+        requests.clear()
+        second = await provider._get_all("/teams", params={"include": "country"})
+        assert [item["id"] for item in second] == [3, 4, 5]
+        assert requests == [(1, '"p1"'), (2, '"p2-v1"'), (3, None)]
+
+        requests.clear()
+        assert await provider._get_all("/teams", params={"include": "country"}) == []
+        assert requests == [(1, '"p1"'), (2, '"p2-v2"'), (3, '"p3"')]
+    finally:
+        await client.aclose()
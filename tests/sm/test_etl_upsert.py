@@ -131,3 +131,29 @@ def test_repository_upserts_without_duplicates(tmp_path: Path) -> None:
         assert count == 1
     repo.upsert_meta("last_sync_completed_at", pulled.isoformat())
     assert repo.last_sync_timestamp() is not None
+
+
+def test_unit_of_work_groups_upserts_on_one_connection(tmp_path: Path) -> None:
+    db_path = tmp_path / "sm.sqlite"
+    _setup_schema(db_path)
+    repo = SportmonksRepository(str(db_path))
+    pulled_at = datetime(2024, 5, 1, tzinfo=UTC)
+    team = TeamDTO(team_id=7, name="Seven", name_normalized="seven", country=None, payload={})
+
+    with pytest.raises(RuntimeError):
+        with repo.unit_of_work():
+            repo.upsert_teams([team], pulled_at=pulled_at)
+            repo.upsert_meta_many({"last_sync_mode": "incremental"})
+            raise RuntimeError("abort")
+    assert repo.get_meta("last_sync_mode") is None
+
+    with repo.unit_of_work():
+        repo.upsert_teams([team], pulled_at=pulled_at)
+        with repo.unit_of_work():
+            repo.upsert_meta("last_sync_mode", "backfill")
+        with sqlite3.connect(db_path) as other:
+            assert other.execute("SELECT COUNT(*) FROM sm_teams").fetchone()[0] == 0
+    assert repo.get_meta("last_sync_mode") == "backfill"
+    assert repo._connection() is repo._connection()
+    repo.close()
+    assert repo.get_meta("last_sync_mode") == "backfill"
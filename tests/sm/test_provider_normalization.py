@@ -70,3 +70,103 @@ async def test_provider_fetches_and_normalizes(tmp_path: Path) -> None:
         assert injuries and injuries[0].player_name == "John Doe"
     finally:
         await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_provider_follows_pagination_concurrently() -> None:
+    import asyncio
+
+    pages_requested: list[tuple[str, int]] = []
+    active = 0
+    peak = 0
+
+    def _team(team_id: int) -> dict:
+        return {"id": team_id, "name": f"Team {team_id}"}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        page = int(request.url.params.get("page", "1"))
+        pages_requested.append((request.url.path, page))
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.001 * (6 - page))
+        active -= 1
+        if request.url.path.endswith("/teams"):
+            meta = {"pagination": {"current_page": page, "total_pages": 5}}
+            return httpx.Response(200, json={"data": [_team(page * 10)], "meta": meta})
+        # Injuries only advertise has_more, like Sportmonks v3 responses.
+        payload = {
+            "data": [{"id": page, "player_name": f"Player {page}"}] if page <= 3 else [],
+            "pagination": {"current_page": page, "has_more": page < 3},
+        }
+        return httpx.Response(200, json=payload)
+
+    config = SportmonksClientConfig(
+        api_token="token",
+        base_url="https://example.test",
+        timeout=1.0,
+        retry_attempts=0,
+        backoff_base=0.0,
+        rps_limit=100.0,
+        page_concurrency=2,
+    )
+    client = SportmonksClient(config, transport=httpx.MockTransport(handler))
+    provider = SportmonksProvider(client)
+    try:
+        teams = await provider.fetch_teams("8")
+        assert [team.team_id for team in teams] == [10, 20, 30, 40, 50]
+        assert 1 < peak <= 2
+
+        injuries = await provider.fetch_injuries(
+            datetime(2024, 5, 1, tzinfo=UTC), datetime(2024, 5, 2, tzinfo=UTC)
+        )
+        assert [injury.injury_id for injury in injuries] == [1, 2, 3]
+        injury_pages = [page for path, page in pages_requested if path.endswith("/injuries")]
+        assert sorted(injury_pages) == [1, 2, 3]
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_request_slots_cap_pages_across_concurrent_fetches() -> None:
+    import asyncio
+
+    active = 0
+    peak = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal active, peak
+        page = int(request.url.params.get("page", "1"))
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.002)
+        active -= 1
+        meta = {"pagination": {"current_page": page, "total_pages": 4}}
+        return httpx.Response(200, json={"data": [{"id": page, "name": "T"}], "meta": meta})
+
+    config = SportmonksClientConfig(
+        api_token="token",
+        base_url="https://example.test",
+        timeout=1.0,
+        retry_attempts=0,
+        backoff_base=0.0,
+        rps_limit=1000.0,
+        page_concurrency=4,
+    )
+    client = SportmonksClient(config, transport=httpx.MockTransport(handler))
+    provider = SportmonksProvider(client, request_slots=asyncio.Semaphore(3))
+    try:
+        batches = await asyncio.gather(*(provider.fetch_teams(str(league)) for league in (1, 2)))
+        assert [len(batch) for batch in batches] == [4, 4]
+        assert 1 < peak <= 3
+    finally:
+        await client.aclose()
+
+
+def test_page_concurrency_reads_shared_setting(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("SPORTMONKS_API_TOKEN", "token")
+    monkeypatch.setenv("SPORTMONKS_PAGE_CONCURRENCY", "6")
+    config = SportmonksClientConfig.from_env()
+    assert config.page_concurrency == 6
+    provider = SportmonksProvider(SportmonksClient(config))
+    assert provider._page_concurrency == 6
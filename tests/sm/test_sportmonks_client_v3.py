@@ -141,3 +141,88 @@ async def test_fixture_card_parses_lineups_and_xg() -> None:
     assert fixture.lineups[0].xg == pytest.approx(0.52, rel=1)
     assert fixture.formations["1"] == "4-3-3"
     assert fixture.xg_fixture[0].value == 0.52
+
+
+class _PagedHTTPClient:
+    """Serve numbered pages with decreasing latency to shake out ordering bugs."""
+
+    def __init__(self, pages: dict[int, list[int]], *, total_key: str = "last_page"):
+        self._pages = pages
+        self._total_key = total_key
+        self.calls: list[dict[str, Any]] = []
+        self.active = 0
+        self.peak = 0
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> _FakeResponse:
+        import asyncio
+
+        params = kwargs.get("params") or {}
+        page = int(params.get("page", 1))
+        self.calls.append({"url": url, "page": page})
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.001 * (len(self._pages) - page + 1))
+        self.active -= 1
+        pagination = {"current_page": page, self._total_key: len(self._pages)}
+        return _FakeResponse(200, {"data": self._pages[page], "meta": {"pagination": pagination}})
+
+    async def aclose(self) -> None:  # pragma: no cover - compatibility stub
+        return None
+
+
+@pytest.mark.asyncio
+async def test_paginate_fetches_known_pages_concurrently_in_order() -> None:
+    client = SportMonksClient(
+        api_token="token", base_url="https://example.com", concurrency=10, page_concurrency=3
+    )
+    fake_http = _PagedHTTPClient({page: [page * 10, page * 10 + 1] for page in range(1, 7)})
+    client._client = fake_http  # type: ignore[assignment]
+    items = [item async for item in client.paginate("/fixtures", per_page=2)]
+    assert items == [value for page in range(1, 7) for value in (page * 10, page * 10 + 1)]
+    assert sorted(call["page"] for call in fake_http.calls) == [1, 2, 3, 4, 5, 6]
+    assert 1 < fake_http.peak <= 3
+
+    fake_http.calls.clear()
+    limited = [item async for item in client.paginate("/fixtures", per_page=2, limit=5)]
+    assert limited == [10, 11, 20, 21, 30]
+    assert sorted(call["page"] for call in fake_http.calls) == [1, 2, 3]
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_chunked_between_preserves_window_order() -> None:
+    client = SportMonksClient(
+        api_token="token", base_url="https://example.com", concurrency=10, page_concurrency=4
+    )
+
+    class _WindowHTTPClient:
+        def __init__(self) -> None:
+            self.urls: list[str] = []
+
+        async def request(self, method: str, url: str, **kwargs: Any) -> _FakeResponse:
+            import asyncio
+
+            self.urls.append(url)
+            day = int(url.rsplit("/", 2)[-2][-2:])
+            await asyncio.sleep(0.001 * (10 - day))
+            return _FakeResponse(200, {"data": [url], "meta": {"pagination": {}}})
+
+        async def aclose(self) -> None:  # pragma: no cover - compatibility stub
+            return None
+
+    fake_http = _WindowHTTPClient()
+    client._client = fake_http  # type: ignore[assignment]
+    items = [
+        item
+        async for item in client.chunked_between(
+            "/fixtures/between/{start}/{end}", start="2025-01-01", end="2025-01-09", chunk_days=2
+        )
+    ]
+    assert items == [
+        "/fixtures/between/2025-01-01/2025-01-02",
+        "/fixtures/between/2025-01-03/2025-01-04",
+        "/fixtures/between/2025-01-05/2025-01-06",
+        "/fixtures/between/2025-01-07/2025-01-08",
+        "/fixtures/between/2025-01-09/2025-01-09",
+    ]
+    await client.close()
@@ -0,0 +1,184 @@
+"""
+@file: test_sync_orchestration.py
+@description: Sportmonks sync fetches leagues concurrently and writes in one unit of work.
+@dependencies: pytest, asyncio, scripts.sm_sync
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from types import SimpleNamespace
+from typing import Any, Iterator
+
+import pytest
+
+import scripts.sm_sync as sm_sync
+from app.data_providers.sportmonks.client import SportmonksClientConfig
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.config = SportmonksClientConfig(api_token="token", cache_ttl_seconds=0)
+
+    async def aclose(self) -> None:
+        return None
+
+
+class _FakeProvider:
+    def __init__(
+        self, client: Any, *, etag_cache: Any = None, request_slots: Any = None, **_: Any
+    ) -> None:
+        self.etag_cache = etag_cache
+        self.request_slots = request_slots
+        self.active = 0
+        self.peak = 0
+        _FakeProvider.instance = self
+
+    async def _track(self, result: list[Any]) -> list[Any]:
+        async with self.request_slots:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+        return result
+
+    async def fetch_fixtures(self, *_: Any, **__: Any) -> list[Any]:
+        return [
+            SimpleNamespace(league_id=league, season_id=league * 10, kickoff_utc=None)
+            for league in (1, 2, 3)
+        ]
+
+    async def fetch_teams(self, league_id: str) -> list[Any]:
+        team = SimpleNamespace(team_id=int(league_id), name_normalized=f"team-{league_id}")
+        return await self._track([team])
+
+    async def fetch_standings(self, league_id: str, season_id: str) -> list[Any]:
+        return await self._track([(league_id, season_id)])
+
+    async def fetch_injuries(self, *_: Any, **__: Any) -> list[Any]:
+        return await self._track(["injury"])
+
+
+class _FakeRepository:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, Any]] = []
+        _FakeRepository.instance = self
+
+    @contextmanager
+    def unit_of_work(self) -> Iterator[_FakeRepository]:
+        self.calls.append(("begin", None))
+        yield self
+        self.calls.append(("commit", None))
+
+    def close(self) -> None:
+        self.calls.append(("close", None))
+
+    def upsert_fixtures(self, rows: Any, *, pulled_at: datetime) -> int:
+        self.calls.append(("fixtures", list(rows)))
+        return len(rows)
+
+    def upsert_teams(self, rows: Any, *, pulled_at: datetime) -> int:
+        self.calls.append(("teams", [row.team_id for row in rows]))
+        return len(rows)
+
+    def upsert_standings(self, rows: Any, *, pulled_at: datetime) -> int:
+        self.calls.append(("standings", list(rows)))
+        return len(rows)
+
+    def upsert_injuries(self, rows: Any, *, pulled_at: datetime) -> int:
+        self.calls.append(("injuries", list(rows)))
+        return len(rows)
+
+    def upsert_meta_many(self, items: dict[str, str]) -> None:
+        self.calls.append(("meta", sorted(items)))
+
+    def get_meta(self, key: str) -> str | None:
+        return None
+
+
+@pytest.mark.asyncio
+async def test_execute_fetches_concurrently_and_writes_each_entity_once(monkeypatch) -> None:
+    monkeypatch.setattr(sm_sync, "SportmonksClient", _FakeClient)
+    monkeypatch.setattr(sm_sync, "SportmonksProvider", _FakeProvider)
+    monkeypatch.setattr(sm_sync, "SportmonksETagCache", lambda *args, **kwargs: None)
+    monkeypatch.setattr(sm_sync, "SportmonksRepository", _FakeRepository)
+    monkeypatch.setattr(
+        sm_sync, "SportmonksMappingRepository", lambda: SimpleNamespace(ensure_tables=lambda: None)
+    )
+    monkeypatch.setattr(sm_sync, "_handle_team_collisions", lambda teams: "clean")
+
+    await sm_sync._execute(
+        "backfill",
+        datetime(2025, 1, 1, tzinfo=UTC),
+        datetime(2025, 1, 2, tzinfo=UTC),
+        [],
+        None,
+        False,
+        concurrency=3,
+    )
+
+    calls = _FakeRepository.instance.calls
+    assert [name for name, _ in calls] == [
+        "begin", "fixtures", "teams", "standings", "injuries", "meta", "commit", "close"
+    ]
+    assert calls[2][1] == [1, 2, 3]
+    assert calls[3][1] == [("1", "10"), ("2", "20"), ("3", "30")]
+    assert calls[5][1] == [
+        "last_sync_completed_at", "last_sync_from", "last_sync_mode", "last_sync_to"
+    ]
+    assert _FakeProvider.instance.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_execute_stores_etags_only_with_the_fetched_rows(monkeypatch) -> None:
+    class _CachingClient(_FakeClient):
+        def __init__(self) -> None:
+            self.config = SportmonksClientConfig(api_token="token", cache_ttl_seconds=900)
+
+    class _EtagProvider(_FakeProvider):
+        async def fetch_fixtures(self, *args: Any, **kwargs: Any) -> list[Any]:
+            self.etag_cache.store("/fixtures", None, etag='"fx"', last_modified=None)
+            return await super().fetch_fixtures(*args, **kwargs)
+
+    class _FailingProvider(_EtagProvider):
+        async def fetch_injuries(self, *_: Any, **__: Any) -> list[Any]:
+            raise RuntimeError("injuries down")
+
+    monkeypatch.setattr(sm_sync, "SportmonksClient", _CachingClient)
+    monkeypatch.setattr(sm_sync, "SportmonksRepository", _FakeRepository)
+    monkeypatch.setattr(
+        sm_sync, "SportmonksMappingRepository", lambda: SimpleNamespace(ensure_tables=lambda: None)
+    )
+    monkeypatch.setattr(sm_sync, "_handle_team_collisions", lambda teams: "clean")
+    window = (datetime(2025, 1, 1, tzinfo=UTC), datetime(2025, 1, 2, tzinfo=UTC))
+
+    monkeypatch.setattr(sm_sync, "SportmonksProvider", _FailingProvider)
+    with pytest.raises(RuntimeError):
+        await sm_sync._execute("backfill", *window, [], None, False)
+    assert [name for name, _ in _FakeRepository.instance.calls] == ["close"]
+
+    monkeypatch.setattr(sm_sync, "SportmonksProvider", _EtagProvider)
+    await sm_sync._execute("backfill", *window, [], None, False)
+    calls = dict(_FakeRepository.instance.calls)
+    assert any(key.startswith("sportmonks:etag:") for key in calls["meta"])
+
+
+@pytest.mark.asyncio
+async def test_run_incremental_sync_runs_off_the_callers_loop(monkeypatch) -> None:
+    import threading
+
+    seen: list[tuple[Any, ...]] = []
+
+    async def _fake_execute(*args: Any, **kwargs: Any) -> None:
+        seen.append((threading.get_ident(), asyncio.get_running_loop(), args, kwargs))
+
+    monkeypatch.setattr(sm_sync, "_execute", _fake_execute)
+    await sm_sync.run_incremental_sync(window_days=2)
+
+    (thread_id, loop, args, kwargs), = seen
+    assert thread_id != threading.get_ident()
+    assert loop is not asyncio.get_running_loop()
+    assert args == ("incremental", None, None, (), 2, False)
+    assert kwargs == {"concurrency": sm_sync.DEFAULT_SYNC_CONCURRENCY}
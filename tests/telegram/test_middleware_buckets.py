@@ -0,0 +1,84 @@
+"""
+/**
+ * @file: tests/telegram/test_middleware_buckets.py
+ * @description: Bounded, idle-expiring per-user state in bot middlewares.
+ * @dependencies: tgbotapp.utils.expiring_map, tgbotapp.utils.idempotency, tgbotapp.middlewares
+ * @created: 2026-10-16
+ */
+"""
+from __future__ import annotations
+
+from tgbotapp import middlewares
+from tgbotapp.middlewares import RateLimitMiddleware
+from tgbotapp.utils.expiring_map import BoundedExpiringMap
+from tgbotapp.utils.idempotency import CommandDeduplicator
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_expiring_map_evicts_idle_and_least_recent_entries() -> None:
+    clock = _Clock()
+    evictions: list[str] = []
+    entries: BoundedExpiringMap[int, str] = BoundedExpiringMap(
+        maxsize=2, idle_ttl=10.0, on_evict=evictions.append, clock=clock
+    )
+    entries.set(1, "a")
+    entries.set(2, "b")
+    clock.now = 5.0
+    assert entries.get(1) == "a"  # touch keeps user 1 most recent
+    entries.set(3, "c")
+    assert 2 not in entries and len(entries) == 2
+    assert evictions == ["capacity"]
+
+    clock.now = 14.0
+    entries.set(4, "d")
+    assert 1 not in entries and 3 in entries  # capacity evicts the least recent
+    clock.now = 20.0
+    assert entries.get(3) is None
+    assert entries.get(4) == "d"
+    assert evictions == ["capacity", "capacity", "idle"]
+
+
+def test_deduplicator_is_bounded_and_expires(monkeypatch) -> None:
+    clock = _Clock()
+    dedup = CommandDeduplicator(ttl=5.0, maxsize=3)
+    monkeypatch.setattr(dedup._seen, "_clock", clock)
+    assert dedup.is_duplicate(1, "today") is False
+    assert dedup.is_duplicate(1, "today") is True
+    clock.now = 5.0
+    assert dedup.is_duplicate(1, "today") is False
+    for user_id in range(2, 10):
+        dedup.is_duplicate(user_id, "today")
+    assert len(dedup) == 3
+
+
+def test_rate_limit_buckets_do_not_grow_with_every_user() -> None:
+    middleware = RateLimitMiddleware(capacity=2, per_seconds=1.0, max_users=50)
+    for user_id in range(500):
+        middleware._bucket_for(user_id).consume()
+    assert len(middleware._buckets) == 50
+    bucket = middleware._bucket_for(499)
+    assert bucket is middleware._bucket_for(499)
+
+
+def test_rate_limit_gauge_follows_idle_evictions(monkeypatch) -> None:
+    gauge: dict[str, int] = {}
+    monkeypatch.setattr(
+        middlewares, "set_middleware_entries", lambda name, size: gauge.__setitem__(name, size)
+    )
+    clock = _Clock()
+    middleware = RateLimitMiddleware(capacity=2, per_seconds=1.0, max_users=50)
+    monkeypatch.setattr(middleware._buckets, "_clock", clock)
+    for user_id in range(3):
+        middleware._bucket_for(user_id)
+    assert gauge["rate_limit"] == 3
+
+    clock.now = 2.0
+    assert middleware._buckets.purge() == 3
+    assert gauge["rate_limit"] == 0
@@ -107,3 +107,28 @@ async def test_group_limit_stricter_than_per_chat() -> None:
     await limiter.acquire(chat_id)
     after = loop.time()
     assert after - before >= 0.045
+
+
+@pytest.mark.asyncio
+async def test_idle_chat_windows_expire_without_full_scan() -> None:
+    limiter = AsyncRateLimiter(
+        global_limit=1000,
+        global_window=0.01,
+        per_chat_limit=1,
+        per_chat_window=0.02,
+        group_limit=10,
+        group_window=0.02,
+        lock_shards=4,
+    )
+    for chat_id in range(1, 51):
+        await limiter.acquire(chat_id)
+    await limiter.acquire(-100500)
+    assert len(limiter._per_chat_windows) == 51
+    assert len(limiter._group_windows) == 1
+    assert len(limiter._expiry) == 52
+
+    await asyncio.sleep(0.03)
+    await limiter.acquire(7)
+    assert list(limiter._per_chat_windows) == [7]
+    assert limiter._group_windows == {}
+    assert len(limiter._expiry) == 1
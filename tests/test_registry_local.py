@@ -14,3 +14,64 @@ def test_local_registry_saves_and_loads(tmp_path):
     reg.save(obj, "base_glm", season=2025)
     loaded = reg.load("base_glm", season=2025)
     assert loaded["value"] == 42
+
+
+def test_local_registry_caches_loads_until_new_version_saved(tmp_path, monkeypatch):
+    import joblib
+
+    from app.ml import model_registry
+
+    model_registry.clear_model_cache()
+    reg = LocalModelRegistry(base_dir=tmp_path)
+    reg.save({"value": 1}, "glm_home")
+    calls = []
+    real_load = joblib.load
+
+    def _counting_load(path):
+        calls.append(path)
+        return real_load(path)
+
+    monkeypatch.setattr(model_registry.joblib, "load", _counting_load)
+    first = reg.load("glm_home")
+    second = LocalModelRegistry(base_dir=tmp_path).load("glm_home")
+    assert first is second
+    assert len(calls) == 1
+    assert reg.versions()["default/glm_home"]["version"] == 1
+
+    reg.save({"value": 2}, "glm_home")
+    assert reg.version("glm_home") == "2"
+    assert reg.load("glm_home")["value"] == 2
+    assert len(calls) == 2
+
+
+def test_local_registry_load_evicts_versions_saved_elsewhere(tmp_path):
+    from app.ml import model_registry
+
+    model_registry.clear_model_cache()
+    reg = LocalModelRegistry(base_dir=tmp_path)
+    reg.save({"value": 1}, "glm_home")
+    path = str(reg._model_path("glm_home", None))
+    # A version cached before another process retrained and saved a new one.
+    model_registry._MODEL_CACHE[(path, "0")] = {"value": 0}
+    assert reg.load("glm_home")["value"] == 1
+    keys = [key for key in model_registry._MODEL_CACHE if key[0] == path]
+    assert len(keys) == 1 and keys[0][1].startswith("1@")
+
+
+def test_local_registry_reloads_artifact_rewritten_without_save(tmp_path):
+    import os
+
+    import joblib
+
+    from app.ml import model_registry
+
+    model_registry.clear_model_cache()
+    reg = LocalModelRegistry(base_dir=tmp_path)
+    path = reg.save({"value": 1}, "glm_home")
+    assert reg.load("glm_home")["value"] == 1
+    # A retrain that dumps straight into the registry directory, bypassing save().
+    joblib.dump({"value": 2, "padding": "x" * 64}, path)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert reg.version("glm_home") == "1"
+    assert reg.load("glm_home")["value"] == 2
@@ -28,3 +28,114 @@ def test_haversine_km():
 
     distance = haversine_km(0.0, 0.0, 0.0, 1.0)
     assert distance == pytest.approx(111.19, rel=1e-2)
+
+
+@pytest.fixture
+def data_processor_module(monkeypatch):
+    # The real cache backend needs asyncpg/greenlet, and other test modules
+    # install incomplete stubs for it; the batch loader never touches the cache.
+    import importlib
+    from types import SimpleNamespace
+
+    monkeypatch.setitem(
+        sys.modules,
+        "database.cache_postgres",
+        SimpleNamespace(cache=None, set_with_ttl=None, versioned_key=None),
+    )
+    for name in ("services.sportmonks_client", "services.data_processor"):
+        if name in sys.modules:
+            monkeypatch.delitem(sys.modules, name)
+    module = importlib.import_module("services.data_processor")
+    yield module
+    for name in ("services.sportmonks_client", "services.data_processor"):
+        sys.modules.pop(name, None)
+
+
+def test_process_matches_batch_shares_requests_under_limit(data_processor_module):
+    import asyncio
+
+    DataProcessor = data_processor_module.DataProcessor
+
+    class _Client:
+        def __init__(self):
+            self.calls = []
+            self.active = 0
+            self.peak = 0
+
+        async def get_team_stats(self, team_id, match_date):
+            self.calls.append(("stats", team_id, match_date))
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            await asyncio.sleep(0.01)
+            self.active -= 1
+            return {"team_id": team_id}
+
+    processor = DataProcessor.__new__(DataProcessor)
+    processor.client = _Client()
+
+    async def _fake_process(match_, *, client=None):
+        stats = await asyncio.gather(
+            client.get_team_stats(match_["home"], "2025-10-01"),
+            client.get_team_stats(match_["away"], "2025-10-01"),
+        )
+        return True, {"stats": stats}, None
+
+    processor.process_match = _fake_process
+    matches = [{"home": 1, "away": 2}, {"home": 2, "away": 3}, {"home": 1, "away": 3}]
+    results = asyncio.run(
+        processor.process_matches_batch(matches, max_concurrency=2, max_requests=2)
+    )
+    assert [item["success"] for item in results] == [True, True, True]
+    assert sorted(call[1] for call in processor.client.calls) == [1, 2, 3]
+    assert processor.client.peak <= 2
+    assert results[1]["data"]["stats"][0] == {"team_id": 2}
+
+
+def test_match_context_shares_season_standings_request(data_processor_module):
+    import asyncio
+
+    DataProcessor = data_processor_module.DataProcessor
+
+    class _Client:
+        def __init__(self):
+            self.tables = []
+
+        async def get_fixture(self, fixture_id):
+            return {
+                "date": "2025-10-01T18:00:00Z",
+                "home_team_id": fixture_id * 10,
+                "away_team_id": fixture_id * 10 + 1,
+                "league_id": 8,
+                "season_id": 2025,
+            }
+
+        async def get_season_table(self, league_id, season_id):
+            self.tables.append((league_id, season_id))
+            await asyncio.sleep(0.01)
+            return {"standings": [], "rounds_left": 10}
+
+        async def get_weather(self, team_id, match_date):
+            return None
+
+        async def get_lineups(self, fixture_id):
+            return None
+
+        async def get_injuries(self, team_id):
+            return []
+
+        async def get_last_team_matches(self, team_id, date_from=None):
+            return []
+
+    processor = DataProcessor.__new__(DataProcessor)
+    processor.client = _Client()
+    shared = data_processor_module._SharedRequests(processor.client, 4)
+
+    async def _contexts():
+        return await asyncio.gather(
+            processor.get_match_context(1, client=shared),
+            processor.get_match_context(2, client=shared),
+        )
+
+    contexts = asyncio.run(_contexts())
+    assert [context["season_id"] for context in contexts] == [2025, 2025]
+    assert processor.client.tables == [(8, 2025)]
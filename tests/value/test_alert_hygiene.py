@@ -93,3 +93,110 @@ def test_alert_hygiene_staleness_and_quiet_hours(temp_db) -> None:  # noqa: ANN0
     )
     decision = hygiene.evaluate(fresh_candidate, now=now)
     assert not decision.should_send and decision.reason == "quiet_hours"
+
+
+def test_alert_hygiene_evaluate_many_prefetches_history(temp_db, monkeypatch) -> None:  # noqa: ANN001
+    from app import value_alerts
+
+    hygiene = AlertHygiene(
+        cooldown_minutes=60,
+        min_edge_delta=0.5,
+        staleness_fail_minutes=0,
+        max_updates=2,
+    )
+    now = datetime.now(UTC)
+
+    def _candidate(user_id: int, match_key: str, edge: float) -> AlertCandidate:
+        return AlertCandidate(
+            user_id=user_id,
+            match_key=match_key,
+            market="1X2",
+            selection="HOME",
+            edge_pct=edge,
+            pulled_at=now,
+            kickoff_utc=now + timedelta(hours=2),
+        )
+
+    sent = _candidate(1, "M1", 4.0)
+    hygiene.record_delivery(sent)
+    import sqlite3
+
+    with sqlite3.connect(temp_db) as conn:
+        conn.executemany(
+            """
+            INSERT INTO value_alerts_sent(user_id, match_key, market, selection, edge_pct, sent_at)
+            VALUES (3, 'M3', '1X2', 'HOME', 4.0, ?)
+            """,
+            [("2024-01-01 10:00:00",), ("2024-01-01 11:00:00",)],
+        )
+
+    calls: list[str] = []
+    original_last = value_alerts.get_last_value_alerts_sent
+    original_recent = value_alerts.list_recent_value_alerts_many
+    monkeypatch.setattr(
+        value_alerts,
+        "get_last_value_alerts_sent",
+        lambda keys: calls.append("last") or original_last(keys),
+    )
+    monkeypatch.setattr(
+        value_alerts,
+        "list_recent_value_alerts_many",
+        lambda users, limit: calls.append("recent") or original_recent(users, limit=limit),
+    )
+    decisions = hygiene.evaluate_many(
+        [sent, _candidate(1, "M2", 4.0), _candidate(2, "M1", 4.0), _candidate(3, "M3", 9.0)],
+        now=now,
+    )
+    assert [decision.reason for decision in decisions] == [
+        "cooldown",
+        "ok",
+        "ok",
+        "max_updates",
+    ]
+    assert calls == ["last", "recent"]
+
+
+def test_alert_hygiene_evaluate_many_tracks_batch_decisions(temp_db) -> None:  # noqa: ANN001
+    hygiene = AlertHygiene(
+        cooldown_minutes=0,
+        min_edge_delta=0.5,
+        staleness_fail_minutes=0,
+        update_delta=0.5,
+        max_updates=2,
+    )
+    now = datetime.now(UTC)
+
+    def _candidate(edge: float, *, user_id: int = 1) -> AlertCandidate:
+        return AlertCandidate(
+            user_id=user_id,
+            match_key="M1",
+            market="1X2",
+            selection="HOME",
+            edge_pct=edge,
+            pulled_at=now,
+            kickoff_utc=now + timedelta(hours=2),
+        )
+
+    decisions = hygiene.evaluate_many(
+        [
+            _candidate(4.0),
+            _candidate(4.0),
+            _candidate(5.0),
+            _candidate(6.0),
+            _candidate(4.0, user_id=2),
+        ],
+        now=now,
+    )
+    assert [decision.reason for decision in decisions] == [
+        "ok",
+        "edge_delta",
+        "ok",
+        "max_updates",
+        "ok",
+    ]
+
+    cooling = AlertHygiene(cooldown_minutes=60, min_edge_delta=0.5, staleness_fail_minutes=0)
+    decisions = cooling.evaluate_many(
+        [_candidate(4.0, user_id=3), _candidate(9.0, user_id=3)], now=now
+    )
+    assert [decision.reason for decision in decisions] == ["ok", "cooldown"]
@@ -17,6 +17,7 @@ import pytest
 
 from app.value_calibration.backtest import (
     BacktestConfig,
+    BacktestRunner,
     BacktestSample,
     build_windows,
 )
@@ -86,3 +87,15 @@ def test_walk_forward_windows_stride() -> None:
     assert [len(chunk) for chunk in windows] == [2, 2, 2, 2]
     assert windows[0][0].match_key == "M1"
     assert windows[-1][-1].match_key == "M8"
+
+
+def test_calibrate_skips_groups_with_empty_threshold_grid() -> None:
+    config = BacktestConfig(
+        min_samples=1,
+        validation="time_kfold",
+        optim_target="hit",
+        edge_grid=[],
+        confidence_grid=[0.0],
+        folds=2,
+    )
+    assert BacktestRunner(_load_samples()).calibrate(config) == []
@@ -72,3 +72,65 @@ def test_calibration_prefers_balanced_thresholds() -> None:
     assert record.gamma_conf == pytest.approx(0.7)
     assert record.metrics.samples == 2
     assert record.metrics.hit_rate == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("target", ["sharpe", "hit", "loggain"])
+def test_vectorized_surface_matches_bruteforce(target: str) -> None:
+    import random
+
+    from app.value_calibration.backtest import _compute_metrics
+
+    rng = random.Random(7)
+    base = datetime(2024, 1, 1, 9, 0)
+    samples = [
+        BacktestSample(
+            pulled_at=base + timedelta(hours=idx),
+            kickoff_utc=base + timedelta(hours=idx + 6),
+            league="L1",
+            market="1X2",
+            selection="HOME",
+            match_key=f"L1-{idx}",
+            price_decimal=round(rng.uniform(1.3, 4.5), 2),
+            edge_pct=round(rng.uniform(0.0, 10.0), 1),
+            confidence=round(rng.uniform(0.4, 0.95), 2),
+            result=rng.randint(0, 1),
+        )
+        for idx in range(120)
+    ]
+    edge_grid = [0.0, 1.5, 3.0, 4.5, 6.0, 7.5, 9.0, 11.0]
+    confidence_grid = [0.4, 0.55, 0.7, 0.85, 0.99]
+    config = BacktestConfig(
+        min_samples=10,
+        validation="walk_forward",
+        optim_target=target,
+        edge_grid=edge_grid,
+        confidence_grid=confidence_grid,
+        walk_step=25,
+    )
+
+    best: tuple[float, float, float] | None = None
+    for tau in edge_grid:
+        for gamma in confidence_grid:
+            picked = [s for s in samples if s.edge_pct >= tau and s.confidence >= gamma]
+            metrics = _compute_metrics(picked)
+            if not metrics.samples:
+                continue
+            value = {
+                "sharpe": metrics.sharpe,
+                "hit": metrics.hit_rate,
+                "loggain": metrics.avg_log_gain,
+            }[target]
+            if best is None or value > best[2] + 1e-12:
+                best = (tau, gamma, value)
+
+    (result,) = BacktestRunner(samples).calibrate(config)
+    assert best is not None
+    assert (result.tau_edge, result.gamma_conf) == (best[0], best[1])
+    assert result.metric == pytest.approx(best[2])
+    expected = _compute_metrics(
+        [s for s in samples if s.edge_pct >= best[0] and s.confidence >= best[1]]
+    )
+    assert result.metrics.samples == expected.samples
+    assert result.metrics.wins == expected.wins
+    assert result.metrics.avg_price == pytest.approx(expected.avg_price)
+    assert result.metrics.sharpe == pytest.approx(expected.sharpe)
@@ -100,6 +100,7 @@ def _init_schema(db_path: str) -> None:
                 selection TEXT NOT NULL,
                 stake REAL NOT NULL,
                 price_taken REAL NOT NULL,
+                provider_price_decimal REAL NOT NULL DEFAULT 0.0,
                 model_probability REAL NOT NULL,
                 market_probability REAL NOT NULL,
                 edge_pct REAL NOT NULL,
@@ -107,9 +108,12 @@ def _init_schema(db_path: str) -> None:
                 pulled_at_utc TEXT NOT NULL,
                 kickoff_utc TEXT NOT NULL,
                 consensus_price REAL NOT NULL,
+                consensus_price_decimal REAL NOT NULL DEFAULT 0.0,
                 consensus_method TEXT NOT NULL,
                 consensus_provider_count INTEGER NOT NULL,
                 clv_pct REAL NULL,
+                outcome TEXT NULL,
+                roi REAL NULL,
                 closing_price REAL NULL,
                 closing_pulled_at TEXT NULL,
                 closing_method TEXT NULL,
@@ -154,3 +158,77 @@ def test_ledger_records_clv(tmp_path) -> None:
     assert entry["closing_price"] == 1.85
     assert entry["closing_method"] == "median"
     assert pytest.approx(float(entry["clv_pct"]), rel=1e-6) == expected_clv
+
+
+def test_ledger_batch_applies_closing_lines_set_based(tmp_path) -> None:
+    from dataclasses import replace
+
+    db_path = tmp_path / "ledger.sqlite3"
+    store = PicksLedgerStore(db_path=str(db_path))
+    _init_schema(str(db_path))
+    pick = _value_pick()
+    later_pick = replace(pick, pulled_at=pick.pulled_at + timedelta(hours=1), market_price=2.3)
+    consensus = _consensus_meta(closing_price=1.9)
+    with store.batch():
+        store.record_picks([(1, pick, consensus, None), (2, later_pick, consensus, None)])
+        store.record_closing_lines([consensus])
+        assert store.apply_closing_lines([consensus]) == 2
+        assert store.apply_closing_lines([consensus]) == 0
+    rows = store.list_user_picks(1) + store.list_user_picks(2)
+    assert [row["closing_price"] for row in rows] == [1.9, 1.9]
+    assert [row["clv_pct"] for row in rows] == pytest.approx(
+        [calculate_clv(2.1, 1.9), calculate_clv(2.3, 1.9)]
+    )
+
+    moved = _consensus_meta(closing_price=2.0)
+    store.record_closing_line(moved)
+    assert store.apply_closing_lines() == 2
+    assert store.apply_closing_lines() == 0
+    rows = store.list_user_picks(1)
+    assert rows[0]["closing_price"] == 2.0
+    assert rows[0]["clv_pct"] == pytest.approx(calculate_clv(2.1, 2.0))
+
+
+def test_user_summary_reads_maintained_aggregates(tmp_path) -> None:
+    from dataclasses import replace
+
+    db_path = tmp_path / "ledger.sqlite3"
+    _init_schema(str(db_path))
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(
+            """
+            INSERT INTO picks_ledger(
+                user_id, match_key, market, selection, stake, price_taken,
+                model_probability, market_probability, edge_pct, confidence,
+                pulled_at_utc, kickoff_utc, consensus_price, consensus_method,
+                consensus_provider_count, clv_pct, created_at, updated_at
+            ) VALUES (7, 'legacy', '1X2', 'AWAY', 1.0, 3.0, 0.4, 0.35, 2.0, 0.7,
+                      '2025-10-01T10:00:00Z', '2025-10-01T18:00:00Z', 2.9, 'median',
+                      2, -4.0, '2025-10-01 10:00:00', '2025-10-01 10:00:00')
+            """
+        )
+    store = PicksLedgerStore(db_path=str(db_path))
+    summary = store.user_summary(7)
+    assert summary["total"] == 1
+    assert summary["avg_clv"] == pytest.approx(-4.0)
+    assert summary["positive_share"] == 0.0
+
+    pick = replace(_value_pick(), edge_pct=6.0)
+    consensus = _consensus_meta(closing_price=1.9)
+    store.record_pick(7, pick, consensus)
+    store.record_pick(7, pick, consensus)  # upsert of the same pick is not double counted
+    store.record_closing_line(consensus)
+    store.apply_closing_to_picks(consensus)
+
+    summary = store.user_summary(7)
+    assert summary["total"] == 2
+    assert summary["avg_edge"] == pytest.approx(4.0)
+    assert summary["avg_clv"] == pytest.approx((-4.0 + calculate_clv(2.1, 1.9)) / 2)
+    assert summary["positive_share"] == pytest.approx(0.5)
+
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("DELETE FROM picks_ledger WHERE match_key = 'legacy'")
+    summary = store.user_summary(7)
+    assert summary["total"] == 1
+    assert summary["positive_share"] == pytest.approx(1.0)
+    assert store.user_summary(99)["total"] == 0
@@ -12,6 +12,8 @@ from __future__ import annotations
 import sqlite3
 from datetime import UTC, datetime, timedelta
 
+import pytest
+
 from app.settlement.engine import FixtureResult, SettlementEngine
 
 
@@ -40,7 +42,8 @@ def _create_db(path: str) -> sqlite3.Connection:
             closing_price REAL NULL,
             outcome TEXT NULL,
             roi REAL NULL,
-            created_at TEXT NOT NULL
+            created_at TEXT NOT NULL,
+            updated_at TEXT NULL
         )
         """
     )
@@ -151,8 +154,63 @@ def test_settlement_engine_updates_outcomes_and_roi(tmp_path) -> None:
     assert outcomes == ["win", "lose", "push", "lose"]
 
     roi_values = [row["roi"] for row in stored]
-    assert roi_values == [120.0, -100.0, 0.0, -100.0]
+    assert roi_values == pytest.approx([120.0, -100.0, 0.0, -100.0])
 
     clv_updated = stored[0]["clv_pct"]
     assert clv_updated is not None and round(clv_updated, 2) == 10.0
     assert stored[1]["clv_pct"] == -2.5  # не перезаписывается при наличии значения
+
+
+def test_settlement_skips_future_picks_and_tracks_portfolio_incrementally(tmp_path) -> None:
+    from app.metrics import clv_mean_pct, portfolio_roi_rolling
+
+    db_path = tmp_path / "settlement.sqlite3"
+    conn = _create_db(str(db_path))
+    now = datetime.now(UTC)
+    insert = """
+        INSERT INTO picks_ledger(
+            id, match_key, market, selection, price_taken,
+            provider_price_decimal, consensus_price_decimal,
+            kickoff_utc, clv_pct, closing_price, outcome, roi, created_at
+        ) VALUES (?, ?, '1X2', 'HOME', ?, ?, ?, ?, ?, NULL, ?, ?, ?)
+    """
+    conn.executemany(
+        insert,
+        [
+            (1, "old", 2.0, 2.0, 2.0, _iso(now - timedelta(days=3)), 5.0, "win", 100.0,
+             _iso(now - timedelta(days=3))),
+            (2, "done", 3.0, 3.0, 3.0, _iso(now - timedelta(hours=3)), 1.0, None, None,
+             _iso(now - timedelta(hours=4))),
+            (3, "future", 2.5, 2.5, 2.5, _iso(now + timedelta(hours=3)), None, None, None,
+             _iso(now - timedelta(hours=1))),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+    results = {
+        "done": FixtureResult(match_key="done", home_score=1, away_score=0),
+        "future": FixtureResult(match_key="future", home_score=1, away_score=0),
+    }
+    engine = SettlementEngine(
+        results_provider=DummyResultsProvider(results), db_path=str(db_path), rolling_days=7
+    )
+    assert engine.settle() == 1
+    window = str(engine.rolling_days)
+    assert portfolio_roi_rolling.labels(window_days=window)._value.get() == 150.0
+    assert clv_mean_pct._value.get() == 3.0
+
+    with sqlite3.connect(db_path) as check_conn:
+        check_conn.execute(
+            "UPDATE picks_ledger SET kickoff_utc = ? WHERE id = 3",
+            (_iso(now - timedelta(hours=2)),),
+        )
+    assert engine.settle() == 1
+    assert portfolio_roi_rolling.labels(window_days=window)._value.get() == (
+        100.0 + 200.0 + 150.0
+    ) / 3
+    with sqlite3.connect(db_path) as check_conn:
+        outcomes = [row[0] for row in check_conn.execute(
+            "SELECT outcome FROM picks_ledger ORDER BY id"
+        )]
+    assert outcomes == ["win", "win", "win"]
@@ -0,0 +1,179 @@
+"""
+@file: tests/workers/test_runtime_scheduler.py
+@description: Cron parsing, catch-up, jitter and overlap leases of the persistent runtime scheduler.
+@dependencies: workers.runtime_scheduler
+@created: 2026-10-16
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from datetime import UTC, datetime
+
+import pytest
+
+from workers.runtime_scheduler import JobStore, RuntimeScheduler, parse_schedule
+
+
+class _Clock:
+    def __init__(self, moment: datetime) -> None:
+        self.now = moment.timestamp()
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float) -> None:
+        self.now += seconds
+
+
+def _ts(*args: int) -> float:
+    return datetime(*args, tzinfo=UTC).timestamp()
+
+
+def test_parse_schedule_cron_and_interval() -> None:
+    start = datetime(2026, 10, 16, 21, 7, 30, tzinfo=UTC)  # Friday
+    assert parse_schedule("*/15 * * * *").next_after(start) == datetime(
+        2026, 10, 16, 21, 15, tzinfo=UTC
+    )
+    assert parse_schedule("30 4 * * *").next_after(start) == datetime(
+        2026, 10, 17, 4, 30, tzinfo=UTC
+    )
+    assert parse_schedule("0 5 * * 0").next_after(start) == datetime(
+        2026, 10, 18, 5, 0, tzinfo=UTC
+    )
+    assert parse_schedule("@monthly").next_after(start) == datetime(2026, 11, 1, tzinfo=UTC)
+    assert parse_schedule("@every 90s").next_after(start).timestamp() == start.timestamp() + 90
+    with pytest.raises(ValueError):
+        parse_schedule("61 * * * *")
+    with pytest.raises(ValueError):
+        parse_schedule("0 0 30 2 *").next_after(start)
+
+
+@pytest.mark.asyncio
+async def test_scheduler_fires_due_jobs_once_and_reschedules(tmp_path) -> None:
+    clock = _Clock(datetime(2026, 10, 16, 4, 29, tzinfo=UTC))
+    store = JobStore(tmp_path / "scheduler.sqlite3")
+    scheduler = RuntimeScheduler(store, clock=clock)
+    release = asyncio.Event()
+    runs: list[str] = []
+
+    async def backup() -> None:
+        runs.append("backup")
+        await release.wait()
+
+    scheduler.register("30 4 * * *", backup, name="backup")
+    assert await scheduler.tick() == []
+
+    clock.advance(60)
+    assert await scheduler.tick() == ["backup"]
+    # A second process sharing the store cannot start the same run.
+    other = RuntimeScheduler(store, clock=clock)
+    other.register("30 4 * * *", backup, name="backup")
+    assert await other.tick() == []
+    assert await scheduler.tick() == []
+
+    release.set()
+    await asyncio.sleep(0.01)
+    (job,) = scheduler.list_jobs()
+    assert runs == ["backup"]
+    assert job["last_status"] == "ok" and job["run_count"] == 1
+    assert job["next_run_at"] == "2026-10-17T04:30:00+00:00"
+    assert store.registered_total() == 2.0
+
+
+@pytest.mark.asyncio
+async def test_missed_runs_coalesce_or_skip_and_jitter_delays(tmp_path) -> None:
+    clock = _Clock(datetime(2026, 10, 16, 0, 0, tzinfo=UTC))
+    store = JobStore(tmp_path / "scheduler.sqlite3")
+    calls: list[str] = []
+    RuntimeScheduler(store, clock=clock).register("@hourly", lambda: None, name="sync")
+    RuntimeScheduler(store, clock=clock).register("@hourly", lambda: None, name="digest")
+
+    # Restart six hours later: "sync" catches up once, "digest" skips to the next slot.
+    clock.advance(6 * 3600 + 120)
+    scheduler = RuntimeScheduler(store, clock=clock)
+    scheduler.register("@hourly", lambda: calls.append("sync"), name="sync")
+    scheduler.register("@hourly", lambda: calls.append("digest"), name="digest", catch_up=False)
+    assert await scheduler.tick() == ["sync"]
+    await asyncio.sleep(0.05)
+    assert await scheduler.tick() == []
+    assert calls == ["sync"]
+
+    jobs = {job["name"]: job for job in scheduler.list_jobs()}
+    assert jobs["sync"]["next_run_at"] == "2026-10-16T07:00:00+00:00"
+    assert jobs["digest"]["next_run_at"] == "2026-10-16T07:00:00+00:00"
+
+    jittered = RuntimeScheduler(store, clock=clock)
+    jittered.register("@hourly", lambda: None, name="settlement", jitter=300)
+    (row,) = [r for r in store.jobs() if r["name"] == "settlement"]
+    assert _ts(2026, 10, 16, 7) <= row["next_run_at"] <= _ts(2026, 10, 16, 7, 5)
+
+
+@pytest.mark.asyncio
+async def test_run_loop_stops_and_releases_leases(tmp_path) -> None:
+    store = JobStore(tmp_path / "scheduler.sqlite3")
+    scheduler = RuntimeScheduler(store, poll_interval=0.01)
+    started = asyncio.Event()
+
+    async def retrain() -> None:
+        started.set()
+        await asyncio.sleep(3600)
+
+    scheduler.register("@every 0.2s", retrain, name="retrain")
+    stop = asyncio.Event()
+    loop_task = asyncio.create_task(scheduler.run(stop))
+    await asyncio.wait_for(started.wait(), timeout=2)
+    stop.set()
+    await asyncio.wait_for(loop_task, timeout=1)
+
+    (job,) = scheduler.list_jobs()
+    assert job["running"] is False
+    assert job["run_count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_lease_is_renewed_while_running_and_expires_after_crash(tmp_path) -> None:
+    store = JobStore(tmp_path / "scheduler.sqlite3")
+    scheduler = RuntimeScheduler(store, lease_seconds=0.3)
+    release = asyncio.Event()
+
+    async def sync() -> None:
+        await release.wait()
+
+    scheduler.register("@every 0.1s", sync, name="sync")
+    await asyncio.sleep(0.15)
+    assert await scheduler.tick() == ["sync"]
+
+    other = RuntimeScheduler(store, lease_seconds=0.3)
+    other.register("@every 0.1s", sync, name="sync")
+    # Heartbeats keep a run that outlives its lease from being claimed twice.
+    await asyncio.sleep(0.8)
+    assert await other.tick() == []
+    release.set()
+    await asyncio.sleep(0.05)
+    (job,) = scheduler.list_jobs()
+    assert job["run_count"] == 1 and job["running"] is False
+
+    # A lease left behind by a crashed owner is reclaimable once it expires.
+    assert store.claim("sync", "crashed", now=time.time() + 0.2, lease_seconds=0.3)
+    assert await other.tick() == []
+    await asyncio.sleep(0.6)
+    assert await other.tick() == ["sync"]
+    await other.stop()
+
+
+@pytest.mark.asyncio
+async def test_prune_drops_jobs_no_longer_bound_but_keeps_leased_ones(tmp_path) -> None:
+    clock = _Clock(datetime(2026, 10, 16, 4, 0, tzinfo=UTC))
+    store = JobStore(tmp_path / "scheduler.sqlite3")
+    previous = RuntimeScheduler(store, clock=clock)
+    for name in ("backup", "sportmonks_sync", "digest"):
+        previous.register("@hourly", lambda: None, name=name)
+    assert store.claim("digest", "other-host", now=clock.now + 3600, lease_seconds=60)
+
+    # Restart with SM_SYNC_CRON emptied: only "backup" is bound in this process.
+    scheduler = RuntimeScheduler(store, clock=clock)
+    scheduler.register("@hourly", lambda: None, name="backup")
+    assert scheduler.prune() == ["sportmonks_sync"]
+    assert sorted(job["name"] for job in scheduler.list_jobs()) == ["backup", "digest"]
@@ -60,8 +60,8 @@ class TelegramBot:
             logger.info("✅ Кэш PostgreSQL инициализирован")
 
             self.dp = Dispatcher()
-            message_rate = RateLimitMiddleware()
-            callback_rate = RateLimitMiddleware()
+            message_rate = RateLimitMiddleware(name="rate_limit_message")
+            callback_rate = RateLimitMiddleware(name="rate_limit_callback")
             self.dp.message.middleware.register(message_rate)
             self.dp.callback_query.middleware.register(callback_rate)
             self.dp.message.middleware.register(IdempotencyMiddleware())
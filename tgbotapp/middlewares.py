@@ -27,10 +27,22 @@ except Exception:  # pragma: no cover - defensive fallback
     logger = logging.getLogger("tg-bot")
 
 try:  # metrics can live under app.metrics or top-level metrics
-    from app.metrics import handler_latency, record_command, record_update  # type: ignore
+    from app.metrics import (  # type: ignore
+        handler_latency,
+        record_command,
+        record_middleware_eviction,
+        record_update,
+        set_middleware_entries,
+    )
 except Exception:  # pragma: no cover - defensive fallback
     try:
-        from metrics import handler_latency, record_command, record_update  # type: ignore
+        from metrics import (  # type: ignore
+            handler_latency,
+            record_command,
+            record_middleware_eviction,
+            record_update,
+            set_middleware_entries,
+        )
     except Exception:  # pragma: no cover - fallback to no-op metrics
         class _NoopLatency:
             def observe(self, *_args: Any, **_kwargs: Any) -> None:
@@ -44,24 +56,54 @@ except Exception:  # pragma: no cover - defensive fallback
         def record_update(*_args: Any, **_kwargs: Any) -> None:
             return None
 
+        def record_middleware_eviction(*_args: Any, **_kwargs: Any) -> None:
+            return None
+
+        def set_middleware_entries(*_args: Any, **_kwargs: Any) -> None:
+            return None
+
+from .utils.expiring_map import BoundedExpiringMap
 from .utils.idempotency import CommandDeduplicator
 from .utils.token_bucket import TokenBucket
 
 
 class RateLimitMiddleware(BaseMiddleware):
-    """Token-bucket based per-user throttling."""
+    """Token-bucket based per-user throttling.
 
-    def __init__(self, capacity: int = 5, per_seconds: float = 3.0) -> None:
+    A bucket left idle for ``per_seconds`` has refilled completely and is
+    indistinguishable from a new one, so it is dropped; ``max_users`` caps the
+    number of buckets held at once (least recently active users go first).
+    """
+
+    def __init__(
+        self,
+        capacity: int = 5,
+        per_seconds: float = 3.0,
+        *,
+        max_users: int = 10_000,
+        name: str = "rate_limit",
+    ) -> None:
         self.capacity = max(1, capacity)
-        refill_rate = self.capacity / max(per_seconds, 1e-3)
+        per_seconds = max(per_seconds, 1e-3)
+        refill_rate = self.capacity / per_seconds
         self._refill_rate = refill_rate
-        self._buckets: Dict[int, TokenBucket] = {}
+        self.name = name
+        self._buckets: BoundedExpiringMap[int, TokenBucket] = BoundedExpiringMap(
+            maxsize=max(1, max_users),
+            idle_ttl=per_seconds,
+            on_evict=self._on_evict,
+        )
+
+    def _on_evict(self, reason: str) -> None:
+        record_middleware_eviction(self.name, reason)
+        set_middleware_entries(self.name, len(self._buckets))
 
     def _bucket_for(self, user_id: int) -> TokenBucket:
         bucket = self._buckets.get(user_id)
         if bucket is None:
             bucket = TokenBucket.create(self.capacity, self._refill_rate)
-            self._buckets[user_id] = bucket
+            self._buckets.set(user_id, bucket)
+            set_middleware_entries(self.name, len(self._buckets))
         return bucket
 
     async def __call__(
@@ -86,8 +128,19 @@ class RateLimitMiddleware(BaseMiddleware):
 class IdempotencyMiddleware(BaseMiddleware):
     """Deduplicate repeated commands from the same user within TTL."""
 
-    def __init__(self, ttl: float = 5.0) -> None:
-        self._deduplicator = CommandDeduplicator(ttl=ttl)
+    def __init__(
+        self, ttl: float = 5.0, *, max_entries: int = 10_000, name: str = "idempotency"
+    ) -> None:
+        self.name = name
+        self._deduplicator = CommandDeduplicator(
+            ttl=ttl,
+            maxsize=max(1, max_entries),
+            on_evict=self._on_evict,
+        )
+
+    def _on_evict(self, reason: str) -> None:
+        record_middleware_eviction(self.name, reason)
+        set_middleware_entries(self.name, len(self._deduplicator))
 
     async def __call__(
         self,
@@ -99,7 +152,9 @@ class IdempotencyMiddleware(BaseMiddleware):
             user = getattr(event, "from_user", None)
             if user is not None:
                 command = event.text.split()[0].lstrip("/")
-                if self._deduplicator.is_duplicate(user.id, command):
+                duplicate = self._deduplicator.is_duplicate(user.id, command)
+                set_middleware_entries(self.name, len(self._deduplicator))
+                if duplicate:
                     await event.answer("Команда уже обрабатывается. Подождите ответ.")
                     return
                 record_command(command)
@@ -2,19 +2,25 @@
 /**
  * @file: tgbotapp/ratelimiter.py
  * @description: Sliding-window asynchronous rate limiter for Telegram bot messaging.
- * @dependencies: asyncio, collections, typing
+ * @dependencies: asyncio, collections, heapq, itertools, typing
  * @created: 2025-10-02
  */
 """
 from __future__ import annotations
 
 import asyncio
+import heapq
 from collections import deque
+from itertools import count
 from time import monotonic
 from typing import Deque, Iterable, MutableMapping
 
 ChatId = int | str
 
+_PER_CHAT = 0
+_GROUP = 1
+_DEFAULT_LOCK_SHARDS = 64
+
 
 class _SlidingWindow:
     """Utility class encapsulating sliding window counters."""
@@ -59,6 +65,7 @@ class AsyncRateLimiter:
         per_chat_window: float = 1.0,
         group_limit: int = 20,
         group_window: float = 60.0,
+        lock_shards: int = _DEFAULT_LOCK_SHARDS,
     ) -> None:
         if global_limit <= 0:
             raise ValueError("global_limit must be positive")
@@ -66,6 +73,8 @@ class AsyncRateLimiter:
             raise ValueError("per_chat_limit must be positive")
         if group_limit <= 0:
             raise ValueError("group_limit must be positive")
+        if lock_shards <= 0:
+            raise ValueError("lock_shards must be positive")
 
         self._global_window = _SlidingWindow(global_limit, global_window)
         self._per_chat_limit = per_chat_limit
@@ -74,14 +83,23 @@ class AsyncRateLimiter:
         self._group_window = group_window
         self._per_chat_windows: MutableMapping[ChatId, _SlidingWindow] = {}
         self._group_windows: MutableMapping[ChatId, _SlidingWindow] = {}
-        self._lock = asyncio.Lock()
+        # One heap entry per live chat/group window, keyed by the moment its
+        # oldest event leaves the window: cleanup only touches expired windows.
+        self._expiry: list[tuple[float, int, int, ChatId]] = []
+        self._expiry_seq = count()
+        # Acquisitions for the same chat stay serialized while unrelated chats
+        # no longer queue behind one lock. The shared global window is checked
+        # and registered without awaiting, so it needs no lock of its own.
+        self._locks = [asyncio.Lock() for _ in range(lock_shards)]
 
     async def acquire(self, chat_id: ChatId) -> None:
         """Wait until sending a message to chat_id is allowed."""
 
+        lock = self._locks[hash(chat_id) % len(self._locks)]
         while True:
-            async with self._lock:
+            async with lock:
                 now = monotonic()
+                self._cleanup_stale(now)
                 wait_for = self._collect_wait_times(chat_id, now)
                 delay = max(wait_for, default=0.0)
                 if delay <= 0.0:
@@ -93,45 +111,57 @@ class AsyncRateLimiter:
         waits = [self._global_window.compute_delay(now)]
 
         per_chat_window = self._per_chat_windows.get(chat_id)
-        if per_chat_window is None:
-            per_chat_window = _SlidingWindow(self._per_chat_limit, self._per_chat_window)
-            self._per_chat_windows[chat_id] = per_chat_window
-        waits.append(per_chat_window.compute_delay(now))
+        if per_chat_window is not None:
+            waits.append(per_chat_window.compute_delay(now))
 
         if self._is_group(chat_id):
             group_window = self._group_windows.get(chat_id)
-            if group_window is None:
-                group_window = _SlidingWindow(self._group_limit, self._group_window)
-                self._group_windows[chat_id] = group_window
-            waits.append(group_window.compute_delay(now))
+            if group_window is not None:
+                waits.append(group_window.compute_delay(now))
 
-        self._cleanup_stale(now)
         return waits
 
     def _register(self, timestamp: float, chat_id: ChatId) -> None:
         self._global_window.register(timestamp)
-
-        per_chat_window = self._per_chat_windows.setdefault(
-            chat_id,
-            _SlidingWindow(self._per_chat_limit, self._per_chat_window),
+        self._register_window(
+            _PER_CHAT, chat_id, timestamp, self._per_chat_limit, self._per_chat_window
         )
-        per_chat_window.register(timestamp)
-
         if self._is_group(chat_id):
-            group_window = self._group_windows.setdefault(
-                chat_id,
-                _SlidingWindow(self._group_limit, self._group_window),
+            self._register_window(
+                _GROUP, chat_id, timestamp, self._group_limit, self._group_window
             )
-            group_window.register(timestamp)
+
+    def _register_window(
+        self, kind: int, chat_id: ChatId, timestamp: float, limit: int, window: float
+    ) -> None:
+        windows = self._windows(kind)
+        sliding = windows.get(chat_id)
+        if sliding is None:
+            sliding = _SlidingWindow(limit, window)
+            windows[chat_id] = sliding
+            self._schedule_expiry(kind, chat_id, timestamp + window)
+        sliding.register(timestamp)
+
+    def _windows(self, kind: int) -> MutableMapping[ChatId, _SlidingWindow]:
+        return self._per_chat_windows if kind == _PER_CHAT else self._group_windows
+
+    def _schedule_expiry(self, kind: int, chat_id: ChatId, expires_at: float) -> None:
+        heapq.heappush(self._expiry, (expires_at, next(self._expiry_seq), kind, chat_id))
 
     def _cleanup_stale(self, now: float) -> None:
-        for windows in (self._per_chat_windows, self._group_windows):
-            empty_keys: list[ChatId] = []
-            for chat_id, window in windows.items():
-                window.prune(now)
-                if not window.events:
-                    empty_keys.append(chat_id)
-            for chat_id in empty_keys:
+        """Drop windows whose events have all expired; amortized O(log n) per window."""
+
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            _, _, kind, chat_id = heapq.heappop(expiry)
+            windows = self._windows(kind)
+            sliding = windows.get(chat_id)
+            if sliding is None:
+                continue
+            sliding.prune(now)
+            if sliding.events:
+                self._schedule_expiry(kind, chat_id, sliding.events[0] + sliding.window)
+            else:
                 del windows[chat_id]
 
     @staticmethod
@@ -1,6 +1,7 @@
 """Utility helpers shared across Telegram bot components."""
 
 __all__ = [
+    "expiring_map",
     "formatter",
     "idempotency",
     "token_bucket",
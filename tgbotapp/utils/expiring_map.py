@@ -0,0 +1,95 @@
+"""
+/**
+ * @file: tgbotapp/utils/expiring_map.py
+ * @description: Bounded mapping with idle expiry and LRU eviction for per-user middleware state.
+ * @dependencies: collections, time
+ * @created: 2026-10-16
+ */
+"""
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+__all__ = ["BoundedExpiringMap"]
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class BoundedExpiringMap(Generic[K, V]):
+    """Mapping that forgets entries idle for ``idle_ttl`` and never exceeds ``maxsize``.
+
+    Entries are kept in last-touch order, so expired entries are always at the
+    front and eviction costs O(1) amortized per write.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int,
+        idle_ttl: float,
+        on_evict: Callable[[str], None] | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        if idle_ttl <= 0:
+            raise ValueError("idle_ttl must be positive")
+        self.maxsize = maxsize
+        self.idle_ttl = idle_ttl
+        self._on_evict = on_evict
+        self._clock = clock
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def get(self, key: K, *, touch: bool = True) -> V | None:
+        """Return a live entry (refreshing its idle timer unless ``touch`` is false)."""
+
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        now = self._clock()
+        touched_at, value = item
+        if now - touched_at >= self.idle_ttl:
+            del self._entries[key]
+            self._evicted("idle")
+            return None
+        if touch:
+            self._entries[key] = (now, value)
+            self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        now = self._clock()
+        self._entries[key] = (now, value)
+        self._entries.move_to_end(key)
+        self.purge(now)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self._evicted("capacity")
+
+    def purge(self, now: float | None = None) -> int:
+        """Drop idle entries from the front of the access order."""
+
+        now = self._clock() if now is None else now
+        removed = 0
+        entries = self._entries
+        while entries:
+            key, (touched_at, _) = next(iter(entries.items()))
+            if now - touched_at < self.idle_ttl:
+                break
+            del entries[key]
+            removed += 1
+            self._evicted("idle")
+        return removed
+
+    def _evicted(self, reason: str) -> None:
+        if self._on_evict is not None:
+            self._on_evict(reason)
@@ -1,13 +1,15 @@
 """
 @file: idempotency.py
 @description: Helpers to deduplicate command handling per user.
-@dependencies: time
+@dependencies: tgbotapp.utils.expiring_map
 @created: 2025-09-30
 """
 from __future__ import annotations
 
-import time
 from dataclasses import dataclass, field
+from typing import Callable
+
+from .expiring_map import BoundedExpiringMap
 
 __all__ = ["CommandDeduplicator"]
 
@@ -15,19 +17,21 @@ __all__ = ["CommandDeduplicator"]
 @dataclass
 class CommandDeduplicator:
     ttl: float = 5.0
-    _seen: dict[tuple[int, str], float] = field(default_factory=dict)
+    maxsize: int = 10_000
+    on_evict: Callable[[str], None] | None = None
+    _seen: BoundedExpiringMap[tuple[int, str], bool] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._seen = BoundedExpiringMap(
+            maxsize=self.maxsize, idle_ttl=self.ttl, on_evict=self.on_evict
+        )
+
+    def __len__(self) -> int:
+        return len(self._seen)
 
     def is_duplicate(self, user_id: int, command: str) -> bool:
-        now = time.monotonic()
         key = (user_id, command or "")
-        last = self._seen.get(key)
-        if last is not None and now - last < self.ttl:
+        if self._seen.get(key, touch=False) is not None:
             return True
-        self._seen[key] = now
-        self._purge(now)
+        self._seen.set(key, True)
         return False
-
-    def _purge(self, now: float) -> None:
-        expired = [key for key, ts in self._seen.items() if now - ts > self.ttl]
-        for key in expired:
-            self._seen.pop(key, None)
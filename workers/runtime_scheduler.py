@@ -1,103 +1,634 @@
 """
 @file: workers/runtime_scheduler.py
-@description: Minimal in-memory runtime scheduler adapter for wiring and smoke checks.
-@dependencies: workers.retrain_scheduler
+@description: Persistent runtime scheduler: cron/interval jobs, jitter, overlap leases, catch-up.
+@dependencies: asyncio, sqlite3, prometheus_client, app.config
 @created: 2025-09-12
 """
 
 from __future__ import annotations
 
-import json
+import asyncio
+import calendar
+import contextlib
+import inspect
 import os
-from collections.abc import Callable
+import random
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 from typing import Any
 
 from prometheus_client import Counter
 
 from app.config import get_settings
+from logger import logger
 
 _s = get_settings()
 _LABELS = {"service": _s.app_name, "env": _s.env, "version": _s.git_sha}
 
-_SCHEDULED: list[dict[str, Any]] = []
 _JOBS_COUNTER = Counter(
     "jobs_registered_total",
     "Total jobs registered",
     ["service", "env", "version"],
 )
+_RUNS_COUNTER = Counter(
+    "runtime_job_runs_total",
+    "Runtime scheduler job runs by outcome",
+    ["service", "env", "version", "job", "status"],
+)
 _DATA_ROOT = Path(os.getenv("DATA_ROOT", "/data"))
-_STATE_ENV = os.getenv("RUNTIME_SCHEDULER_STATE")
-if _STATE_ENV:
-    candidate = Path(_STATE_ENV)
+_DB_ENV = os.getenv("RUNTIME_SCHEDULER_DB")
+if _DB_ENV:
+    candidate = Path(_DB_ENV)
     if not candidate.is_absolute():
         candidate = _DATA_ROOT / candidate
-    _STATE_FILE = candidate
+    _DB_FILE = candidate
 else:
-    _STATE_FILE = _DATA_ROOT / "artifacts/runtime_scheduler_state.json"
+    _DB_FILE = _DATA_ROOT / "artifacts/runtime_scheduler.sqlite3"
+
+DEFAULT_POLL_INTERVAL = 30.0
+DEFAULT_LEASE_SECONDS = 5 * 60.0
+
+_ALIASES = {
+    "@yearly": "0 0 1 1 *",
+    "@annually": "0 0 1 1 *",
+    "@monthly": "0 0 1 * *",
+    "@weekly": "0 0 * * 0",
+    "@daily": "0 0 * * *",
+    "@midnight": "0 0 * * *",
+    "@hourly": "0 * * * *",
+}
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+# --- Schedules ---------------------------------------------------------------
+
+
+def _parse_field(raw: str, low: int, high: int) -> frozenset[int]:
+    values: set[int] = set()
+    for part in raw.split(","):
+        step = 1
+        if "/" in part:
+            part, step_raw = part.split("/", 1)
+            step = int(step_raw)
+            if step <= 0:
+                raise ValueError(f"invalid cron step: {raw!r}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_raw, end_raw = part.split("-", 1)
+            start, end = int(start_raw), int(end_raw)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"cron field {raw!r} out of range {low}-{high}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True, slots=True)
+class CronSchedule:
+    """Five-field cron expression (minute hour day month weekday) evaluated in UTC."""
+
+    expr: str
+    minutes: frozenset[int]
+    hours: frozenset[int]
+    days: frozenset[int]
+    months: frozenset[int]
+    weekdays: frozenset[int]
+    any_day: bool
+    any_weekday: bool
+
+    @classmethod
+    def parse(cls, expr: str) -> CronSchedule:
+        fields = _ALIASES.get(expr.strip().lower(), expr).split()
+        if len(fields) != 5:
+            raise ValueError(f"cron expression must have 5 fields: {expr!r}")
+        minute, hour, day, month, weekday = fields
+        # Cron weekdays: 0 and 7 are both Sunday; Python uses Monday=0.
+        weekdays = frozenset((value - 1) % 7 for value in _parse_field(weekday, 0, 7))
+        return cls(
+            expr=expr,
+            minutes=_parse_field(minute, 0, 59),
+            hours=_parse_field(hour, 0, 23),
+            days=_parse_field(day, 1, 31),
+            months=_parse_field(month, 1, 12),
+            weekdays=weekdays,
+            any_day=day == "*",
+            any_weekday=weekday == "*",
+        )
+
+    def _day_matches(self, moment: datetime) -> bool:
+        day_ok = moment.day in self.days
+        weekday_ok = moment.weekday() in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        candidate = moment.astimezone(UTC).replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                last_day = calendar.monthrange(candidate.year, candidate.month)[1]
+                candidate = candidate.replace(day=last_day, hour=0, minute=0)
+                candidate += timedelta(days=1)
+            elif not self._day_matches(candidate):
+                candidate = candidate.replace(hour=0, minute=0) + timedelta(days=1)
+            elif candidate.hour not in self.hours:
+                candidate = candidate.replace(minute=0) + timedelta(hours=1)
+            elif candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+            else:
+                return candidate
+        raise ValueError(f"cron expression never fires: {self.expr!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class IntervalSchedule:
+    """Fixed delay between the end of one run and the start of the next (``@every 15m``)."""
+
+    expr: str
+    seconds: float
+
+    @classmethod
+    def parse(cls, expr: str) -> IntervalSchedule:
+        raw = expr.strip().lower().removeprefix("@every").strip()
+        unit = raw[-1:] if raw[-1:] in _UNITS else "s"
+        number = raw[:-1] if raw[-1:] in _UNITS else raw
+        seconds = float(number) * _UNITS[unit]
+        if seconds <= 0:
+            raise ValueError(f"interval must be positive: {expr!r}")
+        return cls(expr=expr, seconds=seconds)
+
+    def next_after(self, moment: datetime) -> datetime:
+        return moment.astimezone(UTC) + timedelta(seconds=self.seconds)
+
+
+Schedule = CronSchedule | IntervalSchedule
+
+
+def parse_schedule(expr: str) -> Schedule:
+    """Parse a cron expression, a ``@daily``-style alias or an ``@every <n>[smhd]`` interval."""
+
+    if expr.strip().lower().startswith("@every"):
+        return IntervalSchedule.parse(expr)
+    return CronSchedule.parse(expr)
+
+
+# --- Persistence -------------------------------------------------------------
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runtime_jobs (
+    name TEXT PRIMARY KEY,
+    schedule TEXT NOT NULL,
+    jitter_sec REAL NOT NULL DEFAULT 0,
+    catch_up INTEGER NOT NULL DEFAULT 1,
+    callable INTEGER NOT NULL DEFAULT 1,
+    next_run_at REAL NOT NULL,
+    lease_owner TEXT,
+    lease_until REAL,
+    last_started_at REAL,
+    last_finished_at REAL,
+    last_status TEXT,
+    last_error TEXT,
+    run_count INTEGER NOT NULL DEFAULT 0,
+    registered_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS runtime_scheduler_meta (
+    key TEXT PRIMARY KEY,
+    value REAL NOT NULL
+);
+"""
+
+
+def _iso(ts: float | None) -> str | None:
+    if ts is None:
+        return None
+    return datetime.fromtimestamp(ts, tz=UTC).isoformat()
+
+
+class JobStore:
+    """SQLite-backed job table shared by every process that uses the same file.
+
+    Leases (``lease_owner``/``lease_until``) are claimed with a conditional
+    ``UPDATE`` so a job never runs twice at once, even when the bot and a CLI
+    process tick the same store. The owner renews the lease while the job runs,
+    so it stays short and an expired lease is reclaimable soon after a crash.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._ready = False
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        if not self._ready:
+            with self._lock:
+                if not self._ready:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with contextlib.closing(sqlite3.connect(self.path)) as conn:
+                        conn.execute("PRAGMA journal_mode=WAL")
+                        conn.executescript(_SCHEMA)
+                    self._ready = True
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
 
+    def upsert(
+        self,
+        name: str,
+        expr: str,
+        *,
+        jitter: float,
+        catch_up: bool,
+        has_callable: bool,
+        next_run_at: float,
+        now: float,
+    ) -> None:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT schedule, next_run_at FROM runtime_jobs WHERE name = ?", (name,)
+            ).fetchone()
+            if row is not None and row["schedule"] == expr:
+                # Keep the persisted slot; a past slot is either run once or skipped.
+                if catch_up or row["next_run_at"] > now:
+                    next_run_at = row["next_run_at"]
+            conn.execute(
+                """
+                INSERT INTO runtime_jobs(
+                    name, schedule, jitter_sec, catch_up, callable, next_run_at, registered_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET
+                    schedule = excluded.schedule,
+                    jitter_sec = excluded.jitter_sec,
+                    catch_up = excluded.catch_up,
+                    callable = excluded.callable,
+                    next_run_at = excluded.next_run_at
+                """,
+                (name, expr, jitter, int(catch_up), int(has_callable), next_run_at, now),
+            )
+            conn.execute(
+                """
+                INSERT INTO runtime_scheduler_meta(key, value) VALUES ('jobs_registered_total', 1)
+                ON CONFLICT(key) DO UPDATE SET value = value + 1
+                """
+            )
 
-def _state_payload() -> dict[str, Any]:
-    payload = {
-        "jobs": [
-            {"cron": job.get("cron"), "callable": bool(job.get("callable", False))}
-            for job in _SCHEDULED
-        ],
-        "count": _JOBS_COUNTER.labels(**_LABELS)._value.get(),
-    }
-    return payload
+    def jobs(self) -> list[sqlite3.Row]:
+        with self._connect() as conn:
+            return conn.execute("SELECT * FROM runtime_jobs ORDER BY next_run_at, name").fetchall()
 
+    def registered_total(self) -> float:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT value FROM runtime_scheduler_meta WHERE key = 'jobs_registered_total'"
+            ).fetchone()
+        return float(row["value"]) if row else 0.0
 
-def _persist_state() -> None:
-    _STATE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    _STATE_FILE.write_text(
-        json.dumps(_state_payload(), ensure_ascii=False, indent=2), encoding="utf-8"
-    )
+    def claim(self, name: str, owner: str, *, now: float, lease_seconds: float) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                """
+                UPDATE runtime_jobs
+                SET lease_owner = ?, lease_until = ?, last_started_at = ?
+                WHERE name = ? AND next_run_at <= ?
+                  AND (lease_until IS NULL OR lease_until <= ?)
+                """,
+                (owner, now + lease_seconds, now, name, now, now),
+            )
+            return cursor.rowcount == 1
 
+    def renew(self, name: str, owner: str, *, now: float, lease_seconds: float) -> bool:
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE runtime_jobs SET lease_until = ? WHERE name = ? AND lease_owner = ?",
+                (now + lease_seconds, name, owner),
+            )
+            return cursor.rowcount == 1
 
-def _refresh_state() -> None:
-    if not _STATE_FILE.exists():
-        return
-    try:
-        raw = json.loads(_STATE_FILE.read_text(encoding="utf-8"))
-    except json.JSONDecodeError:
-        return
-    _SCHEDULED.clear()
-    for job in raw.get("jobs", []):
-        _SCHEDULED.append({"cron": job.get("cron"), "callable": bool(job.get("callable", False))})
-    count = float(raw.get("count", 0.0))
-    _JOBS_COUNTER.labels(**_LABELS)._value.set(count)
+    def finish(
+        self,
+        name: str,
+        owner: str,
+        *,
+        now: float,
+        status: str,
+        error: str | None,
+        next_run_at: float,
+    ) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                """
+                UPDATE runtime_jobs
+                SET lease_owner = NULL, lease_until = NULL, last_finished_at = ?,
+                    last_status = ?, last_error = ?, next_run_at = ?,
+                    run_count = run_count + 1
+                WHERE name = ? AND lease_owner = ?
+                """,
+                (now, status, error, next_run_at, name, owner),
+            )
 
+    def release(self, owner: str, names: list[str] | None = None) -> None:
+        """Drop leases held by ``owner`` without moving ``next_run_at`` (run is retried)."""
 
-_refresh_state()
+        query = (
+            "UPDATE runtime_jobs SET lease_owner = NULL, lease_until = NULL WHERE lease_owner = ?"
+        )
+        params: list[Any] = [owner]
+        if names is not None:
+            query += f" AND name IN ({', '.join('?' for _ in names)})"
+            params.extend(names)
+        with self._connect() as conn:
+            conn.execute(query, params)
 
+    def remove(self, names: list[str], *, now: float) -> list[str]:
+        """Delete ``names`` unless a run currently holds their lease; return the removed ones."""
 
-def register(cron_expr: str, fn: Callable[[], None]) -> None:
-    """Append a job into in-memory registry (no real scheduling)."""
-    _refresh_state()
-    _SCHEDULED.append({"cron": cron_expr, "callable": callable(fn)})
+        removed: list[str] = []
+        with self._connect() as conn:
+            for name in names:
+                cursor = conn.execute(
+                    """
+                    DELETE FROM runtime_jobs
+                    WHERE name = ? AND (lease_until IS NULL OR lease_until <= ?)
+                    """,
+                    (name, now),
+                )
+                if cursor.rowcount == 1:
+                    removed.append(name)
+        return removed
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute("DELETE FROM runtime_jobs")
+            conn.execute(
+                """
+                INSERT INTO runtime_scheduler_meta(key, value) VALUES ('jobs_registered_total', 0)
+                ON CONFLICT(key) DO UPDATE SET value = 0
+                """
+            )
+
+
+# --- Scheduler ---------------------------------------------------------------
+
+
+def _job_name(fn: Callable[..., Any]) -> str:
+    module = getattr(fn, "__module__", None) or "job"
+    qualname = getattr(fn, "__qualname__", None) or type(fn).__name__
+    return f"{module}.{qualname}".replace(".<locals>", "")
+
+
+class RuntimeScheduler:
+    """Fire registered jobs on time from a single asyncio loop.
+
+    Job definitions and run state (next slot, lease, last outcome) live in
+    :class:`JobStore`; callables are bound per process at registration. Sync
+    callables run in the default executor, coroutine functions on the loop.
+    Missed slots are coalesced into a single catch-up run (or skipped when the
+    job was registered with ``catch_up=False``), and each next slot is pushed
+    back by a random ``0..jitter`` seconds to spread heavy jobs.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        *,
+        clock: Callable[[], float] = time.time,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.store = store
+        self._clock = clock
+        self._poll_interval = poll_interval
+        self._lease_seconds = lease_seconds
+        self._rng = rng or random.Random()
+        self._owner = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._callables: dict[str, Callable[[], Any]] = {}
+        self._schedules: dict[str, Schedule] = {}
+        self._running: dict[str, asyncio.Task[None]] = {}
+
+    def _next_slot(self, schedule: Schedule, after: float, jitter: float) -> float:
+        moment = datetime.fromtimestamp(after, tz=UTC)
+        slot = schedule.next_after(moment).timestamp()
+        return slot + (self._rng.uniform(0.0, jitter) if jitter > 0 else 0.0)
+
+    def register(
+        self,
+        expr: str,
+        fn: Callable[[], Any],
+        *,
+        name: str | None = None,
+        jitter: float = 0.0,
+        catch_up: bool = True,
+    ) -> str:
+        schedule = parse_schedule(expr)
+        job = name or _job_name(fn)
+        now = self._clock()
+        self.store.upsert(
+            job,
+            expr,
+            jitter=max(float(jitter), 0.0),
+            catch_up=catch_up,
+            has_callable=callable(fn),
+            next_run_at=self._next_slot(schedule, now, jitter),
+            now=now,
+        )
+        self._callables[job] = fn
+        self._schedules[job] = schedule
+        return job
+
+    def list_jobs(self) -> list[dict[str, Any]]:
+        return [
+            {
+                "name": row["name"],
+                "cron": row["schedule"],
+                "callable": bool(row["callable"]),
+                "next_run_at": _iso(row["next_run_at"]),
+                "last_started_at": _iso(row["last_started_at"]),
+                "last_status": row["last_status"],
+                "running": row["lease_owner"] is not None,
+                "run_count": row["run_count"],
+            }
+            for row in self.store.jobs()
+        ]
+
+    def prune(self) -> list[str]:
+        """Drop persisted jobs this process no longer binds (e.g. a cron that was switched off)."""
+
+        stale = [row["name"] for row in self.store.jobs() if row["name"] not in self._callables]
+        if not stale:
+            return []
+        return self.store.remove(stale, now=self._clock())
+
+    def clear(self) -> None:
+        self.store.clear()
+        self._callables.clear()
+        self._schedules.clear()
+
+    async def tick(self) -> list[str]:
+        """Start every due job bound in this process; return the started names."""
+
+        now = self._clock()
+        started: list[str] = []
+        for row in self.store.jobs():
+            name = row["name"]
+            if row["next_run_at"] > now:
+                break
+            if name not in self._callables or name in self._running:
+                continue
+            if not self.store.claim(name, self._owner, now=now, lease_seconds=self._lease_seconds):
+                continue
+            task = asyncio.create_task(self._run(name, float(row["jitter_sec"])))
+            self._running[name] = task
+            task.add_done_callback(lambda _t, job=name: self._running.pop(job, None))
+            started.append(name)
+        return started
+
+    async def _heartbeat(self, name: str) -> None:
+        while True:
+            await asyncio.sleep(self._lease_seconds / 3)
+            try:
+                renewed = self.store.renew(
+                    name, self._owner, now=self._clock(), lease_seconds=self._lease_seconds
+                )
+            except Exception as exc:  # pragma: no cover - retried on the next beat
+                logger.warning("Runtime job %s lease renewal failed: %s", name, exc)
+                continue
+            if not renewed:
+                logger.warning("Runtime job %s lost its lease while running", name)
+                return
+
+    async def _run(self, name: str, jitter: float) -> None:
+        fn = self._callables[name]
+        status, error = "ok", None
+        heartbeat = asyncio.create_task(self._heartbeat(name))
+        try:
+            if inspect.iscoroutinefunction(fn):
+                await fn()
+            else:
+                await asyncio.get_running_loop().run_in_executor(None, fn)
+        except asyncio.CancelledError:
+            self.store.release(self._owner, [name])
+            raise
+        except Exception as exc:
+            status, error = "error", str(exc)
+            logger.warning("Runtime job %s failed: %s", name, exc)
+        finally:
+            heartbeat.cancel()
+        finished = self._clock()
+        self.store.finish(
+            name,
+            self._owner,
+            now=finished,
+            status=status,
+            error=error,
+            next_run_at=self._next_slot(self._schedules[name], finished, jitter),
+        )
+        _RUNS_COUNTER.labels(**_LABELS, job=name, status=status).inc()
+
+    def _sleep_for(self) -> float:
+        now = self._clock()
+        upcoming = [
+            row["next_run_at"]
+            for row in self.store.jobs()
+            if row["name"] in self._callables and row["name"] not in self._running
+        ]
+        if not upcoming:
+            return self._poll_interval
+        return min(max(min(upcoming) - now, 0.0), self._poll_interval)
+
+    async def run(self, stop_event: asyncio.Event) -> None:
+        """Tick until ``stop_event`` is set, then cancel in-flight runs and free their leases."""
+
+        try:
+            while not stop_event.is_set():
+                try:
+                    await self.tick()
+                    timeout = self._sleep_for()
+                except Exception as exc:  # pragma: no cover - keep the loop alive
+                    logger.warning("Runtime scheduler tick failed: %s", exc)
+                    timeout = self._poll_interval
+                with contextlib.suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(stop_event.wait(), timeout=max(timeout, 0.05))
+        finally:
+            await self.stop()
+
+    async def stop(self) -> None:
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        for task in tasks:
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self.store.release(self._owner)
+
+
+_SCHEDULER: RuntimeScheduler | None = None
+_SCHEDULER_LOCK = threading.Lock()
+
+
+def get_scheduler() -> RuntimeScheduler:
+    """Return the process-wide scheduler bound to the configured SQLite file."""
+
+    global _SCHEDULER
+    if _SCHEDULER is None:
+        with _SCHEDULER_LOCK:
+            if _SCHEDULER is None:
+                _SCHEDULER = RuntimeScheduler(JobStore(_DB_FILE))
+    return _SCHEDULER
+
+
+def register(
+    cron_expr: str,
+    fn: Callable[[], Any],
+    *,
+    name: str | None = None,
+    jitter: float = 0.0,
+    catch_up: bool = True,
+) -> None:
+    """Register (or re-bind) a persistent job; the schedule fires once ``run_scheduler`` runs."""
+
+    get_scheduler().register(cron_expr, fn, name=name, jitter=jitter, catch_up=catch_up)
     _JOBS_COUNTER.labels(**_LABELS).inc()
-    _persist_state()
 
 
 def list_jobs() -> list[dict[str, Any]]:
-    """Return a shallow copy of registered jobs with callable flag only."""
-    _refresh_state()
-    out: list[dict[str, Any]] = []
-    for j in _SCHEDULED:
-        out.append({"cron": j.get("cron"), "callable": bool(j.get("callable", False))})
-    return out
+    """Return persisted jobs with schedule, callable flag and run state."""
+    return get_scheduler().list_jobs()
 
 
 def jobs_registered_total() -> float:
     """Return total registered jobs counter."""
-    _refresh_state()
-    return _JOBS_COUNTER.labels(**_LABELS)._value.get()
+    total = get_scheduler().store.registered_total()
+    _JOBS_COUNTER.labels(**_LABELS)._value.set(total)
+    return total
+
+
+def prune_jobs() -> list[str]:
+    """Remove persisted jobs that were not registered in this process; return their names."""
+    return get_scheduler().prune()
 
 
 def clear_jobs() -> None:
     """Clear all registered jobs (useful for tests)."""
-    _refresh_state()
-    _SCHEDULED.clear()
+    get_scheduler().clear()
     _JOBS_COUNTER.labels(**_LABELS)._value.set(0.0)
-    _persist_state()
+
+
+async def run_scheduler(stop_event: asyncio.Event) -> None:
+    """Run the process-wide scheduler until ``stop_event`` is set."""
+    await get_scheduler().run(stop_event)